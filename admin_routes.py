@@ -1,34 +1,54 @@
 from flask import (
     Blueprint,
+    Response,
     render_template,
     request,
     jsonify,
     session,
     redirect,
+    stream_with_context,
     url_for,
 )
 from functools import wraps
 from datetime import datetime, timedelta
+import base64
+import csv
+import io
 import json
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import os
+from psycopg2.extras import RealDictCursor, execute_values
+import time
 import uuid
 from functools import wraps
 import logging
+from db_config import DATABASE_CONFIG
+from db_pool import get_pool
+from availability_cache import availability_cache
+from booking_changes import publish_booking_change, publish_booking_changes
+from change_feed import change_feed
+from customer_index import customer_index
+from booking_slots import MULTI_PURPOSE_COURTS, slot_conflict_from_error
+from notification_queue import ENQUEUE_FOR_STATUS_SQL, JOB_TYPES, METRICS_SQL
+from booking_stats import EMPTY_STATS, OVERALL_STATS_SQL, SCOPES, SCOPE_STATS_SQL
+from booking_bulk import BULK_ACTIONS, MAX_BULK_BOOKINGS, PREVIEW_COLUMNS, bulk_action_query, filter_query
+from booking_series import (
+    CONFLICTS_SQL as SERIES_CONFLICTS_SQL,
+    INSERT_RETRIES as SERIES_INSERT_RETRIES,
+    INSERT_SQL as SERIES_INSERT_SQL,
+    expand_recurrence,
+)
+from booking_search import HAS_TRIGRAM_SQL, build_search_query, cursor_for, match_clause, page_size
+from booking_versions import RANGE_VERSION_SQL, make_etag, not_modified, with_validators
+from booking_analytics import REPORTS, BookingColumns, build_report
+from structured_logging import debug_sampled
+from metrics import QueryTimer
+from slow_queries import slow_query_log
+from slot_bitmap import SLOT_INDEX, SLOT_TIMES, SLOTS_PER_DAY, sibling_courts
 
 logger = logging.getLogger(__name__)
 
 admin_bp = Blueprint("admin_panel", __name__, url_prefix="/admin")
 
-# Database configuration
-DATABASE_CONFIG = {
-    "host": "localhost",
-    "database": "noball_sports",
-    "user": "postgres",
-    "password": "admin@123",
-    "port": "5432",
-}
-
 # Court configurations - Must match frontend exactly
 COURT_CONFIG = {
     "padel": [
@@ -43,9 +63,6 @@ COURT_CONFIG = {
     "pickleball": [{"id": "pickleball-1", "name": "Court 1: Professional"}],
 }
 
-# Multi-purpose court mapping
-MULTI_PURPOSE_COURTS = {"cricket-2": "multi-130x60", "futsal-1": "multi-130x60"}
-
 # Pricing configuration
 SPORT_PRICING = {"cricket": 3000, "futsal": 2500, "padel": 5500, "pickleball": 2500}
 
@@ -66,21 +83,28 @@ class AdminDatabaseManager:
 
     @staticmethod
     def get_connection():
-        """Get database connection"""
+        """Get a pooled database connection"""
         try:
-            conn = psycopg2.connect(**DATABASE_CONFIG)
-            return conn
+            return get_pool(DATABASE_CONFIG).getconn()
         except Exception as e:
             logger.error(f"Admin database connection error: {e}")
             return None
 
+    @staticmethod
+    def release_connection(conn):
+        """Return a connection to the shared pool"""
+        get_pool(DATABASE_CONFIG).putconn(conn)
+
     @staticmethod
     def execute_query(query, params=None, fetch_one=False, fetch_all=True):
         """Execute query with proper error handling"""
         conn = None
+        timer = QueryTimer("admin", query, params)
         try:
             conn = AdminDatabaseManager.get_connection()
+            timer.connected()
             if not conn:
+                timer.failed = True
                 return None
 
             cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -97,13 +121,18 @@ class AdminDatabaseManager:
             return result
 
         except Exception as e:
+            timer.failed = True
             if conn:
                 conn.rollback()
+            conflict = slot_conflict_from_error(e)
+            if conflict:
+                raise conflict
             logger.error(f"Admin query execution error: {e}")
             return None
         finally:
             if conn:
-                conn.close()
+                AdminDatabaseManager.release_connection(conn)
+            timer.finish()
 
 
 # FIXED: Enhanced AdminScheduleService in admin_routes.py
@@ -112,272 +141,317 @@ class AdminDatabaseManager:
 class AdminScheduleService:
     """Professional admin schedule service with FIXED booking display logic"""
 
+    # Booking fields sent once per booking in the compact format
+    COMPACT_FIELDS = {
+        "id": "id",
+        "court": "court",
+        "playerName": "player_name",
+        "playerPhone": "player_phone",
+        "amount": "total_amount",
+        "duration": "duration",
+        "comments": "special_requests",
+    }
+
     @staticmethod
-    def get_schedule_data(start_date, end_date, sport_filter=None):
-        """Get comprehensive schedule data for date range - FIXED VERSION"""
+    def get_schedule_data(start_date, end_date, sport_filter=None, compact=False):
+        """Get comprehensive schedule data for date range with a single range query"""
         try:
-            logger.info(
-                f"🔧 FIXED: Admin fetching schedule: {start_date} to {end_date}, sport: {sport_filter}"
+            logger.debug(
+                "Admin fetching schedule: %s to %s, sport: %s",
+                start_date,
+                end_date,
+                sport_filter,
             )
 
-            schedule = {}
+            courts = AdminScheduleService._get_schedule_courts(sport_filter)
+            court_ids = [court["id"] for court in courts]
 
-            # Get courts based on filter
-            if sport_filter and sport_filter in COURT_CONFIG:
-                courts = COURT_CONFIG[sport_filter]
-                logger.info(
-                    f"📋 Filtering by sport '{sport_filter}': {len(courts)} courts"
+            bookings = AdminScheduleService._get_range_bookings(
+                court_ids, start_date, end_date
+            )
+            if compact:
+                return AdminScheduleService._build_compact_schedule(
+                    court_ids,
+                    AdminScheduleService._get_date_range(start_date, end_date),
+                    bookings,
                 )
-            else:
-                courts = []
-                for sport in ["padel", "cricket", "futsal", "pickleball"]:
-                    courts.extend(COURT_CONFIG[sport])
-                logger.info(f"📋 All sports: {len(courts)} total courts")
-
-            # Process each date in range
-            current_date = datetime.strptime(start_date, "%Y-%m-%d")
-            end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
 
-            logger.info(f"📅 Processing date range: {current_date} to {end_date_obj}")
+            schedule = AdminScheduleService._build_schedule_grid(
+                court_ids,
+                AdminScheduleService._get_date_range(start_date, end_date),
+                bookings,
+            )
 
-            while current_date <= end_date_obj:
-                date_str = current_date.strftime("%Y-%m-%d")
-                schedule[date_str] = {}
+            total_scheduled_slots = sum(
+                len(slots) for day in schedule.values() for slots in day.values()
+            )
+            logger.debug(
+                "Schedule data prepared: %s bookings, %s total scheduled slots",
+                len(bookings),
+                total_scheduled_slots,
+            )
+            return schedule
 
-                logger.info(f"🗓️ Processing date: {date_str}")
+        except Exception as e:
+            logger.error(f"❌ Error getting admin schedule data: {e}")
+            import traceback
 
-                # Process each court
-                for court in courts:
-                    court_id = court["id"]
-                    schedule[date_str][court_id] = {}
+            logger.error(f"❌ Full traceback: {traceback.format_exc()}")
+            return {}
 
-                    # FIXED: Get bookings for this court and date with better query
-                    bookings = AdminScheduleService._get_court_bookings_fixed(
-                        court_id, date_str
-                    )
+    @staticmethod
+    def get_schedule_version(start_date, end_date, sport_filter=None):
+        """Version row for everything a schedule response can show"""
+        court_ids = [
+            court["id"] for court in AdminScheduleService._get_schedule_courts(sport_filter)
+        ]
+        courts = set(court_ids)
+        for court_id in court_ids:
+            courts.update(AdminScheduleService._get_sibling_courts(court_id))
 
-                    logger.info(
-                        f"🏟️ Court {court_id} on {date_str}: Found {len(bookings)} bookings"
-                    )
+        # pickleball-1 shows bookings filed under any court, so watch them all
+        return AdminDatabaseManager.execute_query(
+            RANGE_VERSION_SQL,
+            {
+                "start": start_date,
+                "end": end_date,
+                "courts": None if "pickleball-1" in courts else sorted(courts),
+            },
+            fetch_one=True,
+        )
 
-                    # Process each booking
-                    booking_count = 0
-                    for booking in bookings:
-                        try:
-                            slots = booking.get("selected_slots", [])
-
-                            # Handle both JSON string and parsed data
-                            if isinstance(slots, str):
-                                try:
-                                    slots = json.loads(slots)
-                                except json.JSONDecodeError:
-                                    logger.error(
-                                        f"❌ Invalid JSON in selected_slots for booking {booking.get('id')}"
-                                    )
-                                    continue
-
-                            if not slots:
-                                logger.warning(
-                                    f"⚠️ No slots found for booking {booking.get('id')}"
-                                )
-                                continue
+    @staticmethod
+    def _get_schedule_courts(sport_filter=None):
+        """Get the courts shown for a sport filter (all sports when unset)"""
+        if sport_filter and sport_filter in COURT_CONFIG:
+            return COURT_CONFIG[sport_filter]
 
-                            logger.info(
-                                f"🎯 Processing booking {booking.get('id')} with {len(slots)} slots: {slots}"
-                            )
+        courts = []
+        for sport in ["padel", "cricket", "futsal", "pickleball"]:
+            courts.extend(COURT_CONFIG[sport])
+        return courts
 
-                            for slot in slots:
-                                if isinstance(slot, dict) and "time" in slot:
-                                    slot_time = slot["time"]
-
-                                    # Check if this is a multi-purpose court conflict
-                                    is_conflict = (
-                                        AdminScheduleService._is_multi_purpose_conflict(
-                                            court_id,
-                                            booking.get("court"),
-                                            slot_time,
-                                            date_str,
-                                        )
-                                    )
-
-                                    # Create slot data
-                                    slot_data = {
-                                        "status": (
-                                            "booked-conflict"
-                                            if is_conflict
-                                            else AdminScheduleService._get_booking_status(
-                                                booking
-                                            )
-                                        ),
-                                        "title": booking.get("player_name", "Booked"),
-                                        "subtitle": f"PKR {booking.get('total_amount', 0):,}"
-                                        + (" - Multi Court" if is_conflict else ""),
-                                        "bookingId": booking.get("id"),
-                                        "playerName": booking.get("player_name"),
-                                        "playerPhone": booking.get("player_phone"),
-                                        "amount": booking.get("total_amount"),
-                                        "duration": booking.get("duration"),
-                                        "originalCourt": (
-                                            booking.get("court")
-                                            if is_conflict
-                                            else court_id
-                                        ),
-                                        "comments": booking.get("special_requests", ""),
-                                    }
-
-                                    schedule[date_str][court_id][slot_time] = slot_data
-                                    booking_count += 1
-
-                                    logger.info(
-                                        f"✅ Added slot {slot_time} for court {court_id}: {slot_data['title']} ({slot_data['status']})"
-                                    )
-
-                        except Exception as e:
-                            logger.error(
-                                f"❌ Error processing booking {booking.get('id', 'unknown')}: {e}"
-                            )
-                            continue
+    @staticmethod
+    def _get_date_range(start_date, end_date):
+        """List every YYYY-MM-DD date string from start_date to end_date inclusive"""
+        current_date = datetime.strptime(start_date, "%Y-%m-%d")
+        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
 
-                    logger.info(
-                        f"📊 Court {court_id} on {date_str}: {booking_count} slots scheduled"
-                    )
+        dates = []
+        while current_date <= end_date_obj:
+            dates.append(current_date.strftime("%Y-%m-%d"))
+            current_date += timedelta(days=1)
+        return dates
 
-                current_date += timedelta(days=1)
+    @staticmethod
+    def _get_sibling_courts(court_id):
+        """Get the other courts sharing a multi-purpose surface with court_id"""
+        return sibling_courts(court_id, MULTI_PURPOSE_COURTS)
 
-            # Final summary
-            total_scheduled_slots = 0
-            for date in schedule:
-                for court in schedule[date]:
-                    total_scheduled_slots += len(schedule[date][court])
+    @staticmethod
+    def _get_range_bookings(court_ids, start_date, end_date):
+        """Fetch every active booking affecting court_ids in [start_date, end_date]"""
+        fetch_courts = set(court_ids)
+        for court_id in court_ids:
+            fetch_courts.update(AdminScheduleService._get_sibling_courts(court_id))
 
-            logger.info(
-                f"📈 FIXED: Schedule data prepared successfully - {total_scheduled_slots} total scheduled slots"
-            )
-            return schedule
+        # pickleball-1 also shows pickleball bookings filed under other court ids
+        sport_clause = " OR sport = 'pickleball'" if "pickleball-1" in court_ids else ""
 
-        except Exception as e:
-            logger.error(f"❌ Error getting admin schedule data: {e}")
-            import traceback
+        query = f"""
+            SELECT
+                id, sport, court, court_name, booking_date, start_time, end_time,
+                duration, selected_slots, player_name, player_phone, player_email,
+                total_amount, status, special_requests, created_at
+            FROM bookings
+            WHERE status IN ('confirmed', 'pending_payment')
+            AND booking_date BETWEEN %s AND %s
+            AND (court = ANY(%s){sport_clause})
+            ORDER BY booking_date, start_time, id
+        """
 
-            logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-            return {}
+        rows = AdminDatabaseManager.execute_query(
+            query, (start_date, end_date, sorted(fetch_courts))
+        )
+        if rows is None:
+            raise Exception("Failed to fetch schedule bookings")
+        return [dict(row) for row in rows]
 
     @staticmethod
-    def _get_court_bookings_fixed(court_id, date):
-        """FIXED: Get all bookings affecting a specific court on a date with better error handling"""
-        try:
-            logger.info(f"🔍 FIXED: Getting bookings for court {court_id} on {date}")
-
-            # FIXED: Direct bookings for this court with better query
-            if court_id == "pickleball-1":
-                direct_query = """
-                    SELECT * FROM bookings 
-                    WHERE status IN ('confirmed', 'pending_payment') 
-                    AND booking_date = %s 
-                    AND (court = %s OR sport = 'pickleball')
-                    ORDER BY start_time
-                """
-            else:
-                direct_query = """
-                    SELECT * FROM bookings 
-                    WHERE status IN ('confirmed', 'pending_payment') 
-                    AND booking_date = %s 
-                    AND court = %s
-                    ORDER BY start_time
-                """
-
-            logger.info(f"🗄️ Executing direct query for court {court_id} on {date}")
-            direct_bookings = (
-                AdminDatabaseManager.execute_query(direct_query, (date, court_id)) or []
-            )
-            logger.info(f"📋 Direct bookings found: {len(direct_bookings)}")
-
-            # Log each direct booking for debugging
-            for booking in direct_bookings:
-                logger.info(
-                    f"🎯 Direct booking: {booking.get('id')} - {booking.get('player_name')} - Status: {booking.get('status')}"
-                )
+    def _build_schedule_grid(court_ids, dates, bookings):
+        """Build the date -> court -> slot grid in memory from range bookings"""
+        bookings_by_date = {date_str: [] for date_str in dates}
+        for booking in bookings:
+            booking_date = booking.get("booking_date")
+            if hasattr(booking_date, "strftime"):
+                booking_date = booking_date.strftime("%Y-%m-%d")
+            if booking_date in bookings_by_date:
+                bookings_by_date[booking_date].append(booking)
+
+        siblings = {
+            court_id: set(AdminScheduleService._get_sibling_courts(court_id))
+            for court_id in court_ids
+        }
 
-            # FIXED: Multi-purpose court conflicts with better logic
-            conflict_bookings = []
-            if court_id in MULTI_PURPOSE_COURTS:
-                multi_court_type = MULTI_PURPOSE_COURTS[court_id]
-                conflicting_courts = [
-                    k
-                    for k, v in MULTI_PURPOSE_COURTS.items()
-                    if v == multi_court_type and k != court_id
+        schedule = {}
+        for date_str in dates:
+            schedule[date_str] = {}
+            day_bookings = bookings_by_date[date_str]
+
+            for court_id in court_ids:
+                court_slots = schedule[date_str][court_id] = {}
+
+                # Same precedence as the old per-court queries (kept in
+                # benchmarks/bench_schedule_range.py): direct bookings
+                # first, then sibling bookings on the shared surface
+                direct = [
+                    booking
+                    for booking in day_bookings
+                    if booking.get("court") == court_id
+                    or (court_id == "pickleball-1" and booking.get("sport") == "pickleball")
+                ]
+                conflicts = [
+                    booking
+                    for booking in day_bookings
+                    if booking.get("court") in siblings[court_id]
                 ]
 
-                if conflicting_courts:
-                    logger.info(
-                        f"🔄 Checking multi-purpose conflicts for {court_id} with courts: {conflicting_courts}"
+                for booking in direct + conflicts:
+                    AdminScheduleService._add_booking_slots(
+                        court_slots, booking, court_id, date_str
                     )
 
-                    placeholders = ",".join(["%s"] * len(conflicting_courts))
-                    conflict_query = f"""
-                        SELECT 
-                            id, sport, court, court_name, booking_date, start_time, end_time,
-                            duration, selected_slots, player_name, player_phone, player_email,
-                            total_amount, status, special_requests, created_at
-                        FROM bookings 
-                        WHERE status IN ('confirmed', 'pending_payment') 
-                        AND booking_date = %s 
-                        AND court IN ({placeholders})
-                        ORDER BY start_time
-                    """
-
-                    conflict_params = [date] + conflicting_courts
-                    logger.info(
-                        f"🗄️ Executing conflict query with params: {conflict_params}"
+        return schedule
+
+    @staticmethod
+    def _build_compact_schedule(court_ids, dates, bookings):
+        """Columnar schedule: each booking once, plus a slot -> booking index
+        array per occupied court-day (-1 where free).
+
+        The client derives titles, subtitles and multi-court conflicts from
+        the booking, so each court-day costs at most 48 small integers.
+        """
+        columns = {key: [] for key in AdminScheduleService.COMPACT_FIELDS}
+        columns["status"] = []
+        cells = {}
+
+        def add(date_str, court_id, booking, index):
+            slots = booking.get("selected_slots") or []
+            if isinstance(slots, str):
+                try:
+                    slots = json.loads(slots)
+                except json.JSONDecodeError:
+                    return
+            row = None
+            for slot in slots:
+                slot_index = SLOT_INDEX.get(slot.get("time")) if isinstance(slot, dict) else None
+                if slot_index is None:
+                    continue
+                if row is None:
+                    row = cells.setdefault(date_str, {}).setdefault(
+                        court_id, [-1] * SLOTS_PER_DAY
                     )
-                    conflict_bookings = (
-                        AdminDatabaseManager.execute_query(
-                            conflict_query, conflict_params
-                        )
-                        or []
+                row[slot_index] = index
+
+        siblings = {
+            court_id: set(AdminScheduleService._get_sibling_courts(court_id))
+            for court_id in court_ids
+        }
+        wanted = set(dates)
+        indexed = []
+        for booking in bookings:
+            booking_date = booking.get("booking_date")
+            if hasattr(booking_date, "strftime"):
+                booking_date = booking_date.strftime("%Y-%m-%d")
+            if booking_date not in wanted:
+                continue
+
+            index = len(columns["status"])
+            for key, column in AdminScheduleService.COMPACT_FIELDS.items():
+                columns[key].append(booking.get(column))
+            columns["status"].append(AdminScheduleService._get_booking_status(booking))
+            indexed.append((booking, booking_date, index))
+
+        # Direct bookings first, then siblings on the shared surface, so the
+        # last write per cell matches the dict grid
+        for court_id in court_ids:
+            for direct_pass in (True, False):
+                for booking, booking_date, index in indexed:
+                    is_direct = booking.get("court") == court_id or (
+                        court_id == "pickleball-1" and booking.get("sport") == "pickleball"
                     )
-                    logger.info(f"⚠️ Conflict bookings found: {len(conflict_bookings)}")
+                    if direct_pass and is_direct:
+                        add(booking_date, court_id, booking, index)
+                    elif not direct_pass and booking.get("court") in siblings[court_id]:
+                        add(booking_date, court_id, booking, index)
+
+        return {
+            "format": "compact",
+            "dates": dates,
+            "courts": court_ids,
+            "slots": SLOT_TIMES,
+            "bookings": columns,
+            "cells": cells,
+            "multiPurposeCourts": MULTI_PURPOSE_COURTS,
+        }
 
-            # FIXED: Convert to list of dicts with proper error handling
-            all_bookings = []
-            for booking in direct_bookings + conflict_bookings:
+    @staticmethod
+    def _add_booking_slots(court_slots, booking, court_id, date_str):
+        """Add one booking's slots to a court's slot map; returns slots added"""
+        try:
+            slots = booking.get("selected_slots", [])
+
+            # Handle both JSON string and parsed data
+            if isinstance(slots, str):
                 try:
-                    if booking:
-                        booking_dict = dict(booking)
-                        # Ensure selected_slots is properly handled
-                        if booking_dict.get("selected_slots"):
-                            if isinstance(booking_dict["selected_slots"], str):
-                                try:
-                                    booking_dict["selected_slots"] = json.loads(
-                                        booking_dict["selected_slots"]
-                                    )
-                                except json.JSONDecodeError as e:
-                                    logger.error(
-                                        f"❌ JSON decode error for booking {booking_dict.get('id')}: {e}"
-                                    )
-                                    booking_dict["selected_slots"] = []
-                        else:
-                            booking_dict["selected_slots"] = []
+                    slots = json.loads(slots)
+                except json.JSONDecodeError:
+                    logger.error(
+                        f"❌ Invalid JSON in selected_slots for booking {booking.get('id')}"
+                    )
+                    return 0
 
-                        all_bookings.append(booking_dict)
-                        logger.info(
-                            f"✅ Added booking {booking_dict.get('id')} to results"
-                        )
-                except Exception as e:
-                    logger.error(f"❌ Error processing booking: {e}")
-                    continue
+            if not slots:
+                logger.warning("⚠️ No slots found for booking %s", booking.get("id"))
+                return 0
 
-            logger.info(
-                f"📊 FIXED: Returning {len(all_bookings)} total bookings for court {court_id} on {date}"
-            )
-            return all_bookings
+            added = 0
+            for slot in slots:
+                if isinstance(slot, dict) and "time" in slot:
+                    slot_time = slot["time"]
 
-        except Exception as e:
-            logger.error(f"❌ Error getting court bookings: {e}")
-            import traceback
+                    # Check if this is a multi-purpose court conflict
+                    is_conflict = AdminScheduleService._is_multi_purpose_conflict(
+                        court_id, booking.get("court"), slot_time, date_str
+                    )
 
-            logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-            return []
+                    court_slots[slot_time] = {
+                        "status": (
+                            "booked-conflict"
+                            if is_conflict
+                            else AdminScheduleService._get_booking_status(booking)
+                        ),
+                        "title": booking.get("player_name", "Booked"),
+                        "subtitle": f"PKR {booking.get('total_amount', 0):,}"
+                        + (" - Multi Court" if is_conflict else ""),
+                        "bookingId": booking.get("id"),
+                        "playerName": booking.get("player_name"),
+                        "playerPhone": booking.get("player_phone"),
+                        "amount": booking.get("total_amount"),
+                        "duration": booking.get("duration"),
+                        "originalCourt": (
+                            booking.get("court") if is_conflict else court_id
+                        ),
+                        "comments": booking.get("special_requests", ""),
+                    }
+                    added += 1
+            return added
+
+        except Exception as e:
+            logger.error(
+                f"❌ Error processing booking {booking.get('id', 'unknown')}: {e}"
+            )
+            return 0
 
     @staticmethod
     def _is_multi_purpose_conflict(court_id, booking_court, slot_time, date):
@@ -392,8 +466,12 @@ class AdminScheduleService:
             )
 
             if is_conflict:
-                logger.info(
-                    f"⚠️ Multi-purpose conflict detected: {court_id} vs {booking_court} at {slot_time}"
+                debug_sampled(
+                    logger,
+                    "⚠️ Multi-purpose conflict detected: %s vs %s at %s",
+                    court_id,
+                    booking_court,
+                    slot_time,
                 )
 
             return is_conflict
@@ -413,7 +491,7 @@ class AdminScheduleService:
             db_status = booking.get("status", "unknown")
             schedule_status = status_map.get(db_status, "booked-pending")
 
-            logger.info(f"🏷️ Status mapping: {db_status} -> {schedule_status}")
+            debug_sampled(logger, "🏷️ Status mapping: %s -> %s", db_status, schedule_status)
             return schedule_status
         except Exception as e:
             logger.error(f"❌ Error getting booking status: {e}")
@@ -421,18 +499,23 @@ class AdminScheduleService:
 
 
 # FIXED: Enhanced API endpoint with better debugging
-@admin_bp.route("/api/schedule-data", methods=["POST"])
+@admin_bp.route("/api/schedule-data", methods=["GET", "POST"])
 @admin_required
 def api_schedule_data():
     """FIXED: Get schedule data for date range with enhanced debugging"""
     try:
-        data = request.json
+        data = request.args if request.method == "GET" else request.json
         start_date = data.get("startDate")
         end_date = data.get("endDate")
         sport_filter = data.get("sport")
-
-        logger.info(
-            f"🔧 FIXED: Schedule API called with: {start_date} to {end_date}, sport: {sport_filter}"
+        # format=compact: columnar bookings plus slot -> booking index arrays
+        compact = data.get("format") == "compact"
+
+        logger.debug(
+            "🔧 Schedule API called with: %s to %s, sport: %s",
+            start_date,
+            end_date,
+            sport_filter,
         )
 
         # Validate input dates
@@ -451,6 +534,24 @@ def api_schedule_data():
                 {"success": False, "message": "Invalid date format", "schedule": {}}
             )
 
+        # Unchanged since the client's copy: answer before any schedule work
+        version = AdminScheduleService.get_schedule_version(
+            start_date, end_date, sport_filter
+        )
+        etag = None
+        if version is not None:
+            etag = make_etag(
+                "schedule",
+                version["version"],
+                start_date,
+                end_date,
+                sport_filter or "",
+                "compact" if compact else "",
+            )
+            cached = not_modified(etag, version["updated_at"])
+            if cached is not None:
+                return cached
+
         # Test database connection first
         test_query = "SELECT COUNT(*) as count FROM bookings WHERE booking_date BETWEEN %s AND %s"
         test_result = AdminDatabaseManager.execute_query(
@@ -459,9 +560,7 @@ def api_schedule_data():
 
         if test_result:
             total_bookings = test_result.get("count", 0)
-            logger.info(
-                f"📊 Database connection OK: {total_bookings} bookings in date range"
-            )
+            logger.debug("📊 Database connection OK: %s bookings in date range", total_bookings)
         else:
             logger.error("❌ Database connection failed")
             return jsonify(
@@ -474,36 +573,49 @@ def api_schedule_data():
 
         # Get schedule data using fixed method
         schedule = AdminScheduleService.get_schedule_data(
-            start_date, end_date, sport_filter
+            start_date, end_date, sport_filter, compact=compact
         )
 
         # Count total slots in response
         total_slots = 0
-        for date in schedule:
-            for court in schedule[date]:
-                total_slots += len(schedule[date][court])
+        if compact:
+            total_days = len(schedule.get("dates", []))
+            for day in schedule.get("cells", {}).values():
+                for row in day.values():
+                    total_slots += sum(1 for cell in row if cell >= 0)
+        else:
+            total_days = len(schedule)
+            for date in schedule:
+                for court in schedule[date]:
+                    total_slots += len(schedule[date][court])
 
+        # One INFO line per request; everything finer grained is DEBUG
         logger.info(
-            f"📈 FIXED: Schedule API returning {len(schedule)} days with {total_slots} total scheduled slots"
+            "📈 Schedule API returning %s days with %s total scheduled slots",
+            total_days,
+            total_slots,
         )
 
         # Debug: Log a sample of the schedule data
-        if schedule:
+        if schedule and not compact and logger.isEnabledFor(logging.DEBUG):
             sample_date = list(schedule.keys())[0]
             sample_courts = list(schedule[sample_date].keys())[:2]  # First 2 courts
-            logger.info(f"🔍 Sample schedule data for {sample_date}:")
             for court in sample_courts:
                 court_slots = schedule[sample_date][court]
-                logger.info(
-                    f"  Court {court}: {len(court_slots)} slots - {list(court_slots.keys())[:3]}"
+                logger.debug(
+                    "🔍 Sample %s court %s: %s slots - %s",
+                    sample_date,
+                    court,
+                    len(court_slots),
+                    list(court_slots.keys())[:3],
                 )
 
-        return jsonify(
+        response = jsonify(
             {
                 "success": True,
                 "schedule": schedule,
                 "debug_info": {
-                    "total_days": len(schedule),
+                    "total_days": total_days,
                     "total_slots": total_slots,
                     "total_bookings_in_range": total_bookings,
                     "sport_filter": sport_filter,
@@ -511,6 +623,10 @@ def api_schedule_data():
                 },
             }
         )
+        # An empty schedule means the lookup failed; never let clients pin it
+        if etag is None or not schedule:
+            return response
+        return with_validators(response, etag, version["updated_at"])
 
     except Exception as e:
         logger.error(f"❌ FIXED: Schedule API error: {e}")
@@ -595,6 +711,16 @@ class AdminBookingService:
 
             if result is not None:
                 logger.info(f"Admin created booking: {booking_id}")
+                publish_booking_change(
+                    "created",
+                    booking_id,
+                    {
+                        "court": booking_data["court"],
+                        "booking_date": booking_data["date"],
+                        "status": params[-1],
+                        "selected_slots": selected_slots,
+                    },
+                )
                 return booking_id
             else:
                 raise Exception("Failed to create booking")
@@ -603,6 +729,148 @@ class AdminBookingService:
             logger.error(f"Error creating admin booking: {e}")
             raise e
 
+    @staticmethod
+    def _series_conflicts(cursor, court, dates, times):
+        """Taken slots per date for a series, keyed by ISO date"""
+        cursor.execute(
+            SERIES_CONFLICTS_SQL, {"court": court, "dates": dates, "slots": times}
+        )
+        return {
+            row["booking_date"].strftime("%Y-%m-%d"): {
+                "date": row["booking_date"].strftime("%Y-%m-%d"),
+                "slots": row["slots"],
+                "bookingIds": row["booking_ids"],
+            }
+            for row in cursor.fetchall()
+        }
+
+    @staticmethod
+    def create_series(booking_data, recurrence, skip_conflicts=False, dry_run=False):
+        """Create one booking per recurrence date in a single transaction.
+
+        Conflicts for every occurrence are found with one query. Unless
+        skip_conflicts is set, any conflict means nothing is created; with
+        it, dates claimed by someone else mid-insert are skipped as well.
+        Returns {seriesId, occurrences, created: [{date, bookingId}],
+        conflicts: [{date, slots, bookingIds}]}. Bad input raises ValueError.
+        """
+        court = booking_data["court"]
+        start_time = booking_data["startTime"]
+        duration = float(booking_data["duration"])
+        dates = expand_recurrence(booking_data["date"], recurrence)
+
+        selected_slots = AdminBookingService._create_time_slots(start_time, duration)
+        times = [slot["time"] for slot in selected_slots]
+        first = SLOT_INDEX.get(times[0]) if times else None
+        if first is None or first + len(times) > SLOTS_PER_DAY:
+            raise ValueError("Bookings must fit the 06:00-06:00 day (last slot starts at 05:30)")
+
+        sport = AdminBookingService._get_court_sport(court)
+        series_id = "NS" + AdminBookingService._generate_booking_id()[2:]
+        end_time = AdminBookingService._calculate_end_time(start_time, duration)
+        status = booking_data.get("status", "confirmed")
+        total_amount = booking_data.get(
+            "totalAmount", AdminBookingService._calculate_amount(sport, duration)
+        )
+
+        timer = QueryTimer("admin", SERIES_INSERT_SQL)
+        conn = AdminDatabaseManager.get_connection()
+        timer.connected()
+        if not conn:
+            timer.failed = True
+            timer.finish()
+            raise Exception("Failed to create booking series")
+
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            conflicts = AdminBookingService._series_conflicts(cursor, court, dates, times)
+
+            free_dates = [d for d in dates if d not in conflicts]
+            if dry_run or (conflicts and not skip_conflicts):
+                free_dates = []
+
+            rows = [
+                (
+                    AdminBookingService._generate_booking_id(),
+                    sport,
+                    court,
+                    AdminBookingService._get_court_name(court),
+                    booking_date,
+                    start_time,
+                    end_time,
+                    duration,
+                    json.dumps(selected_slots),
+                    booking_data["playerName"],
+                    booking_data["playerPhone"],
+                    booking_data.get("playerEmail", ""),
+                    booking_data.get("playerCount", "2"),
+                    booking_data.get("specialRequests", ""),
+                    "full",
+                    total_amount,
+                    status,
+                    series_id,
+                )
+                for booking_date in free_dates
+            ]
+            for attempt in range(SERIES_INSERT_RETRIES + 1):
+                if not rows:
+                    break
+                # One multi-row INSERT; the slot trigger still guards against a race
+                cursor.execute("SAVEPOINT series_insert")
+                try:
+                    execute_values(cursor, SERIES_INSERT_SQL, rows, page_size=len(rows))
+                    break
+                except Exception as e:
+                    if (
+                        not skip_conflicts
+                        or not slot_conflict_from_error(e)
+                        or attempt == SERIES_INSERT_RETRIES
+                    ):
+                        raise
+                # Someone claimed a slot since the conflict query: skip those dates too
+                cursor.execute("ROLLBACK TO SAVEPOINT series_insert")
+                conflicts = AdminBookingService._series_conflicts(cursor, court, dates, times)
+                rows = [row for row in rows if row[4] not in conflicts]
+            conn.commit()
+
+        except Exception as e:
+            timer.failed = True
+            conn.rollback()
+            conflict = slot_conflict_from_error(e)
+            if conflict:
+                raise conflict
+            logger.error(f"Error creating booking series: {e}")
+            raise
+        finally:
+            AdminDatabaseManager.release_connection(conn)
+            timer.finish()
+
+        if rows:
+            logger.info(
+                f"Admin created series {series_id}: {len(rows)} bookings on {court}, "
+                f"{len(conflicts)} dates skipped"
+            )
+            publish_booking_changes(
+                "created",
+                [
+                    {
+                        "id": row[0],
+                        "court": court,
+                        "booking_date": row[4],
+                        "status": status,
+                        "selected_slots": selected_slots,
+                    }
+                    for row in rows
+                ],
+            )
+
+        return {
+            "seriesId": series_id if rows else None,
+            "occurrences": len(dates),
+            "created": [{"date": row[4], "bookingId": row[0]} for row in rows],
+            "conflicts": [conflicts[d] for d in dates if d in conflicts],
+        }
+
     @staticmethod
     def update_booking(booking_data):
         """Update existing booking"""
@@ -635,23 +903,58 @@ class AdminBookingService:
                     update_fields.append(f"{db_field} = %s")
                     update_values.append(booking_data[frontend_field])
 
+            # Keep selected_slots (and so the slot claims) in step with the new times
+            if "startTime" in booking_data and "duration" in booking_data:
+                duration = float(booking_data["duration"])
+                update_fields.append("selected_slots = %s")
+                update_values.append(
+                    json.dumps(
+                        AdminBookingService._create_time_slots(
+                            booking_data["startTime"], duration
+                        )
+                    )
+                )
+                if "endTime" not in booking_data:
+                    update_fields.append("end_time = %s")
+                    update_values.append(
+                        AdminBookingService._calculate_end_time(
+                            booking_data["startTime"], duration
+                        )
+                    )
+
             if not update_fields:
                 raise ValueError("No fields to update")
 
             update_values.append(booking_id)
 
+            # Return the old court/date too so both sides get invalidated
             update_query = f"""
                 UPDATE bookings 
                 SET {', '.join(update_fields)}
-                WHERE id = %s
+                FROM (
+                    SELECT id, court, booking_date, selected_slots
+                    FROM bookings WHERE id = %s FOR UPDATE
+                ) AS old
+                WHERE bookings.id = old.id
+                RETURNING old.court AS old_court, old.booking_date AS old_date,
+                    old.selected_slots AS old_selected_slots,
+                    bookings.court, bookings.booking_date, bookings.status,
+                    bookings.selected_slots
             """
 
             result = AdminDatabaseManager.execute_query(
-                update_query, update_values, fetch_all=False
+                update_query, update_values, fetch_one=True
             )
 
             if result is not None:
                 logger.info(f"Updated booking: {booking_id}")
+                publish_booking_change(
+                    "updated",
+                    booking_id,
+                    result,
+                    previous_court=result["old_court"],
+                    previous_date=result["old_date"],
+                )
                 return True
             else:
                 raise Exception("Failed to update booking")
@@ -669,16 +972,19 @@ class AdminBookingService:
                     UPDATE bookings 
                     SET status = 'confirmed', payment_verified = TRUE, confirmed_at = CURRENT_TIMESTAMP
                     WHERE id = %s
+                    RETURNING court, booking_date, status, selected_slots
                 """,
                 "cancel": """
                     UPDATE bookings 
                     SET status = 'cancelled', cancelled_at = CURRENT_TIMESTAMP
                     WHERE id = %s
+                    RETURNING court, booking_date, status, selected_slots
                 """,
                 "decline": """
                     UPDATE bookings 
                     SET status = 'cancelled', cancelled_at = CURRENT_TIMESTAMP
                     WHERE id = %s
+                    RETURNING court, booking_date, status, selected_slots
                 """,
             }
 
@@ -686,11 +992,17 @@ class AdminBookingService:
                 raise ValueError(f"Invalid action: {action}")
 
             result = AdminDatabaseManager.execute_query(
-                action_queries[action], (booking_id,), fetch_all=False
+                action_queries[action], (booking_id,), fetch_one=True
             )
 
             if result is not None:
                 logger.info(f"Performed action '{action}' on booking: {booking_id}")
+                event_types = {
+                    "confirm": "confirmed",
+                    "cancel": "cancelled",
+                    "decline": "declined",
+                }
+                publish_booking_change(event_types[action], booking_id, result)
                 return True
             else:
                 raise Exception(f"Failed to {action} booking")
@@ -699,171 +1011,235 @@ class AdminBookingService:
             logger.error(f"Error performing booking action: {e}")
             raise e
 
+    @staticmethod
+    def perform_bulk_action(action, booking_ids=None, filters=None):
+        """Apply action to many bookings in one statement; returns (results, more).
 
-# FIXED: Search bookings method in AdminBookingService class
-# Replace the existing search_bookings method with this fixed version
-
+        Each result is {id, outcome, status} with outcome "done", "skipped"
+        (the booking's status doesn't allow the action) or "not_found".
+        """
+        query, params = bulk_action_query(action, booking_ids, filters)
+        rows = AdminDatabaseManager.execute_query(query, params)
+        if rows is None:
+            raise Exception(f"Failed to {action} bookings")
 
-@staticmethod
-def search_bookings(method, value=None, start_date=None, end_date=None):
-    """FIXED: Search bookings by various criteria with proper JSON serialization"""
-    try:
-        if method == "id":
-            query = "SELECT * FROM bookings WHERE id = %s"
-            params = (value,)
-        elif method == "phone":
-            query = "SELECT * FROM bookings WHERE player_phone LIKE %s ORDER BY created_at DESC"
-            params = (f"%{value}%",)
-        elif method == "name":
-            query = "SELECT * FROM bookings WHERE player_name ILIKE %s ORDER BY created_at DESC"
-            params = (f"%{value}%",)
-        elif method == "date":
-            query = "SELECT * FROM bookings WHERE booking_date BETWEEN %s AND %s ORDER BY booking_date DESC, start_time DESC"
-            params = (start_date, end_date)
-        else:
-            raise ValueError(f"Invalid search method: {method}")
+        done = [row for row in rows if row["outcome"] == "done"]
+        publish_booking_changes(BULK_ACTIONS[action][2], done)
+        logger.info(
+            f"Bulk {action}: {len(done)} done, {len(rows) - len(done)} skipped or not found"
+        )
 
-        bookings = AdminDatabaseManager.execute_query(query, params) or []
+        if booking_ids:
+            order = {booking_id: i for i, booking_id in enumerate(params["ids"])}
+            rows.sort(key=lambda row: order[row["id"]])
+        results = [
+            {"id": row["id"], "outcome": row["outcome"], "status": row["status"]}
+            for row in rows
+        ]
+        # A filter may match more than one request handles
+        more = not booking_ids and len(rows) == MAX_BULK_BOOKINGS
+        return results, more
 
-        # FIXED: Format bookings for frontend with proper serialization
-        formatted_bookings = []
-        for booking in bookings:
-            try:
-                booking_dict = dict(booking)
-
-                # FIXED: Handle datetime objects properly
-                formatted_booking = {
-                    "id": booking_dict.get("id"),
-                    "sport": booking_dict.get("sport"),
-                    "court": booking_dict.get("court"),
-                    "courtName": booking_dict.get("court_name"),
-                    "playerName": booking_dict.get("player_name"),
-                    "playerPhone": booking_dict.get("player_phone"),
-                    "playerEmail": booking_dict.get("player_email", ""),
-                    "totalAmount": booking_dict.get("total_amount", 0),
-                    "status": booking_dict.get("status"),
-                    "duration": (
-                        float(booking_dict.get("duration", 1.0))
-                        if booking_dict.get("duration")
-                        else 1.0
-                    ),
-                }
+    @staticmethod
+    def get_bulk_candidates(filters):
+        """Bookings matching the bulk filters, for selection in the admin panel"""
+        query, params = filter_query(filters, columns=PREVIEW_COLUMNS, limit=MAX_BULK_BOOKINGS + 1)
+        rows = AdminDatabaseManager.execute_query(query, params)
+        if rows is None:
+            raise Exception("Failed to load bookings")
+
+        bookings = [
+            {
+                "id": row["id"],
+                "sport": row["sport"],
+                "court": row["court"],
+                "courtName": row["court_name"],
+                "date": row["booking_date"].strftime("%Y-%m-%d"),
+                "startTime": row["start_time"].strftime("%H:%M"),
+                "endTime": row["end_time"].strftime("%H:%M"),
+                "playerName": row["player_name"],
+                "playerPhone": row["player_phone"],
+                "totalAmount": row["total_amount"],
+                "status": row["status"],
+                "seriesId": row["series_id"],
+            }
+            for row in rows[:MAX_BULK_BOOKINGS]
+        ]
+        return bookings, len(rows) > MAX_BULK_BOOKINGS
 
-                # FIXED: Convert dates and times to strings
-                if booking_dict.get("booking_date"):
-                    if hasattr(booking_dict["booking_date"], "strftime"):
-                        formatted_booking["date"] = booking_dict[
-                            "booking_date"
-                        ].strftime("%Y-%m-%d")
-                        formatted_booking["booking_date"] = booking_dict[
-                            "booking_date"
-                        ].strftime("%Y-%m-%d")
-                    else:
-                        formatted_booking["date"] = str(booking_dict["booking_date"])
-                        formatted_booking["booking_date"] = str(
-                            booking_dict["booking_date"]
-                        )
+    # Whether pg_trgm is installed; looked up on the first search
+    _search_trigram = None
 
-                if booking_dict.get("start_time"):
-                    if hasattr(booking_dict["start_time"], "strftime"):
-                        formatted_booking["startTime"] = booking_dict[
-                            "start_time"
-                        ].strftime("%H:%M")
-                    else:
-                        formatted_booking["startTime"] = str(booking_dict["start_time"])
+    @staticmethod
+    def search_bookings(
+        method, value=None, start_date=None, end_date=None, cursor=None, limit=None
+    ):
+        """Indexed, keyset-paginated search; returns (bookings, next_cursor).
 
-                if booking_dict.get("end_time"):
-                    if hasattr(booking_dict["end_time"], "strftime"):
-                        formatted_booking["endTime"] = booking_dict[
-                            "end_time"
-                        ].strftime("%H:%M")
-                    else:
-                        formatted_booking["endTime"] = str(booking_dict["end_time"])
+        Invalid input raises ValueError so the caller can show the message.
+        """
+        if AdminBookingService._search_trigram is None:
+            row = AdminDatabaseManager.execute_query(HAS_TRIGRAM_SQL, fetch_one=True)
+            if row is not None:
+                AdminBookingService._search_trigram = row["has_trigram"]
+
+        limit = page_size(limit)
+        where, params = match_clause(
+            method,
+            value,
+            start_date,
+            end_date,
+            trigram=AdminBookingService._search_trigram is not False,
+        )
+        query, params = build_search_query(method, where, params, cursor, limit)
 
-                if booking_dict.get("created_at"):
-                    if hasattr(booking_dict["created_at"], "strftime"):
-                        formatted_booking["createdDateTime"] = booking_dict[
-                            "created_at"
-                        ].strftime("%b %d, %Y %I:%M %p")
-                    else:
-                        formatted_booking["createdDateTime"] = str(
-                            booking_dict["created_at"]
-                        )
+        try:
+            bookings = AdminDatabaseManager.execute_query(query, params)
+            if bookings is None:
+                raise Exception("Search query failed")
+
+            next_cursor = None
+            if len(bookings) > limit:
+                bookings = bookings[:limit]
+                next_cursor = cursor_for(method, bookings[-1])
+
+            # FIXED: Format bookings for frontend with proper serialization
+            formatted_bookings = []
+            for booking in bookings:
+                try:
+                    booking_dict = dict(booking)
+
+                    # FIXED: Handle datetime objects properly
+                    formatted_booking = {
+                        "id": booking_dict.get("id"),
+                        "sport": booking_dict.get("sport"),
+                        "court": booking_dict.get("court"),
+                        "courtName": booking_dict.get("court_name"),
+                        "playerName": booking_dict.get("player_name"),
+                        "playerPhone": booking_dict.get("player_phone"),
+                        "playerEmail": booking_dict.get("player_email", ""),
+                        "totalAmount": booking_dict.get("total_amount", 0),
+                        "status": booking_dict.get("status"),
+                        "duration": (
+                            float(booking_dict.get("duration", 1.0))
+                            if booking_dict.get("duration")
+                            else 1.0
+                        ),
+                    }
 
-                # FIXED: Handle selected_slots JSON
-                if booking_dict.get("selected_slots"):
-                    try:
-                        if isinstance(booking_dict["selected_slots"], str):
-                            formatted_booking["selectedSlots"] = json.loads(
-                                booking_dict["selected_slots"]
+                    # FIXED: Convert dates and times to strings
+                    if booking_dict.get("booking_date"):
+                        if hasattr(booking_dict["booking_date"], "strftime"):
+                            formatted_booking["date"] = booking_dict[
+                                "booking_date"
+                            ].strftime("%Y-%m-%d")
+                            formatted_booking["booking_date"] = booking_dict[
+                                "booking_date"
+                            ].strftime("%Y-%m-%d")
+                        else:
+                            formatted_booking["date"] = str(booking_dict["booking_date"])
+                            formatted_booking["booking_date"] = str(
+                                booking_dict["booking_date"]
                             )
+
+                    if booking_dict.get("start_time"):
+                        if hasattr(booking_dict["start_time"], "strftime"):
+                            formatted_booking["startTime"] = booking_dict[
+                                "start_time"
+                            ].strftime("%H:%M")
+                        else:
+                            formatted_booking["startTime"] = str(booking_dict["start_time"])
+
+                    if booking_dict.get("end_time"):
+                        if hasattr(booking_dict["end_time"], "strftime"):
+                            formatted_booking["endTime"] = booking_dict[
+                                "end_time"
+                            ].strftime("%H:%M")
                         else:
-                            formatted_booking["selectedSlots"] = booking_dict[
-                                "selected_slots"
-                            ]
-                    except (json.JSONDecodeError, TypeError):
+                            formatted_booking["endTime"] = str(booking_dict["end_time"])
+
+                    if booking_dict.get("created_at"):
+                        if hasattr(booking_dict["created_at"], "strftime"):
+                            formatted_booking["createdDateTime"] = booking_dict[
+                                "created_at"
+                            ].strftime("%b %d, %Y %I:%M %p")
+                        else:
+                            formatted_booking["createdDateTime"] = str(
+                                booking_dict["created_at"]
+                            )
+
+                    # FIXED: Handle selected_slots JSON
+                    if booking_dict.get("selected_slots"):
+                        try:
+                            if isinstance(booking_dict["selected_slots"], str):
+                                formatted_booking["selectedSlots"] = json.loads(
+                                    booking_dict["selected_slots"]
+                                )
+                            else:
+                                formatted_booking["selectedSlots"] = booking_dict[
+                                    "selected_slots"
+                                ]
+                        except (json.JSONDecodeError, TypeError):
+                            formatted_booking["selectedSlots"] = []
+                    else:
                         formatted_booking["selectedSlots"] = []
-                else:
-                    formatted_booking["selectedSlots"] = []
-
-                # FIXED: Create formatted time display
-                if (
-                    formatted_booking.get("date")
-                    and formatted_booking.get("startTime")
-                    and formatted_booking.get("endTime")
-                ):
-                    try:
-                        booking_date = datetime.strptime(
-                            formatted_booking["date"], "%Y-%m-%d"
-                        )
-                        formatted_date = booking_date.strftime("%a, %b %d")
 
-                        # Convert to 12-hour format
-                        start_time = datetime.strptime(
-                            formatted_booking["startTime"], "%H:%M"
-                        )
-                        end_time = datetime.strptime(
-                            formatted_booking["endTime"], "%H:%M"
-                        )
+                    # FIXED: Create formatted time display
+                    if (
+                        formatted_booking.get("date")
+                        and formatted_booking.get("startTime")
+                        and formatted_booking.get("endTime")
+                    ):
+                        try:
+                            booking_date = datetime.strptime(
+                                formatted_booking["date"], "%Y-%m-%d"
+                            )
+                            formatted_date = booking_date.strftime("%a, %b %d")
 
-                        start_12hr = start_time.strftime("%I:%M %p").lstrip("0")
-                        end_12hr = end_time.strftime("%I:%M %p").lstrip("0")
+                            # Convert to 12-hour format
+                            start_time = datetime.strptime(
+                                formatted_booking["startTime"], "%H:%M"
+                            )
+                            end_time = datetime.strptime(
+                                formatted_booking["endTime"], "%H:%M"
+                            )
 
-                        formatted_booking["formatted_time"] = (
-                            f'<div class="time-display">{formatted_date}</div><div style="font-weight: 600; color: #28a745;">{start_12hr} - {end_12hr}</div>'
-                        )
-                    except (ValueError, TypeError) as e:
-                        formatted_booking["formatted_time"] = (
-                            f"{formatted_booking.get('startTime', 'N/A')} - {formatted_booking.get('endTime', 'N/A')}"
-                        )
+                            start_12hr = start_time.strftime("%I:%M %p").lstrip("0")
+                            end_12hr = end_time.strftime("%I:%M %p").lstrip("0")
 
-                formatted_bookings.append(formatted_booking)
+                            formatted_booking["formatted_time"] = (
+                                f'<div class="time-display">{formatted_date}</div><div style="font-weight: 600; color: #28a745;">{start_12hr} - {end_12hr}</div>'
+                            )
+                        except (ValueError, TypeError) as e:
+                            formatted_booking["formatted_time"] = (
+                                f"{formatted_booking.get('startTime', 'N/A')} - {formatted_booking.get('endTime', 'N/A')}"
+                            )
 
-            except Exception as e:
-                logger.error(
-                    f"Error formatting booking {booking.get('id', 'unknown')}: {e}"
-                )
-                # Add basic booking info even if formatting fails
-                formatted_bookings.append(
-                    {
-                        "id": str(booking.get("id", "N/A")),
-                        "playerName": str(booking.get("player_name", "N/A")),
-                        "status": str(booking.get("status", "unknown")),
-                        "formatted_time": "Error formatting time",
-                    }
-                )
+                    formatted_bookings.append(formatted_booking)
 
-        logger.info(
-            f"FIXED: Successfully formatted {len(formatted_bookings)} bookings for search"
-        )
-        return formatted_bookings
+                except Exception as e:
+                    logger.error(
+                        f"Error formatting booking {booking.get('id', 'unknown')}: {e}"
+                    )
+                    # Add basic booking info even if formatting fails
+                    formatted_bookings.append(
+                        {
+                            "id": str(booking.get("id", "N/A")),
+                            "playerName": str(booking.get("player_name", "N/A")),
+                            "status": str(booking.get("status", "unknown")),
+                            "formatted_time": "Error formatting time",
+                        }
+                    )
 
-    except Exception as e:
-        logger.error(f"FIXED: Error searching bookings: {e}")
-        import traceback
+            logger.debug("Formatted %s bookings for search", len(formatted_bookings))
+            return formatted_bookings, next_cursor
 
-        logger.error(f"FIXED: Full traceback: {traceback.format_exc()}")
-        return []
+        except Exception as e:
+            logger.error(f"FIXED: Error searching bookings: {e}")
+            import traceback
+
+            logger.error(f"FIXED: Full traceback: {traceback.format_exc()}")
+            return [], None
 
     # Utility methods
     @staticmethod
@@ -950,6 +1326,258 @@ def search_bookings(method, value=None, start_date=None, end_date=None):
             return []
 
 
+class AdminBookingListService:
+    """Newest-first booking listing, one keyset page at a time"""
+
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
+    # Only the columns the listing shows; selected_slots and friends stay in the DB
+    LIST_COLUMNS = """
+        id, sport, court, court_name, booking_date, start_time, end_time,
+        duration, player_name, player_phone, player_email, player_count,
+        special_requests, payment_type, total_amount, status, payment_verified,
+        created_at, confirmed_at, cancelled_at
+    """
+
+    @staticmethod
+    def get_page(filters=None, cursor=None, limit=None):
+        """Get one page of bookings; returns (bookings, next_cursor)"""
+        limit = AdminBookingListService._page_size(limit)
+        where, params = AdminBookingListService._filter_clauses(filters or {})
+
+        if cursor:
+            created_at, booking_id = AdminBookingListService.decode_cursor(cursor)
+            # Row comparison matches the (created_at, id) index order exactly;
+            # init_database keeps created_at NOT NULL so no row falls outside it
+            where.append("(created_at, id) < (%s, %s)")
+            params.extend([created_at, booking_id])
+
+        query = f"""
+            SELECT {AdminBookingListService.LIST_COLUMNS}
+            FROM bookings
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s
+        """
+        # One extra row tells us whether another page exists
+        params.append(limit + 1)
+
+        rows = AdminDatabaseManager.execute_query(query, tuple(params))
+        if rows is None:
+            raise Exception("Failed to fetch bookings")
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = AdminBookingListService.encode_cursor(
+                last["created_at"], last["id"]
+            )
+
+        bookings = [AdminBookingListService._format_row(dict(row)) for row in rows]
+        return bookings, next_cursor
+
+    @staticmethod
+    def get_status_counts(filters=None):
+        """Count bookings per status under the same filters (ignores any status filter)"""
+        filters = dict(filters or {})
+        filters.pop("status", None)
+        where, params = AdminBookingListService._filter_clauses(filters)
+
+        query = f"""
+            SELECT status, COUNT(*) AS count
+            FROM bookings
+            {"WHERE " + " AND ".join(where) if where else ""}
+            GROUP BY status
+        """
+
+        rows = AdminDatabaseManager.execute_query(query, tuple(params)) or []
+        counts = {row["status"]: row["count"] for row in rows}
+        counts["total"] = sum(counts.values())
+        return counts
+
+    @staticmethod
+    def encode_cursor(created_at, booking_id):
+        """Opaque cursor for the row after which the next page starts"""
+        raw = f"{created_at.isoformat()}|{booking_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, booking_id = (
+                base64.urlsafe_b64decode(padded).decode().split("|", 1)
+            )
+            return datetime.fromisoformat(created_at), booking_id
+        except Exception:
+            raise ValueError("Invalid page cursor")
+
+    @staticmethod
+    def parse_filters(args):
+        """Pull the supported filters out of request args, dropping blanks"""
+        filters = {}
+        for key in ("status", "sport", "date_from", "date_to"):
+            value = (args.get(key) or "").strip()
+            if value:
+                filters[key] = value
+
+        for key in ("date_from", "date_to"):
+            if key in filters:
+                # Raises ValueError for anything that is not YYYY-MM-DD
+                datetime.strptime(filters[key], "%Y-%m-%d")
+        return filters
+
+    @staticmethod
+    def _page_size(limit):
+        try:
+            limit = int(limit or AdminBookingListService.DEFAULT_PAGE_SIZE)
+        except (TypeError, ValueError):
+            limit = AdminBookingListService.DEFAULT_PAGE_SIZE
+        return max(1, min(limit, AdminBookingListService.MAX_PAGE_SIZE))
+
+    @staticmethod
+    def _filter_clauses(filters):
+        """WHERE clauses and params for status/sport/booking date filters"""
+        where, params = [], []
+        if filters.get("status"):
+            where.append("status = %s")
+            params.append(filters["status"])
+        if filters.get("sport"):
+            where.append("sport = %s")
+            params.append(filters["sport"])
+        if filters.get("date_from"):
+            where.append("booking_date >= %s")
+            params.append(filters["date_from"])
+        if filters.get("date_to"):
+            where.append("booking_date <= %s")
+            params.append(filters["date_to"])
+        return where, params
+
+    @staticmethod
+    def _format_row(booking):
+        """Shape a booking row for the listing template and JSON"""
+        formatted = {
+            "id": booking["id"],
+            "sport": booking["sport"],
+            "court": booking["court"],
+            "courtName": booking["court_name"],
+            "playerName": booking["player_name"],
+            "playerPhone": booking["player_phone"],
+            "playerEmail": booking.get("player_email") or "",
+            "playerCount": booking.get("player_count") or "2",
+            "specialRequests": booking.get("special_requests") or "",
+            "paymentType": booking.get("payment_type") or "advance",
+            "totalAmount": booking.get("total_amount") or 0,
+            "status": booking["status"],
+            "duration": float(booking["duration"]) if booking.get("duration") else None,
+            "paymentVerified": bool(booking.get("payment_verified")),
+            "booking_date": (
+                booking["booking_date"].strftime("%Y-%m-%d")
+                if booking.get("booking_date")
+                else None
+            ),
+            "formatted_time": _format_booking_time_display(
+                booking.get("booking_date"),
+                booking.get("start_time"),
+                booking.get("end_time"),
+            ),
+        }
+
+        for column, key in (
+            ("created_at", "createdDateTime"),
+            ("confirmed_at", "confirmedDateTime"),
+            ("cancelled_at", "cancelledDateTime"),
+        ):
+            if booking.get(column):
+                formatted[key] = booking[column].strftime("%b %d, %Y %I:%M %p")
+
+        return formatted
+
+
+class AdminExportService:
+    """Stream bookings out as CSV or NDJSON without holding them in memory"""
+
+    FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+    BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "2000"))
+
+    COLUMNS = [
+        "id", "sport", "court", "court_name", "booking_date", "start_time",
+        "end_time", "duration", "player_name", "player_phone", "player_email",
+        "player_count", "special_requests", "payment_type", "total_amount",
+        "status", "payment_verified", "created_at", "confirmed_at", "cancelled_at",
+    ]
+
+    @staticmethod
+    def stream(export_format, filters=None, batch_size=None):
+        """Yield encoded chunks, one per batch read from a server-side cursor"""
+        batch_size = batch_size or AdminExportService.BATCH_SIZE
+        where, params = AdminBookingListService._filter_clauses(filters or {})
+        query = f"""
+            SELECT {", ".join(AdminExportService.COLUMNS)}
+            FROM bookings
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY created_at DESC, id DESC
+        """
+        encode = (
+            AdminExportService._csv_chunk
+            if export_format == "csv"
+            else AdminExportService._ndjson_chunk
+        )
+
+        pool = get_pool(DATABASE_CONFIG)
+        conn = pool.getconn()
+        cursor = None
+        exported = 0
+        try:
+            # A named cursor keeps the result set on the server; rows arrive
+            # batch_size at a time instead of all at once
+            cursor = conn.cursor(name=f"booking_export_{uuid.uuid4().hex[:12]}")
+            cursor.itersize = batch_size
+            cursor.execute(query, tuple(params))
+
+            if export_format == "csv":
+                yield AdminExportService._csv_chunk([AdminExportService.COLUMNS])
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                exported += len(rows)
+                yield encode(rows)
+
+            logger.info(f"Exported {exported} bookings as {export_format}")
+
+        except Exception as e:
+            # Headers are already sent, so the client just sees a short file
+            logger.error(f"Booking export failed after {exported} rows: {e}")
+        finally:
+            # Also runs when the client disconnects mid-download
+            if cursor is not None and not conn.closed:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            pool.putconn(conn)
+
+    @staticmethod
+    def _csv_chunk(rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow("" if value is None else value for value in row)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _ndjson_chunk(rows):
+        columns = AdminExportService.COLUMNS
+        return "".join(
+            json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows
+        )
+
+
 # Authentication decorator
 def admin_required(f):
     @wraps(f)
@@ -1068,24 +1696,19 @@ def admin_logout():
     return redirect(url_for("admin_panel.admin_login"))
 
 
+def _get_overall_stats():
+    """Read the overall dashboard counters (None before the first booking)"""
+    result = AdminDatabaseManager.execute_query(OVERALL_STATS_SQL, fetch_one=True)
+    return dict(result) if result else None
+
+
 @admin_bp.route("/dashboard")
 @admin_required
 def admin_dashboard():
     """Admin dashboard"""
     try:
-        # Get dashboard statistics
-        stats_query = """
-            SELECT 
-                COUNT(*) as total_bookings,
-                COUNT(CASE WHEN status = 'pending_payment' THEN 1 END) as pending_payment,
-                COUNT(CASE WHEN status = 'confirmed' THEN 1 END) as confirmed,
-                COUNT(CASE WHEN status = 'cancelled' THEN 1 END) as cancelled,
-                COALESCE(SUM(CASE WHEN status = 'confirmed' THEN total_amount END), 0) as revenue
-            FROM bookings
-        """
-
-        stats_result = AdminDatabaseManager.execute_query(stats_query, fetch_one=True)
-        stats = dict(stats_result) if stats_result else {}
+        # Get dashboard statistics (summed court counters, see booking_stats.py)
+        stats = _get_overall_stats() or dict(EMPTY_STATS)
 
         # Get recent bookings for dashboard
         recent_query = """
@@ -1138,137 +1761,95 @@ def admin_dashboard():
 @admin_bp.route("/bookings")
 @admin_required
 def admin_bookings():
-    """Admin bookings management page with proper data formatting"""
+    """Admin bookings management page, one keyset page at a time"""
+    filters, cursor = {}, request.args.get("cursor")
     try:
-        logger.info("Loading admin bookings page...")
-
-        # Direct query to get all bookings with proper formatting
-        query = """
-            SELECT 
-                id, sport, court, court_name, booking_date, start_time, end_time,
-                duration, selected_slots, player_name, player_phone, player_email,
-                player_count, special_requests, payment_type, total_amount, status,
-                payment_verified, created_at, confirmed_at, cancelled_at
-            FROM bookings 
-            ORDER BY created_at DESC
-        """
-
-        raw_bookings = AdminDatabaseManager.execute_query(query) or []
-        logger.info(f"Found {len(raw_bookings)} bookings in database")
-
-        # Format bookings for template
-        bookings = []
-        for booking in raw_bookings:
-            try:
-                booking_dict = dict(booking)
-
-                # Format the booking data properly
-                formatted_booking = {
-                    "id": booking_dict.get("id"),
-                    "sport": booking_dict.get("sport"),
-                    "court": booking_dict.get("court"),
-                    "courtName": booking_dict.get("court_name"),
-                    "court_name": booking_dict.get(
-                        "court_name"
-                    ),  # Both formats for compatibility
-                    "playerName": booking_dict.get("player_name"),
-                    "player_name": booking_dict.get("player_name"),  # Both formats
-                    "playerPhone": booking_dict.get("player_phone"),
-                    "player_phone": booking_dict.get("player_phone"),  # Both formats
-                    "playerEmail": booking_dict.get("player_email", ""),
-                    "player_email": booking_dict.get("player_email", ""),
-                    "playerCount": booking_dict.get("player_count", "2"),
-                    "player_count": booking_dict.get("player_count", "2"),
-                    "specialRequests": booking_dict.get("special_requests", ""),
-                    "special_requests": booking_dict.get("special_requests", ""),
-                    "paymentType": booking_dict.get("payment_type", "advance"),
-                    "payment_type": booking_dict.get("payment_type", "advance"),
-                    "totalAmount": booking_dict.get("total_amount", 0),
-                    "total_amount": booking_dict.get("total_amount", 0),
-                    "status": booking_dict.get("status"),
-                    "duration": booking_dict.get("duration"),
-                    "paymentVerified": booking_dict.get("payment_verified", False),
-                }
+        filters = AdminBookingListService.parse_filters(request.args)
+        bookings, next_cursor = AdminBookingListService.get_page(
+            filters, cursor, request.args.get("limit")
+        )
+        status_counts = AdminBookingListService.get_status_counts(filters)
+        logger.info(f"Loaded {len(bookings)} bookings for admin listing")
 
-                # Format dates and times
-                booking_date = booking_dict.get("booking_date")
-                start_time = booking_dict.get("start_time")
-                end_time = booking_dict.get("end_time")
-                created_at = booking_dict.get("created_at")
-                confirmed_at = booking_dict.get("confirmed_at")
-                cancelled_at = booking_dict.get("cancelled_at")
-
-                # Format display date
-                if booking_date:
-                    if isinstance(booking_date, str):
-                        date_obj = datetime.strptime(booking_date, "%Y-%m-%d")
-                    else:
-                        date_obj = booking_date
-                    formatted_booking["display_date"] = date_obj.strftime("%Y-%m-%d")
-                    formatted_booking["booking_date"] = date_obj.strftime("%Y-%m-%d")
+        return render_template(
+            "admin_bookings.html",
+            bookings=bookings,
+            next_cursor=next_cursor,
+            is_first_page=not cursor,
+            filters=filters,
+            status_counts=status_counts,
+        )
 
-                # Format time display for template
-                formatted_booking["formatted_time"] = _format_booking_time_display(
-                    booking_date, start_time, end_time
-                )
+    except Exception as e:
+        logger.error(f"Admin bookings error: {e}")
+        return render_template(
+            "admin_bookings.html",
+            bookings=[],
+            next_cursor=None,
+            is_first_page=not cursor,
+            filters=filters,
+            status_counts={},
+            error=str(e),
+        )
 
-                # Format created datetime
-                if created_at:
-                    if isinstance(created_at, str):
-                        created_obj = datetime.fromisoformat(
-                            created_at.replace("Z", "+00:00")
-                        )
-                    else:
-                        created_obj = created_at
-                    formatted_booking["createdDateTime"] = created_obj.strftime(
-                        "%b %d, %Y %I:%M %p"
-                    )
 
-                # Format confirmed/cancelled datetime
-                if confirmed_at:
-                    if isinstance(confirmed_at, str):
-                        confirmed_obj = datetime.fromisoformat(
-                            confirmed_at.replace("Z", "+00:00")
-                        )
-                    else:
-                        confirmed_obj = confirmed_at
-                    formatted_booking["confirmedDateTime"] = confirmed_obj.strftime(
-                        "%b %d, %Y %I:%M %p"
-                    )
+@admin_bp.route("/api/bookings")
+@admin_required
+def api_list_bookings():
+    """JSON variant of the bookings listing (pass nextCursor back as ?cursor=)"""
+    try:
+        filters = AdminBookingListService.parse_filters(request.args)
+        bookings, next_cursor = AdminBookingListService.get_page(
+            filters, request.args.get("cursor"), request.args.get("limit")
+        )
 
-                if cancelled_at:
-                    if isinstance(cancelled_at, str):
-                        cancelled_obj = datetime.fromisoformat(
-                            cancelled_at.replace("Z", "+00:00")
-                        )
-                    else:
-                        cancelled_obj = cancelled_at
-                    formatted_booking["cancelledDateTime"] = cancelled_obj.strftime(
-                        "%b %d, %Y %I:%M %p"
-                    )
+        return jsonify(
+            {
+                "success": True,
+                "bookings": bookings,
+                "nextCursor": next_cursor,
+                "hasMore": next_cursor is not None,
+            }
+        )
 
-                bookings.append(formatted_booking)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        logger.error(f"List bookings error: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
 
-            except Exception as e:
-                logger.error(
-                    f"Error formatting booking {booking.get('id', 'unknown')}: {e}"
-                )
-                # Add the booking anyway with basic formatting
-                booking_dict = dict(booking)
-                booking_dict["formatted_time"] = "Time formatting error"
-                booking_dict["createdDateTime"] = "N/A"
-                bookings.append(booking_dict)
 
-        logger.info(f"Successfully formatted {len(bookings)} bookings for display")
+@admin_bp.route("/api/export-bookings", methods=["POST"])
+@admin_required
+def api_export_bookings():
+    """Stream a CSV or NDJSON export of bookings matching the filters"""
+    try:
+        data = request.get_json(silent=True) or {}
+        export_format = (data.get("format") or "csv").lower()
+        if export_format not in AdminExportService.FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
 
-        return render_template("admin_bookings.html", bookings=bookings)
+        filters = AdminBookingListService.parse_filters(
+            {
+                "status": data.get("status"),
+                "sport": data.get("sport"),
+                "date_from": data.get("startDate"),
+                "date_to": data.get("endDate"),
+            }
+        )
 
-    except Exception as e:
-        logger.error(f"Admin bookings error: {e}")
-        import traceback
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
 
-        traceback.print_exc()
-        return render_template("admin_bookings.html", bookings=[], error=str(e))
+    filename = f"bookings_export_{datetime.now().strftime('%Y-%m-%d')}.{export_format}"
+    return Response(
+        stream_with_context(AdminExportService.stream(export_format, filters)),
+        mimetype=AdminExportService.FORMATS[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 @admin_bp.route("/schedule")
@@ -1295,14 +1876,16 @@ def confirm_booking(booking_id):
             UPDATE bookings 
             SET status = 'confirmed', payment_verified = TRUE, confirmed_at = CURRENT_TIMESTAMP
             WHERE id = %s
+            RETURNING court, booking_date, status, selected_slots
         """
 
         result = AdminDatabaseManager.execute_query(
-            update_query, (booking_id,), fetch_all=False
+            update_query, (booking_id,), fetch_one=True
         )
 
         if result is not None:
             logger.info(f"Confirmed booking: {booking_id}")
+            publish_booking_change("confirmed", booking_id, result)
             return redirect(
                 url_for("admin_panel.admin_bookings")
                 + "?message=Booking confirmed successfully"
@@ -1329,14 +1912,16 @@ def decline_booking(booking_id):
             UPDATE bookings 
             SET status = 'cancelled', cancelled_at = CURRENT_TIMESTAMP
             WHERE id = %s
+            RETURNING court, booking_date, status, selected_slots
         """
 
         result = AdminDatabaseManager.execute_query(
-            update_query, (booking_id,), fetch_all=False
+            update_query, (booking_id,), fetch_one=True
         )
 
         if result is not None:
             logger.info(f"Declined booking: {booking_id}")
+            publish_booking_change("declined", booking_id, result)
             return redirect(
                 url_for("admin_panel.admin_bookings")
                 + "?message=Booking declined successfully"
@@ -1360,36 +1945,193 @@ def decline_booking(booking_id):
 def api_dashboard_stats():
     """Get dashboard statistics"""
     try:
-        stats_query = """
-            SELECT 
-                COUNT(*) as total_bookings,
-                COUNT(CASE WHEN status = 'pending_payment' THEN 1 END) as pending_payment,
-                COUNT(CASE WHEN status = 'confirmed' THEN 1 END) as confirmed,
-                COUNT(CASE WHEN status = 'cancelled' THEN 1 END) as cancelled,
-                COALESCE(SUM(CASE WHEN status = 'confirmed' THEN total_amount END), 0) as revenue
-            FROM bookings
-        """
+        stats = _get_overall_stats() or dict(EMPTY_STATS)
+        return jsonify({"success": True, "stats": stats})
+
+    except Exception as e:
+        logger.error(f"Dashboard stats error: {e}")
+        return jsonify({"success": False, "message": str(e)})
+
+
+@admin_bp.route("/api/booking-stats/<scope>")
+@admin_required
+def api_booking_stats_breakdown(scope):
+    """Get the maintained counters for every day, sport or court"""
+    if scope not in SCOPES:
+        return jsonify({"success": False, "message": f"Unknown scope: {scope}"}), 400
+
+    try:
+        rows = AdminDatabaseManager.execute_query(SCOPE_STATS_SQL, (scope,))
+        if rows is None:
+            raise Exception("Failed to read booking stats")
+        return jsonify({"success": True, "scope": scope, "stats": [dict(r) for r in rows]})
+
+    except Exception as e:
+        logger.error(f"Booking stats error: {e}")
+        return jsonify({"success": False, "message": str(e)})
+
+
+@admin_bp.route("/api/analytics/<report>")
+@admin_required
+def api_analytics(report):
+    """Occupancy, utilization, revenue and cancellation analytics for a date range"""
+    if report != "all" and report not in REPORTS:
+        return jsonify({"success": False, "message": f"Unknown report: {report}"}), 400
+
+    try:
+        end_date = request.args.get("end") or datetime.now().strftime("%Y-%m-%d")
+        start_date = request.args.get("start") or (
+            datetime.strptime(end_date, "%Y-%m-%d") - timedelta(days=29)
+        ).strftime("%Y-%m-%d")
+        days = (
+            datetime.strptime(end_date, "%Y-%m-%d")
+            - datetime.strptime(start_date, "%Y-%m-%d")
+        ).days + 1
+        if not 1 <= days <= 366:
+            raise ValueError("Date range must cover 1 to 366 days")
+
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    try:
+        courts = [court["id"] for sport in COURT_CONFIG.values() for court in sport]
+        columns = BookingColumns.load(
+            AdminDatabaseManager.execute_query, start_date, end_date, courts
+        )
 
-        result = AdminDatabaseManager.execute_query(stats_query, fetch_one=True)
-        stats = (
-            dict(result)
-            if result
-            else {
-                "total_bookings": 0,
-                "pending_payment": 0,
-                "confirmed": 0,
-                "cancelled": 0,
-                "revenue": 0,
+        return jsonify(
+            {
+                "success": True,
+                "start": start_date,
+                "end": end_date,
+                "report": report,
+                "data": build_report(columns, report),
             }
         )
 
-        return jsonify({"success": True, "stats": stats})
+    except Exception as e:
+        logger.error(f"Analytics error: {e}")
+        return jsonify({"success": False, "message": str(e)})
+
+
+@admin_bp.route("/api/db-pool-stats")
+@admin_required
+def api_db_pool_stats():
+    """Get connection pool metrics"""
+    try:
+        return jsonify({"success": True, "pool": get_pool(DATABASE_CONFIG).stats()})
 
     except Exception as e:
-        logger.error(f"Dashboard stats error: {e}")
+        logger.error(f"Pool stats error: {e}")
+        return jsonify({"success": False, "message": str(e)})
+
+
+@admin_bp.route("/api/cache-stats")
+@admin_required
+def api_cache_stats():
+    """Get availability cache hit/miss counters"""
+    try:
+        return jsonify(
+            {
+                "success": True,
+                "cache": availability_cache.stats(),
+                "changeFeed": change_feed.stats(),
+                "customerIndex": customer_index.stats(),
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Cache stats error: {e}")
+        return jsonify({"success": False, "message": str(e)})
+
+
+@admin_bp.route("/api/send-bulk-notifications", methods=["POST"])
+@admin_required
+def api_send_bulk_notifications():
+    """Queue a bulk notification run; notification_worker.py does the sending"""
+    try:
+        data = request.get_json(silent=True) or {}
+        job_type = data.get("type", "pending_payment_reminder")
+        if job_type not in JOB_TYPES:
+            return (
+                jsonify({"success": False, "message": f"Unknown type: {job_type}"}),
+                400,
+            )
+
+        queued = AdminDatabaseManager.execute_query(
+            ENQUEUE_FOR_STATUS_SQL,
+            {"kind": job_type, "status": JOB_TYPES[job_type]},
+            fetch_all=False,
+        )
+        if queued is None:
+            raise Exception("Failed to queue notifications")
+
+        logger.info(f"Queued {queued} {job_type} notifications")
+        return jsonify({"success": True, "count": queued, "type": job_type})
+
+    except Exception as e:
+        logger.error(f"Bulk notification error: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+@admin_bp.route("/api/notification-metrics")
+@admin_required
+def api_notification_metrics():
+    """Get notification queue depth, lag and recent throughput"""
+    try:
+        metrics = AdminDatabaseManager.execute_query(METRICS_SQL, fetch_one=True)
+        if metrics is None:
+            raise Exception("Failed to read notification metrics")
+
+        metrics = dict(metrics)
+        metrics["lag_seconds"] = float(metrics["lag_seconds"] or 0)
+        metrics["sent_per_minute"] = metrics["sent_last_5m"] / 5
+        return jsonify({"success": True, "metrics": metrics})
+
+    except Exception as e:
+        logger.error(f"Notification metrics error: {e}")
         return jsonify({"success": False, "message": str(e)})
 
 
+@admin_bp.route("/api/slow-queries", methods=["GET", "DELETE"])
+@admin_required
+def api_slow_queries():
+    """Slowest statement fingerprints with captured plans; DELETE clears them"""
+    if request.method == "DELETE":
+        slow_query_log.reset()
+        return jsonify({"success": True})
+
+    limit = request.args.get("limit", type=int)
+    return jsonify(
+        {
+            "success": True,
+            "enabled": slow_query_log.enabled,
+            "thresholdMs": slow_query_log.threshold_ms,
+            "explain": slow_query_log.explain,
+            "queries": slow_query_log.top(limit),
+        }
+    )
+
+
+@admin_bp.route("/api/customers/typeahead")
+@admin_required
+def api_customer_typeahead():
+    """Customers matching a phone or name fragment, served from memory"""
+    started = time.perf_counter()
+    customers = customer_index.search(
+        request.args.get("q", ""), request.args.get("limit", type=int)
+    )
+    return jsonify(
+        {
+            "success": True,
+            # False until this worker's first rebuild; fall back to full search
+            "ready": customer_index.ready,
+            "customers": customers,
+            "tookMs": round((time.perf_counter() - started) * 1000, 2),
+        }
+    )
+
+
 @admin_bp.route("/api/admin-create-booking", methods=["POST"])
 @admin_required
 def api_admin_create_booking():
@@ -1427,6 +2169,33 @@ def api_admin_create_booking():
         return jsonify({"success": False, "message": str(e)})
 
 
+@admin_bp.route("/api/admin-create-series", methods=["POST"])
+@admin_required
+def api_admin_create_series():
+    """Create a recurring series of bookings (dryRun previews conflicts only)"""
+    try:
+        data = request.json
+        booking_data = data.get("booking") or {}
+
+        for field in ["court", "date", "startTime", "duration", "playerName", "playerPhone"]:
+            if not booking_data.get(field):
+                return jsonify(
+                    {"success": False, "message": f"Missing required field: {field}"}
+                )
+
+        result = AdminBookingService.create_series(
+            booking_data,
+            data.get("recurrence"),
+            skip_conflicts=bool(data.get("skipConflicts")),
+            dry_run=bool(data.get("dryRun")),
+        )
+        return jsonify({"success": True, **result})
+
+    except Exception as e:
+        logger.error(f"Admin create series error: {e}")
+        return jsonify({"success": False, "message": str(e)})
+
+
 @admin_bp.route("/api/update-booking", methods=["POST"])
 @admin_required
 def api_update_booking():
@@ -1465,6 +2234,49 @@ def api_admin_booking_action():
         return jsonify({"success": False, "message": str(e)})
 
 
+@admin_bp.route("/api/bulk-bookings", methods=["POST"])
+@admin_required
+def api_bulk_bookings():
+    """List bookings matching the bulk filters"""
+    try:
+        bookings, more = AdminBookingService.get_bulk_candidates(request.json)
+        return jsonify({"success": True, "bookings": bookings, "hasMore": more})
+
+    except Exception as e:
+        logger.error(f"Bulk bookings error: {e}")
+        return jsonify({"success": False, "message": str(e)})
+
+
+@admin_bp.route("/api/bulk-booking-action", methods=["POST"])
+@admin_required
+def api_bulk_booking_action():
+    """Confirm, cancel, decline or delete many bookings in one transaction"""
+    try:
+        data = request.json
+        action = data.get("action")
+        results, more = AdminBookingService.perform_bulk_action(
+            action, data.get("bookingIds"), data.get("filter")
+        )
+
+        counts = {"done": 0, "skipped": 0, "not_found": 0}
+        for result in results:
+            counts[result["outcome"]] += 1
+
+        return jsonify(
+            {
+                "success": True,
+                "action": action,
+                "results": results,
+                "counts": counts,
+                "hasMore": more,
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Bulk booking action error: {e}")
+        return jsonify({"success": False, "message": str(e)})
+
+
 @admin_bp.route("/api/search-bookings", methods=["POST"])
 @admin_required
 def api_search_bookings():
@@ -1476,11 +2288,23 @@ def api_search_bookings():
         start_date = data.get("startDate")
         end_date = data.get("endDate")
 
-        bookings = AdminBookingService.search_bookings(
-            method, value, start_date, end_date
+        bookings, next_cursor = AdminBookingService.search_bookings(
+            method,
+            value,
+            start_date,
+            end_date,
+            cursor=data.get("cursor"),
+            limit=data.get("limit"),
         )
 
-        return jsonify({"success": True, "bookings": bookings})
+        return jsonify(
+            {
+                "success": True,
+                "bookings": bookings,
+                "nextCursor": next_cursor,
+                "hasMore": next_cursor is not None,
+            }
+        )
 
     except Exception as e:
         logger.error(f"Search bookings error: {e}")
@@ -1498,13 +2322,17 @@ def api_delete_booking():
         if not booking_id:
             return jsonify({"success": False, "message": "Missing booking ID"})
 
-        delete_query = "DELETE FROM bookings WHERE id = %s"
+        delete_query = """
+            DELETE FROM bookings WHERE id = %s
+            RETURNING court, booking_date, 'deleted' AS status, selected_slots
+        """
         result = AdminDatabaseManager.execute_query(
-            delete_query, (booking_id,), fetch_all=False
+            delete_query, (booking_id,), fetch_one=True
         )
 
         if result is not None:
             logger.info(f"Deleted booking: {booking_id}")
+            publish_booking_change("deleted", booking_id, result)
             return jsonify({"success": True, "message": "Booking deleted successfully"})
         else:
             raise Exception("Failed to delete booking")
@@ -1,36 +1,140 @@
 import traceback
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for
 import os
 from datetime import datetime, timedelta
 import uuid
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import json
 import logging
-from admin_routes import admin_bp
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+import time
+from admin_routes import COURT_CONFIG, admin_bp
+from db_config import DATABASE_CONFIG
+from db_pool import get_pool
+from availability_cache import availability_cache
+from booking_changes import invalidate_availability, publish_booking_change
+from booking_events import build_event, event_bus
+from change_feed import SCHEMA_SQL as CHANGE_FEED_SCHEMA_SQL, change_feed, event_type_for
+from customer_index import customer_index
+from notification_queue import SCHEMA_SQL as NOTIFICATION_SCHEMA_SQL
+from structured_logging import configure_logging, init_request_ids
+from metrics import QueryTimer, init_metrics, metrics_response
+from slow_queries import slow_query_log
+from booking_search import (
+    HAS_TRIGRAM_SQL,
+    PREFIX_INDEX_SQL,
+    SCHEMA_SQL as BOOKING_SEARCH_SCHEMA_SQL,
+    SEARCH_INDEX_COUNT_SQL,
+    TRIGRAM_EXTENSION_SQL,
+    TRIGRAM_INDEX_SQL,
+)
+from booking_series import SCHEMA_SQL as BOOKING_SERIES_SCHEMA_SQL
+from slot_holds import (
+    CONSUME_HOLD_SQL,
+    EXTEND_SQL as EXTEND_HOLD_SQL,
+    HELD_MASK_SQL,
+    HELD_MASKS_SQL,
+    HOLD_SQL,
+    HOLD_TTL_SECONDS,
+    RELEASE_SQL as RELEASE_HOLD_SQL,
+    SLOTS_VERSION_SQL,
+    SWEEP_BATCH,
+    hold_slot_indexes,
+    new_hold_token,
+)
+from booking_versions import (
+    SCHEMA_SQL as BOOKING_VERSIONS_SCHEMA_SQL,
+    make_etag,
+    not_modified,
+    with_validators,
+)
+from booking_stats import (
+    NEEDS_REBUILD_SQL,
+    REBUILD_SQL,
+    SCHEMA_SQL as BOOKING_STATS_SCHEMA_SQL,
+)
+from booking_slots import (
+    MULTI_PURPOSE_COURTS,
+    SCHEMA_SQL,
+    SURFACE_UPSERT_SQL,
+    UNMIGRATED_CHECK_SQL,
+    SlotConflictError,
+    slot_conflict_from_error,
+)
+from slot_bitmap import (
+    SLOT_INDEX,
+    SLOT_TIMES,
+    SLOTS_PER_DAY,
+    conflicting_slots,
+    free_run_starts,
+    grid_now,
+    mask_to_slots,
+    normalize_slot_time,
+    sibling_courts,
+    window_mask,
+)
+
+# Configure logging (LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_SAMPLE_RATE)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+init_request_ids(app)
+init_metrics(app)
 app.secret_key = "your-secret-key-here"
 app.register_blueprint(admin_bp)
 
-# Database configuration
-DATABASE_CONFIG = {
-    "host": "localhost",
-    "database": "noball_sports",
-    "user": "postgres",
-    "password": "admin@123",
-    "port": "5432",
-}
+COURT_NAMES = {court["id"]: court["name"] for courts in COURT_CONFIG.values() for court in courts}
+
+# Shortest bookable run (1 hour); a day without one is shown as full
+MIN_BOOKING_SLOTS = 2
+
+# Slot search limits; the budget only triggers a slow-search warning
+FIND_SLOTS_MAX_DAYS = 31
+FIND_SLOTS_DEFAULT_LIMIT = 20
+FIND_SLOTS_MAX_LIMIT = 100
+FIND_SLOTS_BUDGET_MS = float(os.environ.get("FIND_SLOTS_BUDGET_MS", "50"))
+
+
+def _apply_booking_notification(change):
+    """Apply a booking change committed by any worker (delivered via NOTIFY)"""
+    court, date = change["court"], change["date"]
+    previous_court, previous_date = change.get("old_court"), change.get("old_date")
+    invalidate_availability(court, date)
+    if previous_court is not None:
+        invalidate_availability(previous_court, previous_date)
+
+    event_bus.publish(
+        build_event(
+            event_type_for(change),
+            change["id"],
+            court,
+            date,
+            change["status"],
+            change["slots"],
+            [court] + sibling_courts(court, MULTI_PURPOSE_COURTS),
+            previous_court,
+            previous_date,
+            previous_court
+            and [previous_court] + sibling_courts(previous_court, MULTI_PURPOSE_COURTS),
+            change.get("old_slots"),
+        )
+    )
+
 
-# Court mapping for multi-purpose courts
-MULTI_PURPOSE_COURTS = {
-    "cricket-2": "multi-130x60",
-    "futsal-1": "multi-130x60",
-}
+change_feed.register(_apply_booking_notification)
+change_feed.register(customer_index.apply_change)
+# Changes may have been missed while the listener was disconnected; the first
+# connect also builds the customer index
+change_feed.register_resync(availability_cache.clear)
+change_feed.register_resync(event_bus.resync_all)
+change_feed.register_resync(customer_index.schedule_rebuild)
+slow_query_log.configure(DATABASE_CONFIG)
+customer_index.configure(DATABASE_CONFIG)
+
+
+def start_change_feed():
+    """Start this process's booking change listener (call once per worker)"""
+    change_feed.start(DATABASE_CONFIG)
 
 
 class DatabaseManager:
@@ -38,21 +142,28 @@ class DatabaseManager:
 
     @staticmethod
     def get_connection():
-        """Get database connection with error handling"""
+        """Get a pooled database connection with error handling"""
         try:
-            conn = psycopg2.connect(**DATABASE_CONFIG)
-            return conn
+            return get_pool(DATABASE_CONFIG).getconn()
         except Exception as e:
             logger.error(f"Database connection error: {e}")
             return None
 
+    @staticmethod
+    def release_connection(conn):
+        """Return a connection to the shared pool"""
+        get_pool(DATABASE_CONFIG).putconn(conn)
+
     @staticmethod
     def execute_query(query, params=None, fetch_one=False, fetch_all=True):
         """Execute query with proper error handling"""
         conn = None
+        timer = QueryTimer("app", query, params)
         try:
             conn = DatabaseManager.get_connection()
+            timer.connected()
             if not conn:
+                timer.failed = True
                 return None
 
             cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -69,93 +180,118 @@ class DatabaseManager:
             return result
 
         except Exception as e:
+            timer.failed = True
             if conn:
                 conn.rollback()
+            conflict = slot_conflict_from_error(e)
+            if conflict:
+                raise conflict
             logger.error(f"Query execution error: {e}")
             logger.error(f"Query: {query}")
             logger.error(f"Params: {params}")
             return None
         finally:
             if conn:
-                conn.close()
+                DatabaseManager.release_connection(conn)
+            timer.finish()
 
 
 class BookingService:
     """Professional booking service layer"""
 
     @staticmethod
-    def get_booked_slots(court_id, date):
-        """Get all booked time slots for a specific court and date"""
-        try:
-            logger.info(f"Fetching booked slots for court: {court_id}, date: {date}")
+    def get_booked_mask(court_id, date):
+        """Get the slot occupancy bitmap for a court and date, including shared courts"""
+        # Claims are stored per surface, so shared courts come back together;
+        # checkout holds expire on their own and are never cached
+        query = """
+            SELECT slot_index FROM booking_slots 
+            WHERE surface = %s 
+            AND booking_date = %s
+            AND booking_id IS NOT NULL
+        """
 
-            booked_slots = set()
+        slots = DatabaseManager.execute_query(
+            query, (MULTI_PURPOSE_COURTS.get(court_id, court_id), date)
+        )
+        if slots is None:
+            raise Exception("Failed to fetch booked slots")
 
-            # Query direct bookings for this court
-            direct_query = """
-                SELECT selected_slots FROM bookings 
-                WHERE status IN ('confirmed', 'pending_payment') 
-                AND booking_date = %s 
-                AND court = %s
-            """
+        mask = 0
+        for slot in slots:
+            mask |= 1 << slot["slot_index"]
+        return mask
 
-            direct_bookings = DatabaseManager.execute_query(
-                direct_query, (date, court_id)
-            )
+    @staticmethod
+    def get_held_mask(court_id, date, hold_token=None):
+        """Bitmap of slots other customers are holding for checkout"""
+        row = DatabaseManager.execute_query(
+            HELD_MASK_SQL,
+            {
+                "surface": MULTI_PURPOSE_COURTS.get(court_id, court_id),
+                "date": date,
+                "token": hold_token,
+            },
+            fetch_one=True,
+        )
+        if row is None:
+            raise Exception("Failed to fetch held slots")
+        return row["held_mask"]
 
-            if direct_bookings:
-                logger.info(f"Found {len(direct_bookings)} direct bookings")
-                for booking in direct_bookings:
-                    slots = booking["selected_slots"]
-                    if slots:
-                        for slot in slots:
-                            if isinstance(slot, dict) and "time" in slot:
-                                booked_slots.add(slot["time"])
-
-            # Check multi-purpose court conflicts
-            if court_id in MULTI_PURPOSE_COURTS:
-                multi_court_type = MULTI_PURPOSE_COURTS[court_id]
-                conflicting_courts = [
-                    k
-                    for k, v in MULTI_PURPOSE_COURTS.items()
-                    if v == multi_court_type and k != court_id
-                ]
-
-                if conflicting_courts:
-                    logger.info(f"Checking conflicts with courts: {conflicting_courts}")
-
-                    placeholders = ",".join(["%s"] * len(conflicting_courts))
-                    conflict_query = f"""
-                        SELECT selected_slots FROM bookings 
-                        WHERE status IN ('confirmed', 'pending_payment') 
-                        AND booking_date = %s 
-                        AND court IN ({placeholders})
-                    """
-
-                    conflict_params = [date] + conflicting_courts
-                    conflict_bookings = DatabaseManager.execute_query(
-                        conflict_query, conflict_params
-                    )
+    @staticmethod
+    def get_held_masks(surfaces, start_date, end_date, hold_token=None):
+        """Held-slot bitmaps for many surfaces and dates, keyed like get_booked_masks"""
+        rows = DatabaseManager.execute_query(
+            HELD_MASKS_SQL,
+            {
+                "surfaces": list(surfaces),
+                "start": start_date,
+                "end": end_date,
+                "token": hold_token,
+            },
+        )
+        if rows is None:
+            raise Exception("Failed to fetch held slots")
+        return {(row["surface"], str(row["booking_date"])): row["held_mask"] for row in rows}
+
+    @staticmethod
+    def get_booked_slots(court_id, date, held_mask=0):
+        """Get all booked time slots for a specific court and date, plus held_mask"""
+        try:
+            logger.debug("Fetching booked slots for court: %s, date: %s", court_id, date)
 
-                    if conflict_bookings:
-                        logger.info(
-                            f"Found {len(conflict_bookings)} conflicting bookings"
-                        )
-                        for booking in conflict_bookings:
-                            slots = booking["selected_slots"]
-                            if slots:
-                                for slot in slots:
-                                    if isinstance(slot, dict) and "time" in slot:
-                                        booked_slots.add(slot["time"])
-
-            result = sorted(list(booked_slots))
-            logger.info(f"Total booked slots: {len(result)}")
+            mask = availability_cache.get_or_load(
+                court_id, date, lambda: BookingService.get_booked_mask(court_id, date)
+            )
+            result = mask_to_slots(mask | held_mask)
+            logger.debug("Total booked slots: %s", len(result))
             return result
 
         except Exception as e:
             logger.error(f"Error fetching booked slots: {e}")
             return []
 
+    @staticmethod
+    def get_slots_version(court_id, date, hold_token=None):
+        """Version row for a court-day, covering courts that share its surface.
+
+        Also carries booked_mask and held_mask (slots held by anyone but
+        hold_token), read in the same snapshot as the version.
+        """
+        courts = [court_id] + sibling_courts(court_id, MULTI_PURPOSE_COURTS)
+        return DatabaseManager.execute_query(
+            SLOTS_VERSION_SQL,
+            {
+                "start": date,
+                "end": date,
+                "courts": courts,
+                "surface": MULTI_PURPOSE_COURTS.get(court_id, court_id),
+                "date": date,
+                "token": hold_token,
+            },
+            fetch_one=True,
+        )
+
     @staticmethod
     def create_booking(booking_data):
         """Create a new booking with validation"""
@@ -212,34 +348,212 @@ class BookingService:
                 "pending_payment",
             )
 
+            # Checking out with a hold: release it in the same statement
+            hold_token = booking_data.get("holdToken")
+            if hold_token:
+                insert_query = CONSUME_HOLD_SQL + insert_query
+                params = (hold_token,) + params
+
             result = DatabaseManager.execute_query(
                 insert_query, params, fetch_all=False
             )
 
             if result is not None:
                 logger.info(f"Successfully created booking: {booking_id}")
+                publish_booking_change(
+                    "created",
+                    booking_id,
+                    {
+                        "court": booking_data["court"],
+                        "booking_date": booking_data["date"],
+                        "status": "pending_payment",
+                        "selected_slots": booking_data["selectedSlots"],
+                    },
+                )
                 return booking_id
             else:
                 raise Exception("Failed to insert booking")
 
+        except SlotConflictError:
+            raise
         except Exception as e:
             logger.error(f"Error creating booking: {e}")
             raise e
 
     @staticmethod
-    def check_slot_availability(court_id, date, selected_slots):
+    def check_slot_availability(court_id, date, selected_slots, hold_token=None):
         """Check if selected slots are still available"""
         try:
-            booked_slots = BookingService.get_booked_slots(court_id, date)
+            booked_mask = BookingService.get_booked_mask(court_id, date)
+            booked_mask |= BookingService.get_held_mask(court_id, date, hold_token)
             slot_times = [slot["time"] for slot in selected_slots]
 
-            conflicts = [slot for slot in slot_times if slot in booked_slots]
+            conflicts = conflicting_slots(slot_times, booked_mask)
             return len(conflicts) == 0, conflicts
 
         except Exception as e:
             logger.error(f"Error checking availability: {e}")
             return False, []
 
+    @staticmethod
+    def hold_slots(court_id, date, slot_times, hold_token=None):
+        """Hold slots for checkout, replacing hold_token's previous hold.
+
+        Returns (token, expires_at); raises SlotConflictError when a slot is
+        booked or held by someone else, ValueError on bad input.
+        """
+        if court_id not in COURT_NAMES:
+            raise ValueError(f"Unknown court: {court_id}")
+        datetime.strptime(str(date), "%Y-%m-%d")
+        times, indexes = hold_slot_indexes(slot_times)
+
+        token = hold_token or new_hold_token()
+        rows = DatabaseManager.execute_query(
+            HOLD_SQL,
+            {
+                "token": token,
+                "court": court_id,
+                "surface": MULTI_PURPOSE_COURTS.get(court_id, court_id),
+                "date": date,
+                "slots": times,
+                "indexes": indexes,
+                "ttl": HOLD_TTL_SECONDS,
+                "sweep_limit": SWEEP_BATCH,
+            },
+        )
+        if not rows:
+            raise Exception("Failed to hold slots")
+        return token, rows[0]["expires_at"]
+
+    @staticmethod
+    def extend_hold(hold_token):
+        """Push a live hold's expiry out by the TTL; None once it has lapsed"""
+        rows = DatabaseManager.execute_query(
+            EXTEND_HOLD_SQL, {"token": hold_token, "ttl": HOLD_TTL_SECONDS}
+        )
+        if rows is None:
+            raise Exception("Failed to extend hold")
+        return rows[0]["expires_at"] if rows else None
+
+    @staticmethod
+    def release_hold(hold_token):
+        """Drop a hold; returns the number of slots released"""
+        released = DatabaseManager.execute_query(
+            RELEASE_HOLD_SQL, {"token": hold_token}, fetch_all=False
+        )
+        if released is None:
+            raise Exception("Failed to release hold")
+        return released
+
+    @staticmethod
+    def get_booked_masks(surfaces, start_date, end_date):
+        """Occupancy bitmaps for many surfaces and dates with one range query"""
+        query = """
+            SELECT surface, booking_date, slot_index FROM booking_slots
+            WHERE surface = ANY(%s)
+            AND booking_date BETWEEN %s AND %s
+            AND booking_id IS NOT NULL
+        """
+
+        rows = DatabaseManager.execute_query(query, (list(surfaces), start_date, end_date))
+        if rows is None:
+            raise Exception("Failed to fetch booked slots")
+
+        masks = {}
+        for row in rows:
+            key = (row["surface"], str(row["booking_date"]))
+            masks[key] = masks.get(key, 0) | (1 << row["slot_index"])
+        return masks
+
+    @staticmethod
+    def get_availability_masks(courts, dates):
+        """Cached occupancy bitmaps for every court x date, misses loaded in one query"""
+
+        def load(missing):
+            surfaces = {court: MULTI_PURPOSE_COURTS.get(court, court) for court, _ in missing}
+            masks = BookingService.get_booked_masks(
+                set(surfaces.values()),
+                min(date for _, date in missing),
+                max(date for _, date in missing),
+            )
+            return {
+                (court, date): masks.get((surfaces[court], date), 0)
+                for court, date in missing
+            }
+
+        return availability_cache.get_many(
+            [(court, date) for court in courts for date in dates], load
+        )
+
+    @staticmethod
+    def find_free_slots(
+        courts, start_date, days, duration, time_from=None, time_to=None,
+        preferred_time=None, limit=FIND_SLOTS_DEFAULT_LIMIT, hold_token=None,
+    ):
+        """Rank free runs of `duration` hours across courts and days.
+
+        Slots other customers hold for checkout count as taken; hold_token's
+        own hold does not.
+        """
+        slots_needed = int(round(float(duration) * 2))
+        if slots_needed < 1 or slots_needed > SLOTS_PER_DAY:
+            raise ValueError("Duration must be between 0.5 and 24 hours")
+        if not 1 <= days <= FIND_SLOTS_MAX_DAYS:
+            raise ValueError(f"Search window must be 1 to {FIND_SLOTS_MAX_DAYS} days")
+
+        allowed = window_mask(time_from, time_to)
+        preferred = SLOT_INDEX.get(normalize_slot_time(preferred_time)) if preferred_time else None
+
+        first_day = datetime.strptime(start_date, "%Y-%m-%d").date()
+        dates = [str(first_day + timedelta(days=offset)) for offset in range(days)]
+
+        # Shared courts map to one surface, so their claims come back together
+        surfaces = {court: MULTI_PURPOSE_COURTS.get(court, court) for court in courts}
+        masks = BookingService.get_booked_masks(set(surfaces.values()), dates[0], dates[-1])
+        held = BookingService.get_held_masks(
+            set(surfaces.values()), dates[0], dates[-1], hold_token
+        )
+
+        # Slots that have already begun cannot be booked; before 06:00 the
+        # running slot belongs to yesterday's booking date
+        today, running = grid_now(datetime.now())
+        started = (1 << (running + 1)) - 1
+
+        candidates = []
+        for day_index, date in enumerate(dates):
+            if first_day + timedelta(days=day_index) < today:
+                continue
+            day_allowed = allowed & ~started if date == str(today) else allowed
+            for court_index, court in enumerate(courts):
+                key = (surfaces[court], date)
+                booked = masks.get(key, 0) | held.get(key, 0)
+                for start in free_run_starts(booked, slots_needed, day_allowed):
+                    rank = (
+                        abs(start - preferred) if preferred is not None else 0,
+                        day_index,
+                        start,
+                        court_index,
+                    )
+                    candidates.append((rank, court, date, start))
+
+        candidates.sort()
+        results = []
+        for _, court, date, start in candidates[:limit]:
+            slots = SLOT_TIMES[start : start + slots_needed]
+            end = start + slots_needed
+            results.append(
+                {
+                    "court": court,
+                    "courtName": COURT_NAMES.get(court, court),
+                    "date": date,
+                    "startTime": slots[0],
+                    "endTime": SLOT_TIMES[end] if end < SLOTS_PER_DAY else SLOT_TIMES[0],
+                    "duration": slots_needed / 2,
+                    "slots": slots,
+                }
+            )
+        return results, len(candidates)
+
     @staticmethod
     def _generate_booking_id():
         """Generate unique booking ID"""
@@ -271,7 +585,7 @@ def init_database():
                 total_amount INTEGER NOT NULL,
                 status VARCHAR(20) DEFAULT 'pending_payment',
                 payment_verified BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 confirmed_at TIMESTAMP,
                 cancelled_at TIMESTAMP
             );
@@ -286,18 +600,111 @@ def init_database():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
             
+            -- Older tables allowed NULL created_at, which breaks the keyset
+            -- cursors: (created_at, id) < (...) never matches a NULL row.
+            -- Backfill from the booking's other timestamps, then enforce it.
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'bookings' AND column_name = 'created_at'
+                    AND is_nullable = 'YES'
+                ) THEN
+                    UPDATE bookings
+                    SET created_at = COALESCE(confirmed_at, cancelled_at, booking_date::timestamp)
+                    WHERE created_at IS NULL;
+                    ALTER TABLE bookings ALTER COLUMN created_at SET NOT NULL;
+                END IF;
+            END $$;
+
             CREATE INDEX IF NOT EXISTS idx_bookings_date_court 
             ON bookings(booking_date, court, status);
+
+            -- Keyset pagination of the admin listing, unfiltered and per filter
+            CREATE INDEX IF NOT EXISTS idx_bookings_created_id
+            ON bookings(created_at DESC, id DESC);
+
+            CREATE INDEX IF NOT EXISTS idx_bookings_status_created_id
+            ON bookings(status, created_at DESC, id DESC);
+
+            CREATE INDEX IF NOT EXISTS idx_bookings_sport_created_id
+            ON bookings(sport, created_at DESC, id DESC);
         """
 
         result = DatabaseManager.execute_query(create_tables_query, fetch_all=False)
-        if result is not None:
-            logger.info("Database initialized successfully")
-            return True
-        else:
+        if result is None:
             logger.error("Failed to initialize database")
             return False
 
+        # Slot claims enforcing the no-double-booking guarantee
+        if DatabaseManager.execute_query(SCHEMA_SQL, fetch_all=False) is None:
+            logger.error("Failed to create booking slot claims")
+            return False
+
+        # NOTIFY on every booking write keeps worker caches and streams coherent
+        if DatabaseManager.execute_query(CHANGE_FEED_SCHEMA_SQL, fetch_all=False) is None:
+            logger.error("Failed to create booking change notifications")
+            return False
+
+        # Outbox drained by notification_worker.py
+        if DatabaseManager.execute_query(NOTIFICATION_SCHEMA_SQL, fetch_all=False) is None:
+            logger.error("Failed to create notification queue")
+            return False
+
+        # Dashboard counters kept current by statement-level triggers
+        if DatabaseManager.execute_query(BOOKING_STATS_SCHEMA_SQL, fetch_all=False) is None:
+            logger.error("Failed to create booking stats")
+            return False
+
+        # Per court-day versions behind the ETags on slot and schedule responses
+        if DatabaseManager.execute_query(BOOKING_VERSIONS_SCHEMA_SQL, fetch_all=False) is None:
+            logger.error("Failed to create booking versions")
+            return False
+
+        if DatabaseManager.execute_query(BOOKING_SERIES_SCHEMA_SQL, fetch_all=False) is None:
+            logger.error("Failed to create booking series column")
+            return False
+
+        # Admin search: id prefix always, phone/name by trigram when available
+        if DatabaseManager.execute_query(BOOKING_SEARCH_SCHEMA_SQL, fetch_all=False) is None:
+            logger.error("Failed to create booking search indexes")
+            return False
+
+        indexes_before = DatabaseManager.execute_query(SEARCH_INDEX_COUNT_SQL, fetch_one=True)
+        trigram_available = DatabaseManager.execute_query(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'", fetch_one=True
+        )
+        if trigram_available:
+            DatabaseManager.execute_query(TRIGRAM_EXTENSION_SQL, fetch_all=False)
+        has_trigram = DatabaseManager.execute_query(HAS_TRIGRAM_SQL, fetch_one=True)
+        if has_trigram and has_trigram["has_trigram"]:
+            DatabaseManager.execute_query(TRIGRAM_INDEX_SQL, fetch_all=False)
+        else:
+            logger.warning("pg_trgm unavailable; phone/name search matches prefixes only")
+            DatabaseManager.execute_query(PREFIX_INDEX_SQL, fetch_all=False)
+        indexes_after = DatabaseManager.execute_query(SEARCH_INDEX_COUNT_SQL, fetch_one=True)
+        if indexes_before and indexes_after and indexes_after["index_count"] > indexes_before["index_count"]:
+            DatabaseManager.execute_query("ANALYZE bookings", fetch_all=False)
+
+        needs_stats = DatabaseManager.execute_query(NEEDS_REBUILD_SQL, fetch_one=True)
+        if needs_stats and needs_stats["needs_rebuild"]:
+            logger.info("Building booking stats from existing bookings")
+            DatabaseManager.execute_query(REBUILD_SQL, fetch_all=False)
+
+        for court, surface in MULTI_PURPOSE_COURTS.items():
+            DatabaseManager.execute_query(
+                SURFACE_UPSERT_SQL, (court, surface), fetch_all=False
+            )
+
+        unmigrated = DatabaseManager.execute_query(UNMIGRATED_CHECK_SQL, fetch_one=True)
+        if unmigrated and unmigrated["pending"]:
+            logger.warning(
+                "Some active bookings have no slot claims; run migrate_booking_slots.py"
+            )
+
+        logger.info("Database initialized successfully")
+        return True
+
     except Exception as e:
         logger.error(f"Database initialization error: {e}")
         return False
@@ -310,6 +717,12 @@ def index():
     return render_template("index.html")
 
 
+@app.route("/metrics")
+def prometheus_metrics():
+    """Request, query and pool metrics in Prometheus text format"""
+    return metrics_response()
+
+
 @app.route("/booking")
 def booking():
     """Booking page route"""
@@ -317,19 +730,34 @@ def booking():
 
 
 # API Routes
-@app.route("/api/booked-slots", methods=["POST"])
+@app.route("/api/booked-slots", methods=["GET", "POST"])
 def get_booked_slots():
     """Get booked time slots for a specific court and date"""
     try:
-        data = request.json
+        data = request.args if request.method == "GET" else request.json
         court = data.get("court")
         date = data.get("date")
 
         if not court or not date:
             return jsonify({"error": "Missing court or date"}), 400
 
-        booked_slots = BookingService.get_booked_slots(court, date)
-        return jsonify(booked_slots)
+        hold_token = data.get("holdToken") or None
+
+        # Version and masks come from one statement, so they always agree
+        version = BookingService.get_slots_version(court, date, hold_token)
+        if version is None:
+            return jsonify(BookingService.get_booked_slots(court, date))
+
+        # Holds change (and lapse) without a booking write, so they are part of
+        # the ETag and Last-Modified is not used here
+        held_mask = version["held_mask"]
+        etag = make_etag("slots", version["version"], court, date, held_mask, hold_token)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
+        booked_slots = mask_to_slots(version["booked_mask"] | held_mask)
+        return with_validators(jsonify(booked_slots), etag)
 
     except Exception as e:
         logger.error(f"API error - get_booked_slots: {e}")
@@ -352,7 +780,7 @@ def check_conflicts():
             )
 
         available, conflicts = BookingService.check_slot_availability(
-            court, date, selected_slots
+            court, date, selected_slots, data.get("holdToken")
         )
 
         return jsonify(
@@ -373,34 +801,115 @@ def check_conflicts():
         )
 
 
-@app.route("/api/create-booking", methods=["POST"])
-def create_booking():
-    """Create a new booking with conflict prevention"""
+@app.route("/api/availability", methods=["POST"])
+def get_availability():
+    """Occupancy for many courts x dates as one 48-bit hex mask per court-day"""
     try:
-        booking_data = request.json
-
-        # Final conflict check
-        court = booking_data.get("court")
-        date = booking_data.get("date")
-        selected_slots = booking_data.get("selectedSlots", [])
+        data = request.json or {}
+        courts = data.get("courts") or ([data["court"]] if data.get("court") else [])
+        dates = data.get("dates")
+        if not dates and data.get("startDate"):
+            # Check the window before building it, so a huge count costs nothing
+            days = data.get("days", 7)
+            if not isinstance(days, int) or not 1 <= days <= FIND_SLOTS_MAX_DAYS:
+                raise ValueError(f"days must be a whole number from 1 to {FIND_SLOTS_MAX_DAYS}")
+            first_day = datetime.strptime(data["startDate"], "%Y-%m-%d").date()
+            dates = [str(first_day + timedelta(days=offset)) for offset in range(days)]
+
+        if not courts or not dates:
+            return jsonify({"success": False, "message": "Missing courts or dates"}), 400
+        if len(dates) > FIND_SLOTS_MAX_DAYS or len(courts) > len(COURT_NAMES):
+            return jsonify({"success": False, "message": "Too many courts or dates"}), 400
+        for date in dates:
+            datetime.strptime(date, "%Y-%m-%d")
+
+        masks = BookingService.get_availability_masks(courts, dates)
+
+        availability, full_dates = {}, {}
+        for court in courts:
+            availability[court] = {}
+            full_dates[court] = []
+            for date in dates:
+                mask = masks[(court, date)]
+                # Bit i is grid slot i (06:00 first), most significant hex digit last slots
+                availability[court][date] = f"{mask:012x}"
+                if not free_run_starts(mask, MIN_BOOKING_SLOTS):
+                    full_dates[court].append(date)
 
-        available, conflicts = BookingService.check_slot_availability(
-            court, date, selected_slots
+        return jsonify(
+            {
+                "success": True,
+                "slots": SLOT_TIMES,
+                "availability": availability,
+                "fullDates": full_dates,
+            }
         )
 
-        if not available:
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        logger.error(f"API error - get_availability: {e}")
+        return jsonify({"success": False, "message": "Failed to load availability"}), 500
+
+
+@app.route("/api/find-slots", methods=["POST"])
+def find_slots():
+    """Find free slot runs across courts and days in one call"""
+    started = time.perf_counter()
+    try:
+        data = request.json or {}
+        courts = data.get("courts") or [
+            court["id"] for court in COURT_CONFIG.get(data.get("sport"), [])
+        ]
+        if not courts or not data.get("startDate"):
             return (
-                jsonify(
-                    {
-                        "success": False,
-                        "message": "One or more selected time slots are no longer available",
-                        "conflicts": conflicts,
-                    }
-                ),
-                409,
+                jsonify({"success": False, "message": "Missing sport/courts or startDate"}),
+                400,
             )
 
-        # Create booking
+        limit = max(1, min(int(data.get("limit", FIND_SLOTS_DEFAULT_LIMIT)), FIND_SLOTS_MAX_LIMIT))
+        results, total = BookingService.find_free_slots(
+            courts,
+            data["startDate"],
+            int(data.get("days", 7)),
+            data.get("duration", 1),
+            data.get("timeFrom"),
+            data.get("timeTo"),
+            data.get("preferredTime"),
+            limit,
+            data.get("holdToken") or None,
+        )
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > FIND_SLOTS_BUDGET_MS:
+            logger.warning(
+                f"find-slots took {elapsed_ms:.1f}ms (budget {FIND_SLOTS_BUDGET_MS}ms) "
+                f"for {len(courts)} courts x {data.get('days', 7)} days"
+            )
+
+        return jsonify(
+            {
+                "success": True,
+                "results": results,
+                "totalMatches": total,
+                "elapsedMs": round(elapsed_ms, 2),
+            }
+        )
+
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        logger.error(f"API error - find_slots: {e}")
+        return jsonify({"success": False, "message": "Failed to search slots"}), 500
+
+
+@app.route("/api/create-booking", methods=["POST"])
+def create_booking():
+    """Create a new booking with conflict prevention"""
+    try:
+        booking_data = request.json
+
+        # The insert claims its slots atomically; a clash raises SlotConflictError
         booking_id = BookingService.create_booking(booking_data)
 
         return jsonify(
@@ -411,6 +920,17 @@ def create_booking():
             }
         )
 
+    except SlotConflictError as e:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": "One or more selected time slots are no longer available",
+                    "conflicts": e.conflicts,
+                }
+            ),
+            409,
+        )
     except ValueError as e:
         return jsonify({"success": False, "message": str(e)}), 400
     except Exception as e:
@@ -418,6 +938,101 @@ def create_booking():
         return jsonify({"success": False, "message": "Failed to create booking"}), 500
 
 
+@app.route("/api/hold-slots", methods=["POST"])
+def hold_slots():
+    """Hold the selected slots while the customer checks out"""
+    try:
+        data = request.json or {}
+        court = data.get("court")
+        date = data.get("date")
+        slots = [
+            slot["time"] if isinstance(slot, dict) else slot
+            for slot in data.get("selectedSlots", [])
+        ]
+        if not court or not date:
+            return jsonify({"success": False, "message": "Missing court or date"}), 400
+
+        hold_token, expires_at = BookingService.hold_slots(
+            court, date, slots, data.get("holdToken")
+        )
+        return jsonify(
+            {
+                "success": True,
+                "holdToken": hold_token,
+                "expiresAt": expires_at.isoformat(),
+                "ttlSeconds": HOLD_TTL_SECONDS,
+            }
+        )
+
+    except SlotConflictError as e:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": "One or more selected time slots are no longer available",
+                    "conflicts": e.conflicts,
+                }
+            ),
+            409,
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        logger.error(f"API error - hold_slots: {e}")
+        return jsonify({"success": False, "message": "Failed to hold slots"}), 500
+
+
+@app.route("/api/extend-hold", methods=["POST"])
+def extend_hold():
+    """Keep a checkout hold alive; 410 once it has lapsed"""
+    try:
+        hold_token = (request.json or {}).get("holdToken")
+        if not hold_token:
+            return jsonify({"success": False, "message": "Missing holdToken"}), 400
+
+        expires_at = BookingService.extend_hold(hold_token)
+        if expires_at is None:
+            return jsonify({"success": False, "message": "Hold has expired"}), 410
+        return jsonify({"success": True, "expiresAt": expires_at.isoformat()})
+
+    except Exception as e:
+        logger.error(f"API error - extend_hold: {e}")
+        return jsonify({"success": False, "message": "Failed to extend hold"}), 500
+
+
+@app.route("/api/release-hold", methods=["POST"])
+def release_hold():
+    """Give held slots back, e.g. when the customer leaves checkout"""
+    try:
+        # sendBeacon posts text/plain, so don't insist on a JSON content type
+        hold_token = (request.get_json(force=True, silent=True) or {}).get("holdToken")
+        if not hold_token:
+            return jsonify({"success": False, "message": "Missing holdToken"}), 400
+
+        released = BookingService.release_hold(hold_token)
+        return jsonify({"success": True, "released": released})
+
+    except Exception as e:
+        logger.error(f"API error - release_hold: {e}")
+        return jsonify({"success": False, "message": "Failed to release hold"}), 500
+
+
+@app.route("/api/booking-events")
+def booking_events():
+    """Stream booking create/update/cancel events as Server-Sent Events"""
+    courts = [court for court in request.args.get("courts", "").split(",") if court]
+
+    response = Response(
+        event_bus.stream(
+            courts or None, request.args.get("start"), request.args.get("end")
+        ),
+        mimetype="text/event-stream",
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
 @app.route("/submit-contact", methods=["POST"])
 def submit_contact():
     """Handle contact form submissions"""
@@ -722,14 +1337,12 @@ def debug_raw_database_check():
                 id, sport, court, booking_date, start_time, end_time,
                 selected_slots, player_name, status, created_at
             FROM bookings 
-            WHERE selected_slots::text LIKE '%"time": "08:00"%' 
-            OR selected_slots::text LIKE '%"time": "8:00"%'
-            OR start_time = '08:00:00'
-            OR start_time = '8:00:00'
+            WHERE id IN (SELECT booking_id FROM booking_slots WHERE slot_start = %s)
+            OR start_time = %s
             ORDER BY created_at DESC
         """
 
-        bookings = DatabaseManager.execute_query(query)
+        bookings = DatabaseManager.execute_query(query, ("08:00", "08:00"))
 
         debug_info = {
             "query_used": query,
@@ -772,6 +1385,7 @@ def debug_raw_database_check():
 
 if __name__ == "__main__":
     if init_database():
+        start_change_feed()
         logger.info("Starting Flask application...")
         app.run(debug=True, host="0.0.0.0", port=5001)
     else:
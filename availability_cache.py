@@ -0,0 +1,130 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration (overridable through the environment)
+CACHE_TTL = float(os.environ.get("AVAILABILITY_CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = int(os.environ.get("AVAILABILITY_CACHE_MAX_ENTRIES", "2048"))
+
+
+class AvailabilityCache:
+    """Thread-safe TTL/LRU cache of booked-slot bitmaps keyed by (court, date)"""
+
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a load racing a write is not cached
+        self._generation = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "expirations": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    @staticmethod
+    def _key(court_id, date):
+        return (court_id, str(date))
+
+    def get_or_load(self, court_id, date, loader):
+        """Return the cached mask or call loader() and cache its result"""
+        key = self._key(court_id, date)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                mask, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return mask
+                del self._entries[key]
+                self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        mask = loader()
+
+        with self._lock:
+            if generation == self._generation:
+                self._store(key, mask)
+        return mask
+
+    def get_many(self, keys, loader):
+        """Return {(court, date): mask}, loading every miss with one loader(missing) call"""
+        now = time.monotonic()
+        found, missing = {}, []
+
+        with self._lock:
+            for court_id, date in keys:
+                key = self._key(court_id, date)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    mask, expires_at = entry
+                    if expires_at > now:
+                        self._entries.move_to_end(key)
+                        self._stats["hits"] += 1
+                        found[key] = mask
+                        continue
+                    del self._entries[key]
+                    self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                missing.append(key)
+            generation = self._generation
+
+        if not missing:
+            return found
+
+        loaded = loader(missing)
+        with self._lock:
+            for key in missing:
+                found[key] = loaded.get(key, 0)
+                if generation == self._generation:
+                    self._store(key, found[key])
+        return found
+
+    def _store(self, key, mask):
+        """Insert an entry and evict the least recently used; caller holds the lock"""
+        self._entries[key] = (mask, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, court_ids, date):
+        """Drop the entries for several courts on one date"""
+        with self._lock:
+            self._generation += 1
+            for court_id in court_ids:
+                if self._entries.pop(self._key(court_id, date), None) is not None:
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """Snapshot of cache counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["entries"] = len(self._entries)
+        snapshot["max_entries"] = self.max_entries
+        snapshot["ttl"] = self.ttl
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = snapshot["hits"] / lookups if lookups else 0.0
+        return snapshot
+
+
+# Shared by the public booking API and the admin panel
+availability_cache = AvailabilityCache()
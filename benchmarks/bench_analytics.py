@@ -0,0 +1,120 @@
+"""Benchmark the NumPy analytics reports on a synthetic year of bookings.
+
+Generates bookings for every court in COURT_CONFIG, checks the vectorized
+reports against a straightforward pure-Python version, and reports timings.
+No database is needed. Run from the repository root:
+
+    python -m benchmarks.bench_analytics --days 365 --fill 0.6
+"""
+
+import argparse
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from admin_routes import COURT_CONFIG, SPORT_PRICING
+from booking_analytics import ACTIVE_STATUSES, BookingColumns, build_report
+from slot_bitmap import SLOTS_PER_DAY
+
+STATUSES = ["confirmed"] * 7 + ["pending_payment"] + ["cancelled"] * 2
+PAYMENT_TYPES = ["advance", "full"]
+
+
+def synthetic_rows(courts, days, fill, seed):
+    """Non-overlapping bookings per court and day, roughly `fill` of the grid"""
+    rng = random.Random(seed)
+    rows = []
+    for sport, court in courts:
+        for day in range(days):
+            slot = 0
+            while slot < SLOTS_PER_DAY:
+                slot_count = rng.choice((2, 2, 3, 4))
+                if rng.random() < fill:
+                    rows.append(
+                        (
+                            court, sport, rng.choice(PAYMENT_TYPES), rng.choice(STATUSES),
+                            day, slot, slot_count,
+                            SPORT_PRICING[sport] * slot_count // 2,
+                        )
+                    )
+                slot += slot_count
+    return rows
+
+
+def python_baseline(rows, court_ids, days):
+    """The same occupancy/revenue/cancellation numbers with plain loops"""
+    occupied = defaultdict(set)
+    revenue = defaultdict(int)
+    cancelled = defaultdict(int)
+    totals = defaultdict(int)
+
+    for court, sport, payment, status, day, slot, count, amount in rows:
+        totals[sport] += 1
+        if status in ("cancelled", "declined"):
+            cancelled[sport] += 1
+        if status == "confirmed":
+            revenue[sport] += amount
+        if status in ACTIVE_STATUSES:
+            for s in range(slot, min(slot + count, SLOTS_PER_DAY)):
+                occupied[court].add((day, s))
+
+    occupancy = {
+        court: round(len(occupied[court]) / (days * SLOTS_PER_DAY), 4) for court in court_ids
+    }
+    return occupancy, dict(revenue), {s: cancelled[s] for s in totals}
+
+
+def best_of(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--fill", type=float, default=0.6)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    courts = [(sport, court["id"]) for sport, items in COURT_CONFIG.items() for court in items]
+    court_ids = [court for _, court in courts]
+    start = date(2025, 1, 1)
+    end = start + timedelta(days=args.days - 1)
+
+    rows = synthetic_rows(courts, args.days, args.fill, args.seed)
+    print(f"{len(rows)} bookings over {args.days} days on {len(courts)} courts\n")
+
+    load_time, columns = best_of(
+        lambda: BookingColumns(start, end, court_ids, rows), args.repeat
+    )
+    print(f"columnar load           {load_time * 1000:9.1f} ms")
+
+    for report in ("occupancy", "heatmap", "revenue", "cancellations", "all"):
+        elapsed, result = best_of(lambda: build_report(columns, report), args.repeat)
+        print(f"{report:<23} {elapsed * 1000:9.1f} ms")
+
+    baseline_time, (occupancy, revenue, cancelled) = best_of(
+        lambda: python_baseline(rows, court_ids, args.days), args.repeat
+    )
+    print(f"\npure-Python baseline    {baseline_time * 1000:9.1f} ms (occupancy, revenue, cancellations)")
+
+    # Cross-check the vectorized numbers against the baseline
+    assert result["occupancy"]["overall"] == occupancy, "occupancy mismatch"
+    assert {k: v for k, v in result["revenue"]["bySport"].items() if v} == {
+        k: v for k, v in revenue.items() if v
+    }, "revenue mismatch"
+    assert {
+        k: v["cancelled"] for k, v in result["cancellations"]["bySport"].items()
+    } == cancelled, "cancellation mismatch"
+    print("✅ vectorized reports match the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Confirming a pending_payment backlog: one request per booking vs one bulk statement.
+
+Seeds --count pending bookings (id prefix BENCHBULK, far-future dates) through
+the normal triggers, confirms them one by one with perform_booking_action,
+resets them, confirms them again with perform_bulk_action, then deletes them.
+Run from the repository root:
+
+    python -m benchmarks.bench_bulk_actions --count 200
+"""
+
+import argparse
+import json
+import time
+
+from admin_routes import AdminBookingService
+from db_config import DATABASE_CONFIG
+from db_pool import get_pool
+
+SEED_PREFIX = "BENCHBULK"
+
+SEED_SQL = """
+    INSERT INTO bookings (
+        id, sport, court, court_name, booking_date, start_time, end_time, duration,
+        selected_slots, player_name, player_phone, total_amount, status
+    )
+    SELECT
+        %(prefix)s || lpad(i::text, 6, '0'), 'padel', 'padel-2', 'Padel Court 2',
+        DATE '2032-01-01' + i, '20:00', '21:00', 1, %(slots)s::jsonb,
+        'Bench Player', '03000000000', 5500, 'pending_payment'
+    FROM generate_series(1, %(count)s) AS i
+"""
+
+
+def run_sql(query, params=None):
+    with get_pool(DATABASE_CONFIG).connection() as conn:
+        conn.cursor().execute(query, params)
+        conn.commit()
+
+
+def seed(count):
+    run_sql("DELETE FROM bookings WHERE id LIKE %s", (SEED_PREFIX + "%",))
+    slots = json.dumps([{"time": "20:00"}, {"time": "20:30"}])
+    run_sql(SEED_SQL, {"prefix": SEED_PREFIX, "slots": slots, "count": count})
+    return [f"{SEED_PREFIX}{i:06d}" for i in range(1, count + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200)
+    args = parser.parse_args()
+
+    booking_ids = seed(args.count)
+    try:
+        started = time.perf_counter()
+        for booking_id in booking_ids:
+            AdminBookingService.perform_booking_action(booking_id, "confirm")
+        single_ms = (time.perf_counter() - started) * 1000
+
+        run_sql(
+            "UPDATE bookings SET status = 'pending_payment' WHERE id LIKE %s",
+            (SEED_PREFIX + "%",),
+        )
+
+        started = time.perf_counter()
+        results, _ = AdminBookingService.perform_bulk_action("confirm", booking_ids)
+        bulk_ms = (time.perf_counter() - started) * 1000
+        done = sum(1 for result in results if result["outcome"] == "done")
+    finally:
+        run_sql("DELETE FROM bookings WHERE id LIKE %s", (SEED_PREFIX + "%",))
+
+    print(f"{args.count} pending bookings")
+    print(f"one at a time: {single_ms:8.1f} ms  ({single_ms / args.count:.2f} ms each)")
+    print(f"bulk:          {bulk_ms:8.1f} ms  ({done} confirmed)")
+
+
+if __name__ == "__main__":
+    main()
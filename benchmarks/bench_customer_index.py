@@ -0,0 +1,119 @@
+"""Customer typeahead: index size, build time and lookup latency.
+
+Builds a CustomerDirectory from synthetic customers and times searches for
+phone and name fragments. With --db the index is also rebuilt from the
+bookings table (see bench_search.py for seeding a large one). Run from the
+repository root:
+
+    python -m benchmarks.bench_customer_index --customers 100000
+    python -m benchmarks.bench_customer_index --db
+"""
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from customer_index import DEFAULT_LIMIT, Customer, CustomerDirectory, CustomerIndex
+
+FIRST_NAMES = ["Ali", "Ahmed", "Usman", "Bilal", "Hamza", "Zain", "Omar", "Saad",
+               "Fahad", "Hassan", "Ayesha", "Fatima", "Sana", "Hira", "Maryam"]
+LAST_NAMES = ["Khan", "Malik", "Butt", "Sheikh", "Qureshi", "Raza", "Chaudhry",
+              "Iqbal", "Hussain", "Siddiqui", "Mirza", "Abbasi", "Javed"]
+
+
+def synthetic_customers(count, seed):
+    rng = random.Random(seed)
+    customers = []
+    for i in range(count):
+        digits = f"03{rng.randrange(10**9):09d}"
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        customers.append(
+            Customer(
+                digits,
+                f"{digits[:4]}-{digits[4:]}",
+                name,
+                None,
+                f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                rng.randint(1, 40),
+                rng.randint(0, 40),
+            )
+        )
+    return customers
+
+
+def build(customers):
+    directory = CustomerDirectory()
+    for customer in customers:
+        directory.add(customer)
+    directory.sort_names()
+    return directory
+
+
+def time_queries(search, queries, runs):
+    timings = []
+    for _ in range(runs):
+        for query in queries:
+            started = time.perf_counter()
+            search(query)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], timings[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db", action="store_true", help="Also time a rebuild from bookings")
+    args = parser.parse_args()
+
+    customers = synthetic_customers(args.customers, args.seed)
+    rng = random.Random(args.seed + 1)
+    sample = rng.sample(customers, 50)
+
+    started = time.perf_counter()
+    directory = build(customers)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # Measured on a second build; tracing slows the first one down
+    tracemalloc.start()
+    traced = build(synthetic_customers(args.customers, args.seed))
+    size_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    del traced
+
+    print(f"{len(directory):,} customers: built in {build_ms:.0f} ms, {size_mb:.1f} MB including customers\n")
+
+    cases = [
+        ("phone suffix", [c.digits[-4:] for c in sample]),
+        ("phone middle", [c.digits[4:9] for c in sample]),
+        ("phone full", [c.phone for c in sample]),
+        ("name common", ["ali", "khan", "hira"]),
+        ("name fragment", [c.name[2:7] for c in sample]),
+        ("full name", [c.name for c in sample]),
+    ]
+    print(f"{'case':<14} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for label, queries in cases:
+        p50, p95, worst = time_queries(
+            lambda q: directory.search(q, DEFAULT_LIMIT), queries, args.runs
+        )
+        print(f"{label:<14} {p50:>8.3f} {p95:>8.3f} {worst:>8.3f}")
+
+    if args.db:
+        from db_config import DATABASE_CONFIG
+
+        index = CustomerIndex()
+        index.configure(DATABASE_CONFIG)
+        if index.rebuild():
+            stats = index.stats()
+            print(
+                f"\nRebuild from bookings: {stats['customers']:,} customers "
+                f"in {stats['last_rebuild_ms']:.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
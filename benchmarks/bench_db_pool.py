@@ -0,0 +1,106 @@
+"""Compare per-query psycopg2.connect against the shared connection pool.
+
+Each simulated request runs the two statements /api/booked-slots issues for a
+multi-purpose court. Run from the repository root:
+
+    python -m benchmarks.bench_db_pool --requests 500 --threads 8
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from db_config import DATABASE_CONFIG
+from db_pool import ConnectionPool
+
+REQUEST_QUERIES = [
+    (
+        "SELECT selected_slots FROM bookings WHERE status IN ('confirmed', 'pending_payment') "
+        "AND booking_date = %s AND court = %s",
+        ("2025-01-01", "cricket-2"),
+    ),
+    (
+        "SELECT selected_slots FROM bookings WHERE status IN ('confirmed', 'pending_payment') "
+        "AND booking_date = %s AND court IN (%s)",
+        ("2025-01-01", "futsal-1"),
+    ),
+]
+
+
+def run_query(conn, query, params):
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor.execute(query, params)
+    cursor.fetchall()
+    conn.commit()
+
+
+def legacy_request(counter):
+    """One request the old way: a fresh connection per statement"""
+    for query, params in REQUEST_QUERIES:
+        conn = psycopg2.connect(**DATABASE_CONFIG)
+        counter.append(1)
+        try:
+            run_query(conn, query, params)
+        finally:
+            conn.close()
+
+
+def pooled_request(pool):
+    """One request through the shared pool"""
+    for query, params in REQUEST_QUERIES:
+        with pool.connection() as conn:
+            run_query(conn, query, params)
+
+
+def timed(fn, requests, threads):
+    latencies = []
+
+    def one(_):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one, range(requests)))
+    return time.perf_counter() - started, latencies
+
+
+def report(label, elapsed, latencies, connections, requests):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label}:")
+    print(f"   total time:          {elapsed:.2f}s ({requests / elapsed:.0f} req/s)")
+    print(f"   latency p50 / p95:   {statistics.median(latencies):.2f} / {p95:.2f} ms")
+    print(f"   connections opened:  {connections} ({connections / requests:.3f} per request)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"Benchmarking {args.requests} requests on {args.threads} threads...\n")
+
+    opened = []
+    elapsed, latencies = timed(lambda: legacy_request(opened), args.requests, args.threads)
+    report("Per-query connect", elapsed, latencies, len(opened), args.requests)
+
+    pool = ConnectionPool(DATABASE_CONFIG, max_size=args.threads)
+    elapsed, latencies = timed(lambda: pooled_request(pool), args.requests, args.threads)
+    stats = pool.stats()
+    report("Shared pool", elapsed, latencies, stats["connections_opened"], args.requests)
+    print(
+        f"   pool waits:          {stats['waits']} "
+        f"(avg {stats['wait_time_avg'] * 1000:.2f} ms, max {stats['wait_time_max'] * 1000:.2f} ms)"
+    )
+    pool.closeall()
+
+
+if __name__ == "__main__":
+    main()
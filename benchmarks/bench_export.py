@@ -0,0 +1,164 @@
+"""Measure the streaming booking export at large table sizes.
+
+Seeds synthetic cancelled bookings (id prefix BENCHEXP, triggers bypassed so no
+slot claims or notifications are produced), then drains the export generator
+and reports time to first chunk, throughput and peak Python memory. Run from
+the repository root:
+
+    python -m benchmarks.bench_export --rows 5000000 --format csv
+    python -m benchmarks.bench_export --rows 100 --compare-fetchall
+
+Pass --cleanup to delete the seeded rows afterwards.
+"""
+
+import argparse
+import resource
+import time
+import tracemalloc
+
+import psycopg2
+
+from admin_routes import AdminExportService
+from db_config import DATABASE_CONFIG
+
+SEED_PREFIX = "BENCHEXP"
+
+SEED_SQL = """
+    INSERT INTO bookings (
+        id, sport, court, court_name, booking_date, start_time, end_time,
+        duration, selected_slots, player_name, player_phone, player_email,
+        total_amount, status, created_at
+    )
+    SELECT
+        %(prefix)s || lpad(g::text, 8, '0'),
+        'padel', 'padel-1', 'Court 1: Teracotta Court',
+        DATE '2020-01-01' + (g / 40),
+        TIME '06:00' + make_interval(mins => 30 * (g %% 36)),
+        TIME '07:00' + make_interval(mins => 30 * (g %% 36)),
+        1.0, '[]'::jsonb,
+        'Bench Player ' || g, '0300' || lpad(g::text, 7, '0'), NULL,
+        5500, 'cancelled',
+        TIMESTAMP '2020-01-01' + make_interval(secs => g)
+    FROM generate_series(%(start)s, %(stop)s) AS g
+"""
+
+
+def seed(rows):
+    conn = psycopg2.connect(**DATABASE_CONFIG)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM bookings WHERE id LIKE %s", (SEED_PREFIX + "%",)
+        )
+        existing = cursor.fetchone()[0]
+        if existing >= rows:
+            print(f"{existing} seeded rows already present")
+            return
+
+        # Bypass the slot-claim and NOTIFY triggers for synthetic history
+        cursor.execute("SET session_replication_role = replica")
+        batch = 500_000
+        for start in range(existing, rows, batch):
+            stop = min(start + batch, rows) - 1
+            cursor.execute(SEED_SQL, {"prefix": SEED_PREFIX, "start": start, "stop": stop})
+            conn.commit()
+            print(f"  seeded {stop + 1}/{rows}")
+        cursor.execute("ANALYZE bookings")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def cleanup():
+    conn = psycopg2.connect(**DATABASE_CONFIG)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SET session_replication_role = replica")
+        cursor.execute("DELETE FROM bookings WHERE id LIKE %s", (SEED_PREFIX + "%",))
+        conn.commit()
+        print(f"Deleted {cursor.rowcount} seeded rows")
+    finally:
+        conn.close()
+
+
+def measure_stream(export_format, batch_size):
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_chunk = None
+    total_bytes = chunks = 0
+
+    for chunk in AdminExportService.stream(export_format, batch_size=batch_size):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        chunks += 1
+        total_bytes += len(chunk.encode())
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "elapsed": elapsed,
+        "first_chunk": first_chunk or elapsed,
+        "bytes": total_bytes,
+        "chunks": chunks,
+        "peak": peak,
+    }
+
+
+def measure_fetchall():
+    """The naive approach: load every row, then serialize"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    conn = psycopg2.connect(**DATABASE_CONFIG)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT {', '.join(AdminExportService.COLUMNS)} FROM bookings "
+            "ORDER BY created_at DESC, id DESC"
+        )
+        rows = cursor.fetchall()
+        body = AdminExportService._csv_chunk(rows)
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"elapsed": elapsed, "rows": len(rows), "bytes": len(body), "peak": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--format", choices=sorted(AdminExportService.FORMATS), default="csv")
+    parser.add_argument("--batch-size", type=int, default=AdminExportService.BATCH_SIZE)
+    parser.add_argument("--compare-fetchall", action="store_true")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    print(f"Seeding up to {args.rows} synthetic bookings...")
+    seed(args.rows)
+
+    result = measure_stream(args.format, args.batch_size)
+    mb = 1024 * 1024
+    print(f"\nstreaming {args.format} (batch {args.batch_size}):")
+    print(f"  first chunk   {result['first_chunk'] * 1000:10.1f} ms")
+    print(f"  total         {result['elapsed']:10.2f} s")
+    print(f"  output        {result['bytes'] / mb:10.1f} MB in {result['chunks']} chunks")
+    print(f"  throughput    {result['bytes'] / mb / result['elapsed']:10.1f} MB/s")
+    print(f"  peak heap     {result['peak'] / mb:10.1f} MB")
+
+    if args.compare_fetchall:
+        naive = measure_fetchall()
+        print("\nfetchall + csv:")
+        print(f"  total         {naive['elapsed']:10.2f} s ({naive['rows']} rows)")
+        print(f"  peak heap     {naive['peak'] / mb:10.1f} MB")
+
+    # ru_maxrss is KB on Linux
+    print(f"\nprocess max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:8.1f} MB")
+
+    if args.cleanup:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Measure /api/find-slots latency for a 14-day window across all courts.
+
+Seeds random confirmed bookings (id prefix BENCHFS) into a future window so the
+search has realistic gaps, then times BookingService.find_free_slots against
+FIND_SLOTS_BUDGET_MS. Run from the repository root:
+
+    python -m benchmarks.bench_find_slots --days 14 --fill 0.5 --runs 200
+    python -m benchmarks.bench_find_slots --cleanup
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from psycopg2.extras import execute_values
+
+from app import (
+    COURT_CONFIG,
+    DATABASE_CONFIG,
+    FIND_SLOTS_BUDGET_MS,
+    BookingService,
+)
+from db_pool import get_pool
+from slot_bitmap import SLOT_TIMES, SLOTS_PER_DAY
+
+SEED_PREFIX = "BENCHFS"
+
+
+def seed(start, days, fill, rng):
+    """Non-overlapping bookings per court; shared courts may collide and are skipped"""
+    rows = []
+    for sport, courts in COURT_CONFIG.items():
+        for court in courts:
+            for offset in range(days):
+                booking_date = start + timedelta(days=offset)
+                slot = 0
+                while slot < SLOTS_PER_DAY - 4:
+                    count = rng.choice((2, 2, 3, 4))
+                    if rng.random() < fill:
+                        slots = [{"time": t, "index": i} for i, t in enumerate(SLOT_TIMES[slot : slot + count])]
+                        rows.append(
+                            (
+                                f"{SEED_PREFIX}{len(rows):08d}", sport, court["id"], court["name"],
+                                booking_date, SLOT_TIMES[slot], SLOT_TIMES[slot + count],
+                                count / 2, json.dumps(slots), "Bench Player", "03000000000",
+                                1000, "confirmed",
+                            )
+                        )
+                    slot += count
+
+    inserted = 0
+    with get_pool(DATABASE_CONFIG).connection() as conn:
+        cursor = conn.cursor()
+        for row in rows:
+            # One statement per booking so a shared-surface clash only drops that row
+            cursor.execute("SAVEPOINT seed")
+            try:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO bookings (
+                        id, sport, court, court_name, booking_date, start_time, end_time,
+                        duration, selected_slots, player_name, player_phone,
+                        total_amount, status
+                    ) VALUES %s
+                    """,
+                    [row],
+                )
+                inserted += 1
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT seed")
+        conn.commit()
+    return inserted
+
+
+def cleanup():
+    with get_pool(DATABASE_CONFIG).connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM bookings WHERE id LIKE %s", (SEED_PREFIX + "%",))
+        conn.commit()
+        print(f"Deleted {cursor.rowcount} seeded bookings")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", default="2035-01-01")
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--fill", type=float, default=0.5)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+
+    rng = random.Random(args.seed)
+    start = date.fromisoformat(args.start)
+    print(f"Seeded {seed(start, args.days, args.fill, rng)} bookings")
+
+    courts = [court["id"] for courts in COURT_CONFIG.values() for court in courts]
+    scenarios = [
+        ("any time, 1h", {"duration": 1}),
+        ("evenings, 2h", {"duration": 2, "time_from": "17:00", "time_to": "23:00"}),
+        ("near 20:00, 1.5h", {"duration": 1.5, "preferred_time": "20:00"}),
+    ]
+
+    for label, options in scenarios:
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            results, total = BookingService.find_free_slots(
+                courts, args.start, args.days, **options
+            )
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        verdict = "within" if p95 <= FIND_SLOTS_BUDGET_MS else "OVER"
+        print(
+            f"{label:<18} p50 {statistics.median(timings):6.2f} ms  p95 {p95:6.2f} ms  "
+            f"max {timings[-1]:6.2f} ms  ({total} runs found, p95 {verdict} "
+            f"{FIND_SLOTS_BUDGET_MS:.0f} ms budget)"
+        )
+
+    print(f"\n{len(courts)} courts x {args.days} days; run with --cleanup to remove seeded rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Schedule latency with per-slot logging on, sampled and off.
+
+"every event" reproduces the previous behaviour (all schedule-path lines
+emitted); "sampled" is DEBUG with LOG_SAMPLE_RATE; "debug off" is the INFO
+default. Log output goes to a counting sink so formatting and handler costs
+are included. Without --db the in-memory grid build is timed on synthetic
+bookings; with --db the real endpoint is called through the Flask test client.
+Run from the repository root:
+
+    python -m benchmarks.bench_logging --days 7 --fill 0.6
+    python -m benchmarks.bench_logging --db --start 2030-01-04 --days 7
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import date, timedelta
+
+import structured_logging
+from admin_routes import COURT_CONFIG, AdminScheduleService
+from benchmarks.bench_schedule_payload import synthetic_bookings
+
+MODES = [
+    ("every event", "DEBUG", 1.0),
+    ("sampled", "DEBUG", None),
+    ("debug off", "INFO", None),
+]
+
+
+class CountingSink:
+    """File-like sink that only counts the lines written to it"""
+
+    def __init__(self):
+        self.lines = 0
+
+    def write(self, text):
+        self.lines += text.count("\n")
+
+    def flush(self):
+        pass
+
+
+def grid_request(court_ids, dates, bookings):
+    def run():
+        grid = AdminScheduleService._build_schedule_grid(court_ids, dates, bookings)
+        return json.dumps({"success": True, "schedule": grid}, default=str)
+
+    return run
+
+
+def endpoint_request(start, end):
+    from app import app
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["admin_logged_in"] = True
+    url = f"/admin/api/schedule-data?startDate={start}&endDate={end}"
+
+    # No If-None-Match, so every call builds the full response
+    return lambda: client.get(url).data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--fill", type=float, default=0.6)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db", action="store_true", help="Time the real endpoint")
+    parser.add_argument("--start", default="2030-01-04", help="First day for --db")
+    args = parser.parse_args()
+
+    if args.db:
+        start = date.fromisoformat(args.start)
+        request = endpoint_request(start, start + timedelta(days=args.days - 1))
+        print(f"/admin/api/schedule-data for {args.days} days from {start}\n")
+    else:
+        courts = [(sport, c["id"]) for sport, items in COURT_CONFIG.items() for c in items]
+        dates = [
+            (date(2025, 1, 6) + timedelta(days=d)).strftime("%Y-%m-%d")
+            for d in range(args.days)
+        ]
+        bookings = synthetic_bookings(courts, dates, args.fill, args.seed)
+        request = grid_request([c for _, c in courts], dates, bookings)
+        print(f"{len(bookings)} synthetic bookings, {args.days} days, {len(courts)} courts\n")
+
+    print(f"{'mode':<12} {'p50 ms':>8} {'p95 ms':>8} {'lines/request':>14}")
+    for label, level, rate in MODES:
+        sink = CountingSink()
+        structured_logging.configure_logging(
+            level=level, module_levels="", rate=rate, stream=sink
+        )
+        request()  # warm up
+
+        sink.lines = 0
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            request()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(
+            f"{label:<12} {statistics.median(timings):>8.2f} {p95:>8.2f} "
+            f"{sink.lines / args.runs:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
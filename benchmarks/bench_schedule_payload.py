@@ -0,0 +1,150 @@
+"""Compare the dict and compact /admin/api/schedule-data payloads.
+
+Builds a synthetic week for every court, checks that the compact format
+inflates to the same grid admin_schedule.js renders today, and reports payload
+size (raw and gzipped) and build + serialization time. No database is needed.
+Run from the repository root:
+
+    python -m benchmarks.bench_schedule_payload --days 7 --fill 0.6
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from admin_routes import COURT_CONFIG, MULTI_PURPOSE_COURTS, SPORT_PRICING, AdminScheduleService
+from slot_bitmap import SLOT_TIMES, SLOTS_PER_DAY
+
+STATUSES = ["confirmed"] * 3 + ["pending_payment"]
+
+
+def synthetic_bookings(courts, dates, fill, seed):
+    """Non-overlapping bookings per court and day shaped like range query rows"""
+    rng = random.Random(seed)
+    bookings = []
+    for sport, court in courts:
+        for booking_date in dates:
+            slot = 0
+            while slot < SLOTS_PER_DAY:
+                count = rng.choice((2, 2, 3, 4, 6))
+                if rng.random() < fill:
+                    times = SLOT_TIMES[slot : slot + count]
+                    bookings.append(
+                        {
+                            "id": f"NB{len(bookings):012d}",
+                            "sport": sport,
+                            "court": court,
+                            "booking_date": booking_date,
+                            "selected_slots": [{"time": t, "index": i} for i, t in enumerate(times)],
+                            "player_name": f"Player {rng.randrange(10_000)}",
+                            "player_phone": f"0300{rng.randrange(10**7):07d}",
+                            "total_amount": SPORT_PRICING[sport] * len(times) // 2,
+                            "duration": len(times) / 2,
+                            "status": rng.choice(STATUSES),
+                            "special_requests": rng.choice(["", "Bring extra balls", ""]),
+                        }
+                    )
+                slot += count
+    return bookings
+
+
+def inflate(compact):
+    """Python port of AdminScheduleManager.inflateCompactSchedule"""
+    bookings = compact["bookings"]
+    surfaces = compact["multiPurposeCourts"]
+    schedule = {}
+    for date_str in compact["dates"]:
+        schedule[date_str] = {}
+        for court_id in compact["courts"]:
+            court_slots = schedule[date_str][court_id] = {}
+            row = compact["cells"].get(date_str, {}).get(court_id)
+            for slot_index, index in enumerate(row or []):
+                if index < 0:
+                    continue
+                booking_court = bookings["court"][index]
+                is_conflict = (
+                    booking_court != court_id
+                    and court_id in surfaces
+                    and surfaces[court_id] == surfaces.get(booking_court)
+                )
+                court_slots[compact["slots"][slot_index]] = {
+                    "status": "booked-conflict" if is_conflict else bookings["status"][index],
+                    "title": bookings["playerName"][index],
+                    "subtitle": f"PKR {bookings['amount'][index]:,}"
+                    + (" - Multi Court" if is_conflict else ""),
+                    "bookingId": bookings["id"][index],
+                    "playerName": bookings["playerName"][index],
+                    "playerPhone": bookings["playerPhone"][index],
+                    "amount": bookings["amount"][index],
+                    "duration": bookings["duration"][index],
+                    "originalCourt": booking_court if is_conflict else court_id,
+                    "comments": bookings["comments"][index],
+                }
+    return schedule
+
+
+def best_of(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--fill", type=float, default=0.6)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    courts = [(sport, court["id"]) for sport, items in COURT_CONFIG.items() for court in items]
+    court_ids = [court for _, court in courts]
+    start = date(2025, 1, 6)
+    dates = [(start + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(args.days)]
+    # Only one court of each shared surface gets bookings, as in production
+    booked_courts = [
+        (sport, court)
+        for sport, court in courts
+        if court not in MULTI_PURPOSE_COURTS or court == min(MULTI_PURPOSE_COURTS)
+    ]
+    bookings = synthetic_bookings(booked_courts, dates, args.fill, args.seed)
+    print(f"{len(bookings)} bookings over {args.days} days on {len(court_ids)} courts\n")
+
+    def dict_payload():
+        grid = AdminScheduleService._build_schedule_grid(court_ids, dates, bookings)
+        return grid, json.dumps({"success": True, "schedule": grid}, default=str)
+
+    def compact_payload():
+        compact = AdminScheduleService._build_compact_schedule(court_ids, dates, bookings)
+        return compact, json.dumps({"success": True, "schedule": compact}, default=str)
+
+    dict_time, (grid, dict_body) = best_of(dict_payload, args.repeat)
+    compact_time, (compact, compact_body) = best_of(compact_payload, args.repeat)
+
+    assert inflate(compact) == grid, "compact payload does not inflate to the dict grid"
+    print("✅ compact payload inflates to the same grid\n")
+
+    print(f"{'format':<10} {'bytes':>11} {'gzip bytes':>11} {'build+dump ms':>14}")
+    for label, body, elapsed in (
+        ("dict", dict_body, dict_time),
+        ("compact", compact_body, compact_time),
+    ):
+        print(
+            f"{label:<10} {len(body):>11,} {len(gzip.compress(body.encode())):>11,} "
+            f"{elapsed * 1000:>14.1f}"
+        )
+    print(
+        f"\ncompact is {len(dict_body) / len(compact_body):.1f}x smaller and "
+        f"{dict_time / compact_time:.1f}x faster to build"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Compare the single range query schedule engine against the per-court loop.
+
+Checks that both produce identical output, then reports query count and wall
+time. Run from the repository root against a populated database:
+
+    python -m benchmarks.bench_schedule_range --start 2025-01-06 --days 7
+"""
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+
+from admin_routes import AdminDatabaseManager, AdminScheduleService
+from booking_slots import MULTI_PURPOSE_COURTS
+
+ACTIVE_STATUSES = "status IN ('confirmed', 'pending_payment')"
+
+
+class QueryCounter:
+    """Wrap AdminDatabaseManager.execute_query to count round trips"""
+
+    def __init__(self):
+        self.count = 0
+        self._original = AdminDatabaseManager.execute_query
+
+    def __enter__(self):
+        def counted(*args, **kwargs):
+            self.count += 1
+            return self._original(*args, **kwargs)
+
+        AdminDatabaseManager.execute_query = staticmethod(counted)
+        return self
+
+    def __exit__(self, *exc):
+        AdminDatabaseManager.execute_query = staticmethod(self._original)
+
+
+def court_bookings(court_id, date):
+    """The old per-court lookup: direct bookings, then shared-surface ones"""
+    if court_id == "pickleball-1":
+        direct_query = f"""
+            SELECT * FROM bookings
+            WHERE {ACTIVE_STATUSES} AND booking_date = %s
+            AND (court = %s OR sport = 'pickleball')
+            ORDER BY start_time
+        """
+    else:
+        direct_query = f"""
+            SELECT * FROM bookings
+            WHERE {ACTIVE_STATUSES} AND booking_date = %s AND court = %s
+            ORDER BY start_time
+        """
+    bookings = AdminDatabaseManager.execute_query(direct_query, (date, court_id)) or []
+
+    siblings = [
+        court
+        for court, surface in MULTI_PURPOSE_COURTS.items()
+        if surface == MULTI_PURPOSE_COURTS.get(court_id) and court != court_id
+    ]
+    if siblings:
+        bookings += AdminDatabaseManager.execute_query(
+            f"""
+            SELECT
+                id, sport, court, court_name, booking_date, start_time, end_time,
+                duration, selected_slots, player_name, player_phone, player_email,
+                total_amount, status, special_requests, created_at
+            FROM bookings
+            WHERE {ACTIVE_STATUSES} AND booking_date = %s AND court = ANY(%s)
+            ORDER BY start_time
+            """,
+            (date, siblings),
+        ) or []
+
+    result = []
+    for booking in bookings:
+        booking = dict(booking)
+        slots = booking.get("selected_slots") or []
+        if isinstance(slots, str):
+            try:
+                slots = json.loads(slots)
+            except json.JSONDecodeError:
+                slots = []
+        booking["selected_slots"] = slots
+        result.append(booking)
+    return result
+
+
+def schedule_per_court(start_date, end_date, sport_filter=None):
+    """Reference schedule built with one or two queries per court and day"""
+    schedule = {}
+    courts = AdminScheduleService._get_schedule_courts(sport_filter)
+
+    for date_str in AdminScheduleService._get_date_range(start_date, end_date):
+        schedule[date_str] = {}
+        for court in courts:
+            court_id = court["id"]
+            court_slots = schedule[date_str][court_id] = {}
+            for booking in court_bookings(court_id, date_str):
+                AdminScheduleService._add_booking_slots(
+                    court_slots, booking, court_id, date_str
+                )
+
+    return schedule
+
+
+def measure(fn, start, end, sport, repeat):
+    timings = []
+    for _ in range(repeat):
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            result = fn(start, end, sport)
+            timings.append((time.perf_counter() - started) * 1000)
+    return result, counter.count, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", default=datetime.now().strftime("%Y-%m-%d"))
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--sport", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Keep per-slot logging out of the timings
+    logging.disable(logging.INFO)
+
+    end = (
+        datetime.strptime(args.start, "%Y-%m-%d") + timedelta(days=args.days - 1)
+    ).strftime("%Y-%m-%d")
+    print(f"Schedule {args.start} to {end}, sport: {args.sport or 'all'}\n")
+
+    legacy, legacy_queries, legacy_ms = measure(
+        schedule_per_court, args.start, end, args.sport, args.repeat
+    )
+    ranged, ranged_queries, ranged_ms = measure(
+        AdminScheduleService.get_schedule_data, args.start, end, args.sport, args.repeat
+    )
+
+    print(f"Per-court loop:  {legacy_queries:4d} queries, {legacy_ms:8.2f} ms")
+    print(f"Range engine:    {ranged_queries:4d} queries, {ranged_ms:8.2f} ms")
+    print(f"Speedup:         {legacy_ms / ranged_ms:.1f}x")
+    print(f"Identical output: {'✅ yes' if legacy == ranged else '❌ NO'}")
+
+
+if __name__ == "__main__":
+    main()
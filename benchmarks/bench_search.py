@@ -0,0 +1,166 @@
+"""Admin booking search latency on a large bookings table.
+
+Seeds synthetic bookings (id prefix BENCHSR) server-side with triggers
+bypassed (session_replication_role = replica, so a superuser on a bench
+database), then times AdminBookingService.search_bookings for each method
+against the previous unindexed, unpaginated queries. Run from the
+repository root:
+
+    python -m benchmarks.bench_search --rows 1000000
+    python -m benchmarks.bench_search --cleanup
+"""
+
+import argparse
+import statistics
+import time
+
+from admin_routes import AdminBookingService, AdminDatabaseManager
+from app import init_database
+from db_config import DATABASE_CONFIG
+from db_pool import get_pool
+
+SEED_PREFIX = "BENCHSR"
+
+FIRST_NAMES = ["Ali", "Ahmed", "Usman", "Bilal", "Hamza", "Zain", "Omar", "Saad",
+               "Fahad", "Hassan", "Ayesha", "Fatima", "Sana", "Hira", "Maryam"]
+LAST_NAMES = ["Khan", "Malik", "Butt", "Sheikh", "Qureshi", "Raza", "Chaudhry",
+              "Iqbal", "Hussain", "Siddiqui", "Mirza", "Abbasi", "Javed"]
+
+SEED_SQL = """
+    INSERT INTO bookings (
+        id, sport, court, court_name, booking_date, start_time, end_time, duration,
+        selected_slots, player_name, player_phone, total_amount, status, created_at
+    )
+    SELECT
+        %(prefix)s || lpad(i::text, 10, '0'),
+        'futsal', 'futsal-1', 'Futsal Court', current_date + mod(i, 365),
+        '18:00', '19:00', 1, '[]'::jsonb,
+        (%(first)s::text[])[1 + mod(i, %(first_count)s)] || ' '
+            || (%(last)s::text[])[1 + mod(i / %(first_count)s, %(last_count)s)],
+        -- Mixed formatting, as customers type it
+        CASE mod(i, 3)
+            WHEN 0 THEN '03' || lpad(mod(i::bigint * 7919, 1000000000)::text, 9, '0')
+            WHEN 1 THEN '+92 3' || lpad(mod(i::bigint * 7919, 1000000000)::text, 9, '0')
+            ELSE '03' || substr(lpad(mod(i::bigint * 7919, 1000000000)::text, 9, '0'), 1, 2)
+                || '-' || substr(lpad(mod(i::bigint * 7919, 1000000000)::text, 9, '0'), 3)
+        END,
+        2500, 'confirmed', now() - make_interval(mins => i)
+    FROM generate_series(%(start)s, %(end)s) AS i
+"""
+
+# The queries search_bookings ran before the indexes and pagination
+LEGACY_QUERIES = {
+    "phone": ("SELECT * FROM bookings WHERE player_phone LIKE %s ORDER BY created_at DESC", "%{}%"),
+    "name": ("SELECT * FROM bookings WHERE player_name ILIKE %s ORDER BY created_at DESC", "%{}%"),
+    "id": ("SELECT * FROM bookings WHERE id = %s", "{}"),
+}
+
+
+def seed(rows, batch=200_000):
+    pool = get_pool(DATABASE_CONFIG)
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT count(*) FROM bookings WHERE id LIKE %s", (SEED_PREFIX + "%",))
+        existing = cursor.fetchone()[0]
+        cursor.execute("SET session_replication_role = replica")
+        for start in range(existing, rows, batch):
+            cursor.execute(
+                SEED_SQL,
+                {
+                    "prefix": SEED_PREFIX,
+                    "first": FIRST_NAMES,
+                    "first_count": len(FIRST_NAMES),
+                    "last": LAST_NAMES,
+                    "last_count": len(LAST_NAMES),
+                    "start": start,
+                    "end": min(start + batch, rows) - 1,
+                },
+            )
+            conn.commit()
+            print(f"  seeded {min(start + batch, rows):,} / {rows:,}")
+        cursor.execute("SET session_replication_role = DEFAULT")
+        conn.commit()
+
+
+def analyze():
+    with get_pool(DATABASE_CONFIG).connection() as conn:
+        conn.cursor().execute("ANALYZE bookings")
+        conn.commit()
+
+
+def cleanup():
+    with get_pool(DATABASE_CONFIG).connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SET session_replication_role = replica")
+        cursor.execute("DELETE FROM bookings WHERE id LIKE %s", (SEED_PREFIX + "%",))
+        deleted = cursor.rowcount
+        cursor.execute("SET session_replication_role = DEFAULT")
+        conn.commit()
+        print(f"Deleted {deleted:,} seeded bookings")
+
+
+def timed(fn, runs):
+    timings = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[max(int(len(timings) * 0.95) - 1, 0)], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--legacy-runs", type=int, default=3)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+
+    print(f"Seeding {args.rows:,} bookings")
+    seed(args.rows)
+    init_database()  # builds any missing search indexes
+    analyze()
+
+    sample_id = f"{SEED_PREFIX}{args.rows // 2:010d}"
+    sample_phone = f"{(args.rows // 2) * 7919 % 1_000_000_000:09d}"
+    cases = [
+        ("id exact", "id", sample_id),
+        ("id prefix", "id", sample_id[:-3]),
+        ("phone last 7", "phone", sample_phone[-7:]),
+        ("phone full", "phone", "03" + sample_phone),
+        ("name fragment", "name", "Hira Ab"),
+        ("name common", "name", "Ali"),
+    ]
+
+    AdminBookingService.search_bookings("id", SEED_PREFIX)  # resolves the search mode
+    mode = "trigram" if AdminBookingService._search_trigram else "prefix/suffix"
+    print(f"\nsearch mode: {mode}\n")
+    print(f"{'case':<15} {'p50 ms':>8} {'p95 ms':>8} {'rows':>6} {'more':>5}  {'legacy p50 ms':>14} {'legacy rows':>12}")
+    for label, method, value in cases:
+        p50, p95, (bookings, next_cursor) = timed(
+            lambda: AdminBookingService.search_bookings(method, value), args.runs
+        )
+
+        query, pattern = LEGACY_QUERIES[method]
+        legacy_p50, _, rows = timed(
+            lambda: AdminDatabaseManager.execute_query(query, (pattern.format(value),)),
+            args.legacy_runs,
+        )
+        legacy = f"{legacy_p50:>14.1f} {len(rows or []):>12,}"
+
+        print(
+            f"{label:<15} {p50:>8.2f} {p95:>8.2f} {len(bookings):>6} "
+            f"{'yes' if next_cursor else 'no':>5}  {legacy}"
+        )
+
+    print("\nRun with --cleanup to remove the seeded rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Creating a season of weekly bookings: one create per occurrence vs a series.
+
+"one at a time" is the previous admin flow (create_admin_booking per date);
+"series" is create_series (one conflict query, one multi-row insert, one
+transaction). Bookings are made for phone 03000000024 in --year and deleted
+afterwards. Run from the repository root:
+
+    python -m benchmarks.bench_series --weeks 52
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from admin_routes import AdminBookingService
+from db_config import DATABASE_CONFIG
+from db_pool import get_pool
+
+PHONE = "03000000024"
+
+
+def cleanup():
+    with get_pool(DATABASE_CONFIG).connection() as conn:
+        conn.cursor().execute("DELETE FROM bookings WHERE player_phone = %s", (PHONE,))
+        conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--year", type=int, default=2033)
+    parser.add_argument("--court", default="padel-2")
+    args = parser.parse_args()
+
+    first = date(args.year, 1, 4)
+    booking = {
+        "court": args.court,
+        "date": first.isoformat(),
+        "startTime": "20:00",
+        "duration": 1.5,
+        "playerName": "Bench Academy",
+        "playerPhone": PHONE,
+        "status": "confirmed",
+    }
+    recurrence = {"frequency": "weekly", "count": args.weeks}
+
+    cleanup()
+    try:
+        started = time.perf_counter()
+        for week in range(args.weeks):
+            AdminBookingService.create_admin_booking(
+                {**booking, "date": (first + timedelta(weeks=week)).isoformat()}
+            )
+        single_ms = (time.perf_counter() - started) * 1000
+        cleanup()
+
+        started = time.perf_counter()
+        result = AdminBookingService.create_series(booking, recurrence)
+        series_ms = (time.perf_counter() - started) * 1000
+
+        # Every date now conflicts: the cost of a fully rejected season
+        started = time.perf_counter()
+        rejected = AdminBookingService.create_series(booking, recurrence)
+        check_ms = (time.perf_counter() - started) * 1000
+    finally:
+        cleanup()
+
+    print(f"{args.weeks} weekly bookings on {args.court}")
+    print(f"one at a time:  {single_ms:8.1f} ms")
+    print(f"series:         {series_ms:8.1f} ms  ({len(result['created'])} created)")
+    print(f"all conflicts:  {check_ms:8.1f} ms  ({len(rejected['conflicts'])} reported)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Checkout holds: sweep cost on a large booking_slots table and hold latency.
+
+Seeds --claims booking claims (bookings with id prefix BENCHHOLD, 2040 onwards,
+triggers bypassed with session_replication_role = replica, so a superuser on a
+bench database) plus --expired lapsed holds, then compares the sweep's plan
+and buffer count with the same delete forced onto a sequential scan, and times
+hold/extend/release. Everything seeded is removed at the end. Run from the
+repository root:
+
+    python -m benchmarks.bench_slot_holds --claims 1000000 --expired 1000
+"""
+
+import argparse
+import statistics
+import time
+
+from app import BookingService, init_database
+from db_config import DATABASE_CONFIG
+from db_pool import get_pool
+from slot_bitmap import SLOTS_PER_DAY
+from slot_holds import SWEEP_BATCH, SWEEP_SQL
+
+SEED_PREFIX = "BENCHHOLD"
+COURTS = ["padel-1", "padel-2", "pickleball-1", "pickleball-2"]
+SLOTS_PER_BOOKING = 4
+
+SEED_BOOKINGS_SQL = """
+    INSERT INTO bookings (
+        id, sport, court, court_name, booking_date, start_time, end_time, duration,
+        selected_slots, player_name, player_phone, total_amount, status
+    )
+    SELECT
+        %(prefix)s || lpad(i::text, 8, '0'), 'padel',
+        (%(courts)s::text[])[1 + mod(i, %(court_count)s)], 'Bench Court',
+        DATE '2040-01-01' + i / (%(court_count)s * %(per_day)s),
+        '06:00', '08:00', 2, '[]'::jsonb, 'Bench Player', '03000000025', 11000, 'confirmed'
+    FROM generate_series(0, %(bookings)s - 1) AS i
+"""
+
+SEED_CLAIMS_SQL = """
+    INSERT INTO booking_slots (booking_id, court, surface, booking_date, slot_start, slot_index)
+    SELECT
+        b.id, b.court, b.court, b.booking_date,
+        TIME '06:00' + make_interval(mins => 30 * slot.idx), slot.idx
+    FROM (
+        SELECT id, court, booking_date,
+            mod(substr(id, %(prefix_length)s + 1)::int / %(court_count)s, %(per_day)s) AS block
+        FROM bookings WHERE id LIKE %(pattern)s
+    ) AS b
+    CROSS JOIN LATERAL (
+        SELECT b.block * %(slots)s + n AS idx FROM generate_series(0, %(slots)s - 1) AS n
+    ) AS slot
+"""
+
+# Lapsed holds on their own dates so they never collide with the claims
+SEED_EXPIRED_SQL = """
+    INSERT INTO booking_slots (
+        court, surface, booking_date, slot_start, slot_index, hold_token, expires_at
+    )
+    SELECT
+        'padel-1', 'padel-1', DATE '2060-01-01' + i / %(slots_per_day)s,
+        TIME '06:00' + make_interval(mins => 30 * mod(i, %(slots_per_day)s)),
+        mod(i, %(slots_per_day)s), 'benchhold' || i, now() - make_interval(secs => i + 1)
+    FROM generate_series(0, %(expired)s - 1) AS i
+"""
+
+
+def run_sql(query, params=None, replica=False):
+    with get_pool(DATABASE_CONFIG).connection() as conn:
+        cursor = conn.cursor()
+        if replica:
+            cursor.execute("SET session_replication_role = replica")
+        cursor.execute(query, params)
+        if replica:
+            cursor.execute("SET session_replication_role = DEFAULT")
+        conn.commit()
+
+
+def seed(claims, expired):
+    per_day = SLOTS_PER_DAY // SLOTS_PER_BOOKING
+    params = {
+        "prefix": SEED_PREFIX,
+        "prefix_length": len(SEED_PREFIX),
+        "pattern": SEED_PREFIX + "%",
+        "courts": COURTS,
+        "court_count": len(COURTS),
+        "per_day": per_day,
+        "slots": SLOTS_PER_BOOKING,
+        "bookings": claims // SLOTS_PER_BOOKING,
+    }
+    run_sql(SEED_BOOKINGS_SQL, params, replica=True)
+    run_sql(SEED_CLAIMS_SQL, params, replica=True)
+    run_sql(SEED_EXPIRED_SQL, {"expired": expired, "slots_per_day": SLOTS_PER_DAY})
+    run_sql("ANALYZE booking_slots")
+
+
+def cleanup():
+    run_sql("DELETE FROM booking_slots WHERE hold_token LIKE 'benchhold%%'")
+    run_sql("DELETE FROM booking_slots WHERE booking_id LIKE %s", (SEED_PREFIX + "%",))
+    run_sql("DELETE FROM bookings WHERE id LIKE %s", (SEED_PREFIX + "%",), replica=True)
+
+
+def explain_sweep(force_seq_scan=False):
+    """(top plan nodes, buffers touched, ms) for one sweep, rolled back"""
+    with get_pool(DATABASE_CONFIG).connection() as conn:
+        cursor = conn.cursor()
+        if force_seq_scan:
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+        cursor.execute(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + SWEEP_SQL, {"sweep_limit": SWEEP_BATCH}
+        )
+        plan = cursor.fetchone()[0][0]
+        conn.rollback()
+
+    scans = []
+
+    def walk(node):
+        if "Scan" in node["Node Type"]:
+            scans.append(f"{node['Node Type']} on {node.get('Index Name', node.get('Relation Name'))}")
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    buffers = plan["Plan"]["Shared Hit Blocks"] + plan["Plan"]["Shared Read Blocks"]
+    return scans, buffers, plan["Execution Time"]
+
+
+def time_calls(call, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--claims", type=int, default=1_000_000)
+    parser.add_argument("--expired", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    init_database()
+    cleanup()
+    started = time.perf_counter()
+    seed(args.claims, args.expired)
+    print(f"Seeded {args.claims:,} claims and {args.expired:,} expired holds "
+          f"in {time.perf_counter() - started:.1f}s\n")
+
+    try:
+        for label, forced in (("sweep", False), ("seq scan", True)):
+            scans, buffers, elapsed = explain_sweep(forced)
+            print(f"{label:<9} {elapsed:8.2f} ms  {buffers:>7,} buffers  {'; '.join(scans)}")
+
+        court, date = "padel-1", "2059-12-31"
+        token, _ = BookingService.hold_slots(court, date, ["20:00", "20:30"], "benchhold-live")
+        hold_ms = time_calls(
+            lambda: BookingService.hold_slots(court, date, ["20:00", "20:30"], token), args.runs
+        )
+        extend_ms = time_calls(lambda: BookingService.extend_hold(token), args.runs)
+        mask_ms = time_calls(lambda: BookingService.get_held_mask(court, date), args.runs)
+        release_ms = time_calls(lambda: BookingService.release_hold(token), 1)
+
+        print(f"\nhold (re-hold) p50 {hold_ms:6.2f} ms")
+        print(f"extend p50         {extend_ms:6.2f} ms")
+        print(f"held mask p50      {mask_ms:6.2f} ms")
+        print(f"release            {release_ms:6.2f} ms")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
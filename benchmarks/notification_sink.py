@@ -0,0 +1,142 @@
+"""Local SMTP + HTTP SMS stand-in for exercising notification_worker.py.
+
+Accepts every message, optionally after a delay or with random failures to
+exercise retries, and prints received counts and rate. Run from the
+repository root, then start the worker with its default settings:
+
+    python -m benchmarks.notification_sink --latency 0.05 --fail-rate 0.1
+    python -m benchmarks.notification_sink --enqueue pending_payment_reminder
+"""
+
+import argparse
+import json
+import random
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+counts = {"email": 0, "sms": 0, "rejected": 0}
+counts_lock = threading.Lock()
+settings = {"latency": 0.0, "fail_rate": 0.0}
+
+
+def record(kind):
+    with counts_lock:
+        counts[kind] += 1
+
+
+def should_fail():
+    time.sleep(settings["latency"])
+    return random.random() < settings["fail_rate"]
+
+
+class SmtpHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib.send_message"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 notification-sink ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 notification-sink")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                if should_fail():
+                    record("rejected")
+                    self.reply("451 Temporary failure")
+                else:
+                    record("email")
+                    self.reply("250 Queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+
+class SmsHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        json.loads(self.rfile.read(length) or b"{}")
+        if should_fail():
+            record("rejected")
+            self.send_response(503)
+        else:
+            record("sms")
+            self.send_response(202)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingSmtpServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def enqueue(job_type):
+    """Queue a bulk notification the same way the admin endpoint does"""
+    from admin_routes import AdminDatabaseManager
+    from notification_queue import ENQUEUE_FOR_STATUS_SQL, JOB_TYPES
+
+    queued = AdminDatabaseManager.execute_query(
+        ENQUEUE_FOR_STATUS_SQL,
+        {"kind": job_type, "status": JOB_TYPES[job_type]},
+        fetch_all=False,
+    )
+    print(f"Queued {queued} {job_type} jobs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--smtp-port", type=int, default=1025)
+    parser.add_argument("--sms-port", type=int, default=8025)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--enqueue", choices=["pending_payment_reminder", "booking_confirmation"])
+    args = parser.parse_args()
+
+    if args.enqueue:
+        enqueue(args.enqueue)
+        return
+
+    settings.update(latency=args.latency, fail_rate=args.fail_rate)
+    smtp = ThreadingSmtpServer(("localhost", args.smtp_port), SmtpHandler)
+    sms = ThreadingHTTPServer(("localhost", args.sms_port), SmsHandler)
+    for server in (smtp, sms):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"SMTP on :{args.smtp_port}, SMS on http://localhost:{args.sms_port}/sms")
+
+    previous, started = 0, time.monotonic()
+    try:
+        while True:
+            time.sleep(5)
+            with counts_lock:
+                snapshot = dict(counts)
+            delivered = snapshot["email"] + snapshot["sms"]
+            print(
+                f"[{time.monotonic() - started:6.0f}s] email={snapshot['email']} "
+                f"sms={snapshot['sms']} rejected={snapshot['rejected']} "
+                f"rate={(delivered - previous) / 5:.1f}/s"
+            )
+            previous = delivered
+    except KeyboardInterrupt:
+        smtp.shutdown()
+        sms.shutdown()
+
+
+if __name__ == "__main__":
+    main()
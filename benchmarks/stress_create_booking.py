@@ -0,0 +1,105 @@
+"""Fire hundreds of parallel /api/create-booking requests at the same slot.
+
+Exactly one request may win; every other one must get a 409. Half of the
+requests target the sibling multi-purpose court, so the surface-wide
+constraint is exercised too. Run against a live server:
+
+    python app.py &
+    python -m benchmarks.stress_create_booking --requests 300 --date 2030-01-07
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+COURTS = [
+    ("cricket", "cricket-2", "Court 2: 130x60ft Multi"),
+    ("futsal", "futsal-1", "Court 1: 130x60ft Multi"),
+]
+
+
+def build_booking(index, date, start_time):
+    sport, court, court_name = COURTS[index % len(COURTS)]
+    hour, minute = map(int, start_time.split(":"))
+    second_slot = f"{hour + (minute + 30) // 60:02d}:{(minute + 30) % 60:02d}"
+    return {
+        "sport": sport,
+        "court": court,
+        "courtName": court_name,
+        "date": date,
+        "startTime": start_time,
+        "endTime": f"{hour + 1:02d}:{minute:02d}",
+        "duration": 1,
+        "selectedSlots": [
+            {"time": start_time, "index": 0},
+            {"time": second_slot, "index": 1},
+        ],
+        "playerName": f"Stress Test {index}",
+        "playerPhone": f"0300{index:07d}",
+        "totalAmount": 3000,
+    }
+
+
+def post(url, payload):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:5001")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=100)
+    parser.add_argument("--date", required=True, help="use an otherwise empty date")
+    parser.add_argument("--start-time", default="20:00")
+    args = parser.parse_args()
+
+    url = f"{args.base_url}/api/create-booking"
+    barrier = threading.Barrier(min(args.threads, args.requests))
+
+    def attempt(index):
+        try:
+            barrier.wait(timeout=10)
+        except threading.BrokenBarrierError:
+            pass
+        started = time.perf_counter()
+        status, body = post(url, build_booking(index, args.date, args.start_time))
+        return status, body, (time.perf_counter() - started) * 1000
+
+    print(f"Firing {args.requests} creates at {args.date} {args.start_time}...\n")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        results = list(executor.map(attempt, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    statuses = Counter(status for status, _, _ in results)
+    winners = [body.get("bookingId") for status, body, _ in results if status == 200]
+    latencies = sorted(ms for _, _, ms in results)
+
+    print(f"Status codes: {dict(statuses)}")
+    print(f"Winning bookings: {winners}")
+    print(f"Elapsed: {elapsed:.2f}s, p50 {latencies[len(latencies) // 2]:.1f} ms")
+
+    if len(winners) == 1 and statuses[409] == args.requests - 1:
+        print("\n✅ Exactly one booking won the slot; all others got 409")
+    else:
+        print("\n❌ Double booking or unexpected errors detected")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
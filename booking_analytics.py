@@ -0,0 +1,221 @@
+import logging
+from datetime import date as dt_date, datetime
+
+import numpy as np
+
+from slot_bitmap import SLOT_TIMES, SLOTS_PER_DAY
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("confirmed", "pending_payment")
+
+# Hour of day for each grid slot (06:00 is slot 0)
+SLOT_HOURS = np.array([int(slot_time[:2]) for slot_time in SLOT_TIMES], dtype=np.int8)
+
+# One row per booking in the range; slot_index uses the same 06:00-05:30 grid
+# as slot_bitmap and booking_slots
+RANGE_QUERY = """
+    SELECT
+        court, sport, COALESCE(payment_type, 'advance') AS payment_type, status,
+        booking_date - %s::date AS day_offset,
+        mod(EXTRACT(EPOCH FROM start_time)::int / 60 + 1080, 1440) / 30 AS slot_index,
+        GREATEST(ROUND(duration * 2)::int, 1) AS slot_count,
+        total_amount
+    FROM bookings
+    WHERE booking_date BETWEEN %s AND %s
+"""
+
+
+class BookingColumns:
+    """Bookings for a date range held as parallel NumPy columns.
+
+    Categorical fields are stored as integer codes into the matching label
+    list, so every report is a bincount or a boolean mask away.
+    """
+
+    def __init__(self, start_date, end_date, courts, rows):
+        self.start_date = _as_date(start_date)
+        self.end_date = _as_date(end_date)
+        self.days = (self.end_date - self.start_date).days + 1
+        self.courts = list(courts)
+
+        rows = list(rows)
+        self.size = len(rows)
+        court_col, sport_col, payment_col, status_col = (
+            [row[i] for row in rows] for i in range(4)
+        )
+
+        self.court, self.court_labels = _encode(court_col, self.courts)
+        self.sport, self.sport_labels = _encode(sport_col)
+        self.payment_type, self.payment_labels = _encode(payment_col)
+        self.status, self.status_labels = _encode(status_col)
+
+        self.day = np.fromiter((row[4] for row in rows), dtype=np.int32, count=self.size)
+        self.slot_index = np.fromiter((row[5] for row in rows), dtype=np.int16, count=self.size)
+        self.slot_count = np.fromiter((row[6] for row in rows), dtype=np.int16, count=self.size)
+        self.amount = np.fromiter((row[7] or 0 for row in rows), dtype=np.int64, count=self.size)
+
+    @classmethod
+    def load(cls, execute_query, start_date, end_date, courts):
+        """Load a range through a DatabaseManager-style execute_query"""
+        rows = execute_query(RANGE_QUERY, (start_date, start_date, end_date))
+        if rows is None:
+            raise Exception("Failed to load bookings for analytics")
+        return cls(
+            start_date,
+            end_date,
+            courts,
+            (
+                (
+                    r["court"], r["sport"], r["payment_type"], r["status"],
+                    r["day_offset"], r["slot_index"], r["slot_count"], r["total_amount"],
+                )
+                for r in rows
+            ),
+        )
+
+    def status_mask(self, *statuses):
+        codes = [self.status_labels.index(s) for s in statuses if s in self.status_labels]
+        return np.isin(self.status, codes)
+
+    def occupancy_cube(self):
+        """Boolean [court, day, slot] grid of slots held by active bookings"""
+        active = self.status_mask(*ACTIVE_STATUSES) & (self.court < len(self.courts))
+        counts = self.slot_count[active].astype(np.int64)
+        total = int(counts.sum())
+
+        # Expand each booking into its individual slots without a Python loop
+        owner = np.repeat(np.nonzero(active)[0], counts)
+        offset = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        slot = self.slot_index[owner] + offset
+        on_grid = (slot < SLOTS_PER_DAY) & (self.day[owner] >= 0) & (self.day[owner] < self.days)
+
+        flat = (
+            self.court[owner][on_grid].astype(np.int64) * self.days + self.day[owner][on_grid]
+        ) * SLOTS_PER_DAY + slot[on_grid]
+        cells = len(self.courts) * self.days * SLOTS_PER_DAY
+        return (np.bincount(flat, minlength=cells) > 0).reshape(
+            len(self.courts), self.days, SLOTS_PER_DAY
+        )
+
+
+def occupancy_by_slot(columns, cube=None):
+    """Share of days each court's 30-minute slots were booked"""
+    cube = columns.occupancy_cube() if cube is None else cube
+    rate = cube.mean(axis=1) if columns.days else np.zeros((len(columns.courts), SLOTS_PER_DAY))
+    return {
+        "slots": SLOT_TIMES,
+        "courts": {
+            court: np.round(rate[i], 4).tolist() for i, court in enumerate(columns.courts)
+        },
+        "overall": {
+            court: round(float(rate[i].mean()), 4) for i, court in enumerate(columns.courts)
+        },
+    }
+
+
+def utilization_heatmap(columns, cube=None):
+    """Weekday x hour utilization across all courts (Monday = row 0)"""
+    cube = columns.occupancy_cube() if cube is None else cube
+    weekday = (np.arange(columns.days) + columns.start_date.weekday()) % 7
+
+    # Occupied slots per (day, hour) summed over courts, then per (weekday, hour)
+    per_day_hour = np.zeros((columns.days, 24), dtype=np.int64)
+    np.add.at(per_day_hour, (slice(None), SLOT_HOURS), cube.sum(axis=0))
+    occupied = np.zeros((7, 24), dtype=np.int64)
+    np.add.at(occupied, weekday, per_day_hour)
+
+    # Two slots per hour on every court for each occurrence of the weekday
+    capacity = np.bincount(weekday, minlength=7)[:, None] * 2 * len(columns.courts)
+    heatmap = np.divide(
+        occupied, capacity, out=np.zeros((7, 24)), where=capacity > 0
+    )
+    return {
+        "weekdays": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+        "hours": list(range(24)),
+        "utilization": np.round(heatmap, 4).tolist(),
+    }
+
+
+def revenue_breakdown(columns):
+    """Confirmed revenue by sport, court and payment type"""
+    confirmed = columns.status_mask("confirmed")
+    amount = columns.amount[confirmed]
+
+    def by(codes, labels):
+        totals = np.bincount(codes[confirmed], weights=amount, minlength=len(labels))
+        return {label: int(totals[i]) for i, label in enumerate(labels)}
+
+    return {
+        "total": int(amount.sum()),
+        "bookings": int(confirmed.sum()),
+        "bySport": by(columns.sport, columns.sport_labels),
+        "byCourt": by(columns.court, columns.court_labels),
+        "byPaymentType": by(columns.payment_type, columns.payment_labels),
+    }
+
+
+def cancellation_rates(columns):
+    """Share of bookings cancelled or declined, overall and per sport/court"""
+    cancelled = columns.status_mask("cancelled", "declined")
+
+    def by(codes, labels):
+        totals = np.bincount(codes, minlength=len(labels))
+        lost = np.bincount(codes[cancelled], minlength=len(labels))
+        return {
+            label: {
+                "bookings": int(totals[i]),
+                "cancelled": int(lost[i]),
+                "rate": round(float(lost[i] / totals[i]), 4) if totals[i] else 0.0,
+            }
+            for i, label in enumerate(labels)
+        }
+
+    return {
+        "bookings": columns.size,
+        "cancelled": int(cancelled.sum()),
+        "rate": round(float(cancelled.mean()), 4) if columns.size else 0.0,
+        "bySport": by(columns.sport, columns.sport_labels),
+        "byCourt": by(columns.court, columns.court_labels),
+    }
+
+
+REPORTS = {
+    "occupancy": occupancy_by_slot,
+    "heatmap": utilization_heatmap,
+    "revenue": revenue_breakdown,
+    "cancellations": cancellation_rates,
+}
+
+
+def build_report(columns, report):
+    """Run one named report, or all of them for report='all'"""
+    if report != "all":
+        return REPORTS[report](columns)
+
+    # The occupancy cube is the expensive part; build it once for both users
+    cube = columns.occupancy_cube()
+    return {
+        "occupancy": occupancy_by_slot(columns, cube),
+        "heatmap": utilization_heatmap(columns, cube),
+        "revenue": revenue_breakdown(columns),
+        "cancellations": cancellation_rates(columns),
+    }
+
+
+def _encode(values, labels=None):
+    """Integer codes for values; unknown values get codes past the given labels"""
+    labels = list(labels) if labels is not None else sorted(set(values))
+    lookup = {label: i for i, label in enumerate(labels)}
+    for value in values:
+        if value not in lookup:
+            lookup[value] = len(labels)
+            labels.append(value)
+    codes = np.fromiter((lookup[v] for v in values), dtype=np.int16, count=len(values))
+    return codes, labels
+
+
+def _as_date(value):
+    if isinstance(value, dt_date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
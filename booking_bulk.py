@@ -0,0 +1,119 @@
+# Bookings handled per request; a bigger backlog takes a few requests
+MAX_BULK_BOOKINGS = 500
+
+# action -> (statuses it applies to, SET clause, event type). Bulk actions
+# only ever release slots, so one conflicting booking can't fail the batch;
+# anything else comes back as "skipped" with its current status.
+BULK_ACTIONS = {
+    "confirm": (
+        ("pending_payment",),
+        "status = 'confirmed', payment_verified = TRUE, confirmed_at = CURRENT_TIMESTAMP",
+        "confirmed",
+    ),
+    "cancel": (
+        ("pending_payment", "confirmed"),
+        "status = 'cancelled', cancelled_at = CURRENT_TIMESTAMP",
+        "cancelled",
+    ),
+    "decline": (
+        ("pending_payment",),
+        "status = 'cancelled', cancelled_at = CURRENT_TIMESTAMP",
+        "declined",
+    ),
+    "delete": (None, None, "deleted"),
+}
+
+PREVIEW_COLUMNS = """
+    id, sport, court, court_name, booking_date, start_time, end_time,
+    player_name, player_phone, total_amount, status, series_id
+"""
+
+
+def filter_query(filters, columns="id", statuses=None, limit=MAX_BULK_BOOKINGS):
+    """Bookings matching the bulk filters, in schedule order; raises ValueError"""
+    filters = filters or {}
+    start_date, end_date = filters.get("startDate"), filters.get("endDate")
+    series_id = filters.get("seriesId") or None
+    # A series is bounded by itself; otherwise a date range is required
+    if not series_id and (not start_date or not end_date):
+        raise ValueError("Select both start and end dates")
+
+    query = f"""
+        SELECT {columns}
+        FROM bookings
+        WHERE (%(start_date)s::date IS NULL OR booking_date >= %(start_date)s)
+        AND (%(end_date)s::date IS NULL OR booking_date <= %(end_date)s)
+        AND (%(series_id)s::text IS NULL OR series_id = %(series_id)s)
+        AND (%(status)s::text IS NULL OR status = %(status)s)
+        AND (%(sport)s::text IS NULL OR sport = %(sport)s)
+        AND (%(statuses)s::text[] IS NULL OR status = ANY(%(statuses)s))
+        ORDER BY booking_date, start_time, id
+        LIMIT %(limit)s
+    """
+    params = {
+        "start_date": start_date or None,
+        "end_date": end_date or None,
+        "series_id": series_id,
+        "status": filters.get("status") or None,
+        "sport": filters.get("sport") or None,
+        "statuses": statuses,
+        "limit": limit,
+    }
+    return query, params
+
+
+def bulk_action_query(action, booking_ids=None, filters=None, limit=MAX_BULK_BOOKINGS):
+    """One statement that applies action and reports an outcome per booking id.
+
+    Rows come back as {id, outcome, status, court, booking_date, selected_slots}
+    where outcome is "done", "skipped" or "not_found". Raises ValueError.
+    """
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"Invalid action: {action}")
+    statuses, assignments, _ = BULK_ACTIONS[action]
+    statuses = list(statuses) if statuses else None
+
+    booking_ids = list(dict.fromkeys(str(i).strip() for i in booking_ids or [] if str(i).strip()))
+    if booking_ids:
+        if len(booking_ids) > limit:
+            raise ValueError(f"Select at most {limit} bookings at a time")
+        selected = "SELECT unnest(%(ids)s::text[]) AS id"
+        params = {"ids": booking_ids, "statuses": statuses}
+    elif filters:
+        # Only rows the action applies to, so the limit isn't spent on skips
+        selected, params = filter_query(filters, statuses=statuses, limit=limit)
+    else:
+        raise ValueError("Select at least one booking")
+
+    if action == "delete":
+        changed = """
+            DELETE FROM bookings b USING selected s
+            WHERE b.id = s.id
+            RETURNING b.id, b.court, b.booking_date, 'deleted'::text AS status, b.selected_slots
+        """
+    else:
+        changed = f"""
+            UPDATE bookings b SET {assignments}
+            FROM selected s
+            WHERE b.id = s.id AND b.status = ANY(%(statuses)s)
+            RETURNING b.id, b.court, b.booking_date, b.status, b.selected_slots
+        """
+
+    # The outer read of bookings sees the rows as they were before the change
+    query = f"""
+        WITH selected AS ({selected}),
+        changed AS ({changed})
+        SELECT
+            s.id,
+            CASE
+                WHEN c.id IS NOT NULL THEN 'done'
+                WHEN b.id IS NULL THEN 'not_found'
+                ELSE 'skipped'
+            END AS outcome,
+            COALESCE(c.status, b.status) AS status,
+            c.court, c.booking_date, c.selected_slots
+        FROM selected s
+        LEFT JOIN changed c ON c.id = s.id
+        LEFT JOIN bookings b ON b.id = s.id
+    """
+    return query, params
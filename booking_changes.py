@@ -0,0 +1,78 @@
+import logging
+
+from availability_cache import availability_cache
+from booking_events import build_event, event_bus, slot_times
+from booking_slots import MULTI_PURPOSE_COURTS
+from change_feed import change_feed
+from slot_bitmap import sibling_courts
+
+logger = logging.getLogger(__name__)
+
+# Shared by the public booking API and the admin panel: every write drops
+# the cached availability it touched and, unless the change feed delivers
+# it, tells this worker's event streams.
+
+
+def invalidate_availability(court_id, date):
+    """Drop cached availability for a court and the courts sharing its surface"""
+    availability_cache.invalidate(
+        [court_id] + sibling_courts(court_id, MULTI_PURPOSE_COURTS), date
+    )
+
+
+def publish_booking_change(
+    event_type, booking_id, row, previous_court=None, previous_date=None
+):
+    """Invalidate cached availability and push a booking change to event streams"""
+    court, date = row["court"], row["booking_date"]
+    invalidate_availability(court, date)
+    if previous_court is not None:
+        invalidate_availability(previous_court, previous_date)
+
+    if change_feed.is_listening():
+        # The NOTIFY for this write reaches every worker's streams, this one included
+        return
+
+    event_bus.publish(
+        build_event(
+            event_type,
+            booking_id,
+            court,
+            date,
+            row.get("status"),
+            slot_times(row.get("selected_slots")),
+            [court] + sibling_courts(court, MULTI_PURPOSE_COURTS),
+            previous_court,
+            previous_date,
+            previous_court
+            and [previous_court] + sibling_courts(previous_court, MULTI_PURPOSE_COURTS),
+            (
+                slot_times(row["old_selected_slots"])
+                if "old_selected_slots" in row
+                else None
+            ),
+        )
+    )
+
+
+def publish_booking_changes(event_type, rows):
+    """Batch form of publish_booking_change: each court/date is invalidated once"""
+    for court, date in {(row["court"], row["booking_date"]) for row in rows}:
+        invalidate_availability(court, date)
+
+    if change_feed.is_listening():
+        return
+
+    for row in rows:
+        court = row["court"]
+        event_bus.publish(
+            build_event(
+                event_type,
+                row["id"],
+                court,
+                row["booking_date"],
+                row["status"],
+                slot_times(row.get("selected_slots")),
+                [court] + sibling_courts(court, MULTI_PURPOSE_COURTS),
+            )
+        )
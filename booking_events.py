@@ -0,0 +1,165 @@
+import json
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds between keep-alive comments on idle streams
+HEARTBEAT_INTERVAL = 15
+# Events buffered per subscriber before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 256
+
+ACTIVE_STATUSES = ("confirmed", "pending_payment")
+
+
+class Subscription:
+    """One streaming client and the court/date range it is watching"""
+
+    def __init__(self, courts=None, start_date=None, end_date=None):
+        self.courts = set(courts) if courts else None
+        self.start_date = start_date
+        self.end_date = end_date
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.lagged = False
+
+    def wants(self, event):
+        """Check whether an event touches this subscriber's courts and dates"""
+        places = [(event["courts"], event["date"])]
+        if event.get("previousDate"):
+            places.append((event["previousCourts"], event["previousDate"]))
+
+        for courts, date in places:
+            if self.courts is not None and not self.courts.intersection(courts):
+                continue
+            if self.start_date and date < self.start_date:
+                continue
+            if self.end_date and date > self.end_date:
+                continue
+            return True
+        return False
+
+
+class BookingEventBus:
+    """Fan booking create/update/cancel events out to streaming subscribers"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, courts=None, start_date=None, end_date=None):
+        subscription = Subscription(courts, start_date, end_date)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event):
+        """Deliver an event to every interested subscriber without blocking"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            if subscription.lagged or not subscription.wants(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except queue.Full:
+                # A stalled client must not hold up writers; make it resync
+                subscription.lagged = True
+
+    def resync_all(self):
+        """Tell every subscriber to refetch, e.g. after events may have been missed"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.lagged = True
+            try:
+                # Wake the stream so it notices without waiting for a heartbeat
+                subscription.queue.put_nowait(None)
+            except queue.Full:
+                pass
+
+    def stream(self, courts=None, start_date=None, end_date=None):
+        """Yield Server-Sent Events for a court/date filter until the client leaves"""
+        # Subscribe lazily so a response that is never iterated leaks nothing
+        subscription = self.subscribe(courts, start_date, end_date)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                if subscription.lagged:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                try:
+                    event = subscription.queue.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield f": keep-alive {int(time.time())}\n\n"
+                    continue
+                if event is None:
+                    continue
+                yield f"event: booking\ndata: {json.dumps(event)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+
+def build_event(
+    event_type,
+    booking_id,
+    court,
+    date,
+    status,
+    slots,
+    courts,
+    previous_court=None,
+    previous_date=None,
+    previous_courts=None,
+    previous_slots=None,
+):
+    """Build the JSON-safe payload streamed to clients (no customer details)"""
+    event = {
+        "type": event_type,
+        "bookingId": booking_id,
+        "court": court,
+        "courts": courts,
+        "date": str(date),
+        "status": status,
+        "active": status in ACTIVE_STATUSES,
+        "slots": slots,
+        "timestamp": time.time(),
+    }
+    if previous_slots is not None:
+        # Slots held before an update; freed unless listed in "slots" again
+        event["previousSlots"] = previous_slots
+    if previous_date is not None and (
+        previous_court != court or str(previous_date) != str(date)
+    ):
+        event["previousCourt"] = previous_court
+        event["previousCourts"] = previous_courts or [previous_court]
+        event["previousDate"] = str(previous_date)
+    return event
+
+
+def slot_times(selected_slots):
+    """Slot time strings from a selected_slots value (list or JSON text)"""
+    if isinstance(selected_slots, str):
+        try:
+            selected_slots = json.loads(selected_slots)
+        except json.JSONDecodeError:
+            return []
+    return [
+        slot["time"]
+        for slot in selected_slots or []
+        if isinstance(slot, dict) and "time" in slot
+    ]
+
+
+# Shared by the public booking API and the admin panel
+event_bus = BookingEventBus()
@@ -0,0 +1,164 @@
+import base64
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+# Trigram indexes need three characters to narrow anything down
+MIN_TERM_LENGTH = 3
+
+# Digits-only phone, so "0300-1234567", "+92 300 1234567" and "03001234567"
+# all match a search for "1234567"
+SCHEMA_SQL = """
+    CREATE OR REPLACE FUNCTION phone_digits(phone TEXT) RETURNS TEXT AS $$
+        SELECT regexp_replace(COALESCE(phone, ''), '[^0-9]', '', 'g')
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+    CREATE INDEX IF NOT EXISTS idx_bookings_id_prefix
+    ON bookings (id varchar_pattern_ops);
+"""
+
+# Optional: needs the contrib package and CREATE privilege on the database
+TRIGRAM_EXTENSION_SQL = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+
+HAS_TRIGRAM_SQL = """
+    SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') AS has_trigram
+"""
+
+# Substring search on phone digits and names
+TRIGRAM_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_bookings_phone_digits_trgm
+    ON bookings USING gin (phone_digits(player_phone) gin_trgm_ops);
+
+    CREATE INDEX IF NOT EXISTS idx_bookings_name_trgm
+    ON bookings USING gin (player_name gin_trgm_ops);
+"""
+
+# Without pg_trgm: phone prefix/suffix and name prefix on btree indexes
+PREFIX_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_bookings_phone_digits
+    ON bookings (phone_digits(player_phone) text_pattern_ops);
+
+    CREATE INDEX IF NOT EXISTS idx_bookings_phone_digits_reversed
+    ON bookings (reverse(phone_digits(player_phone)) text_pattern_ops);
+
+    CREATE INDEX IF NOT EXISTS idx_bookings_name_lower
+    ON bookings (lower(player_name) text_pattern_ops);
+"""
+
+# Expression indexes have no statistics until the next ANALYZE; without them
+# the planner guesses 1% selectivity and walks created_at instead
+SEARCH_INDEX_COUNT_SQL = """
+    SELECT count(*) AS index_count FROM pg_indexes
+    WHERE tablename = 'bookings'
+      AND indexname IN (
+          'idx_bookings_phone_digits_trgm', 'idx_bookings_name_trgm',
+          'idx_bookings_phone_digits', 'idx_bookings_phone_digits_reversed',
+          'idx_bookings_name_lower'
+      )
+"""
+
+SEARCH_COLUMNS = """
+    id, sport, court, court_name, booking_date, start_time, end_time, duration,
+    selected_slots, player_name, player_phone, player_email, total_amount,
+    status, created_at
+"""
+
+# Keyset order per method; id breaks ties. Row comparisons skip NULLs, so
+# every column must be NOT NULL: created_at is enforced (and backfilled on
+# older tables) by init_database, the others always were.
+ORDERINGS = {
+    "date": ("booking_date", "start_time", "id"),
+    "default": ("created_at", "id"),
+}
+
+
+def escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def match_clause(method, value=None, start_date=None, end_date=None, trigram=True):
+    """WHERE clause and params for one search method; raises ValueError"""
+    if method == "id":
+        value = (value or "").strip()
+        if not value:
+            raise ValueError("Enter a booking ID or the start of one")
+        return "id LIKE %s", [escape_like(value) + "%"]
+
+    if method == "phone":
+        digits = re.sub(r"\D", "", value or "")
+        if len(digits) < MIN_TERM_LENGTH:
+            raise ValueError(f"Enter at least {MIN_TERM_LENGTH} digits of the phone number")
+        if trigram:
+            return "phone_digits(player_phone) LIKE %s", [f"%{digits}%"]
+        return (
+            "(phone_digits(player_phone) LIKE %s"
+            " OR reverse(phone_digits(player_phone)) LIKE %s)",
+            [f"{digits}%", f"{digits[::-1]}%"],
+        )
+
+    if method == "name":
+        name = " ".join((value or "").split())
+        if len(name) < MIN_TERM_LENGTH:
+            raise ValueError(f"Enter at least {MIN_TERM_LENGTH} letters of the name")
+        if trigram:
+            return "player_name ILIKE %s", [f"%{escape_like(name)}%"]
+        return "lower(player_name) LIKE %s", [escape_like(name.lower()) + "%"]
+
+    if method == "date":
+        if not start_date or not end_date:
+            raise ValueError("Select both start and end dates")
+        return "booking_date BETWEEN %s AND %s", [start_date, end_date]
+
+    raise ValueError(f"Invalid search method: {method}")
+
+
+def build_search_query(method, where, params, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Keyset-paginated search; fetches limit + 1 rows to detect a next page"""
+    order = ORDERINGS.get(method, ORDERINGS["default"])
+    clauses = [where]
+    params = list(params)
+
+    if cursor:
+        after = decode_cursor(cursor)
+        if len(after) != len(order):
+            raise ValueError("Invalid cursor")
+        columns = ", ".join(order)
+        clauses.append(f"({columns}) < ({', '.join(['%s'] * len(order))})")
+        params.extend(after)
+
+    query = f"""
+        SELECT {SEARCH_COLUMNS}
+        FROM bookings
+        WHERE {' AND '.join(clauses)}
+        ORDER BY {', '.join(f'{column} DESC' for column in order)}
+        LIMIT %s
+    """
+    params.append(limit + 1)
+    return query, params
+
+
+def cursor_for(method, row):
+    """Opaque cursor positioned after row in its method's order"""
+    values = [str(row[column]) for column in ORDERINGS.get(method, ORDERINGS["default"])]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def page_size(limit):
+    try:
+        return max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
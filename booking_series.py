@@ -0,0 +1,104 @@
+from datetime import date, timedelta
+
+# A weekly slot for about four years; anything longer is almost certainly a typo
+MAX_OCCURRENCES = 200
+
+# How often skip_conflicts re-checks and retries when another booking claims
+# one of the series' slots between the conflict query and the insert
+INSERT_RETRIES = 3
+
+# Interval unit in days
+FREQUENCIES = {"daily": 1, "weekly": 7}
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+SCHEMA_SQL = """
+    ALTER TABLE bookings ADD COLUMN IF NOT EXISTS series_id VARCHAR(50);
+
+    CREATE INDEX IF NOT EXISTS idx_bookings_series
+    ON bookings (series_id) WHERE series_id IS NOT NULL;
+"""
+
+# Every slot the series would claim that is already taken, grouped by date.
+# Probes the no-double-booking index, so courts sharing a surface count too.
+# Live checkout holds conflict (without a booking id); expired ones give way.
+CONFLICTS_SQL = """
+    SELECT
+        bs.booking_date,
+        array_agg(to_char(bs.slot_start, 'HH24:MI') ORDER BY bs.slot_index) AS slots,
+        COALESCE(
+            array_agg(DISTINCT bs.booking_id) FILTER (WHERE bs.booking_id IS NOT NULL),
+            '{}'
+        ) AS booking_ids
+    FROM booking_slots bs
+    WHERE bs.surface = COALESCE(
+        (SELECT surface FROM court_surfaces WHERE court = %(court)s), %(court)s
+    )
+    AND bs.booking_date = ANY(%(dates)s::date[])
+    AND bs.slot_start = ANY(%(slots)s::time[])
+    AND (bs.booking_id IS NOT NULL OR bs.expires_at > now())
+    GROUP BY bs.booking_date
+"""
+
+# Multi-row insert for psycopg2.extras.execute_values
+INSERT_SQL = """
+    INSERT INTO bookings (
+        id, sport, court, court_name, booking_date, start_time, end_time,
+        duration, selected_slots, player_name, player_phone, player_email,
+        player_count, special_requests, payment_type, total_amount, status, series_id
+    ) VALUES %s
+"""
+
+
+def expand_recurrence(start_date, rule):
+    """Occurrence dates (ISO strings) for a recurrence rule; raises ValueError.
+
+    rule: {"frequency": "weekly" | "daily", "interval": 1, "until": "YYYY-MM-DD",
+    "count": n, "weekdays": ["tue", "thu"]}. until and/or count is required;
+    weekdays (weekly only) defaults to the start date's weekday.
+    """
+    rule = rule or {}
+    try:
+        start = date.fromisoformat(str(start_date))
+        until = date.fromisoformat(rule["until"]) if rule.get("until") else None
+        count = int(rule["count"]) if rule.get("count") else None
+        interval = int(rule.get("interval") or 1)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid repeat settings")
+
+    frequency = rule.get("frequency", "weekly")
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Invalid repeat frequency: {frequency}")
+    if interval < 1:
+        raise ValueError("Repeat interval must be at least 1")
+    if until is None and count is None:
+        raise ValueError("Choose an end date or a number of occurrences")
+    if until is not None and until < start:
+        raise ValueError("The series must end on or after its first date")
+    if count is not None and not 1 <= count <= MAX_OCCURRENCES:
+        raise ValueError(f"A series can have 1 to {MAX_OCCURRENCES} occurrences")
+
+    if frequency == "weekly":
+        weekdays = rule.get("weekdays") or [WEEKDAYS[start.weekday()]]
+        if any(day not in WEEKDAYS for day in weekdays):
+            raise ValueError("Weekdays must be mon, tue, wed, thu, fri, sat or sun")
+        offsets = sorted({WEEKDAYS.index(day) for day in weekdays})
+        period_start = start - timedelta(days=start.weekday())
+    else:
+        offsets = [0]
+        period_start = start
+
+    step = timedelta(days=FREQUENCIES[frequency] * interval)
+    occurrences = []
+    while True:
+        for offset in offsets:
+            current = period_start + timedelta(days=offset)
+            if current < start:
+                continue
+            if (until is not None and current > until) or (
+                count is not None and len(occurrences) == count
+            ):
+                return occurrences
+            if len(occurrences) == MAX_OCCURRENCES:
+                raise ValueError(f"A series can have at most {MAX_OCCURRENCES} occurrences")
+            occurrences.append(current.isoformat())
+        period_start += step
@@ -0,0 +1,168 @@
+import logging
+import re
+
+from psycopg2 import errors
+
+logger = logging.getLogger(__name__)
+
+# Courts that share one physical surface; a booking on either blocks both
+MULTI_PURPOSE_COURTS = {
+    "cricket-2": "multi-130x60",
+    "futsal-1": "multi-130x60",
+}
+
+# Unique constraint that makes double booking impossible at the database level
+CONFLICT_CONSTRAINT = "booking_slots_no_double_booking"
+
+# One row per claimed 30-minute slot; slot_index is the position on the
+# 06:00-05:30 grid used by slot_bitmap. Courts sharing a multi-purpose surface map
+# to the same surface, so the unique constraint also covers sibling courts.
+# The trigger keeps the table in step with every INSERT/UPDATE on bookings; a
+# clash raises a unique violation and aborts the whole statement. Rows without
+# a booking_id are checkout holds (see slot_holds.py); once expired they give
+# way to the next claim on the same surface and day.
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS court_surfaces (
+        court VARCHAR(50) PRIMARY KEY,
+        surface VARCHAR(50) NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS booking_slots (
+        booking_id VARCHAR(50) REFERENCES bookings(id) ON DELETE CASCADE,
+        court VARCHAR(50) NOT NULL,
+        surface VARCHAR(50) NOT NULL,
+        booking_date DATE NOT NULL,
+        slot_start TIME NOT NULL,
+        slot_index SMALLINT NOT NULL,
+        hold_token VARCHAR(64),
+        expires_at TIMESTAMPTZ,
+        CONSTRAINT booking_slots_no_double_booking
+            UNIQUE (surface, booking_date, slot_start)
+    );
+
+    -- Tables created before checkout holds existed
+    ALTER TABLE booking_slots ALTER COLUMN booking_id DROP NOT NULL;
+    ALTER TABLE booking_slots ADD COLUMN IF NOT EXISTS hold_token VARCHAR(64);
+    ALTER TABLE booking_slots ADD COLUMN IF NOT EXISTS expires_at TIMESTAMPTZ;
+
+    CREATE INDEX IF NOT EXISTS idx_booking_slots_booking
+    ON booking_slots(booking_id);
+
+    CREATE INDEX IF NOT EXISTS idx_booking_slots_hold_token
+    ON booking_slots(hold_token) WHERE hold_token IS NOT NULL;
+
+    CREATE INDEX IF NOT EXISTS idx_booking_slots_hold_expiry
+    ON booking_slots(expires_at) WHERE booking_id IS NULL;
+
+    CREATE INDEX IF NOT EXISTS idx_booking_slots_court_date
+    ON booking_slots(court, booking_date, slot_start);
+
+    CREATE OR REPLACE FUNCTION sync_booking_slots() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            IF NEW.status IS NOT DISTINCT FROM OLD.status
+                AND NEW.court = OLD.court
+                AND NEW.booking_date = OLD.booking_date
+                AND NEW.selected_slots = OLD.selected_slots THEN
+                RETURN NEW;
+            END IF;
+            DELETE FROM booking_slots WHERE booking_id = OLD.id;
+        END IF;
+
+        IF NEW.status IN ('confirmed', 'pending_payment') THEN
+            DELETE FROM booking_slots
+            WHERE surface = COALESCE(
+                (SELECT surface FROM court_surfaces WHERE court = NEW.court), NEW.court
+            )
+            AND booking_date = NEW.booking_date
+            AND booking_id IS NULL
+            AND expires_at <= now();
+
+            INSERT INTO booking_slots (
+                booking_id, court, surface, booking_date, slot_start, slot_index
+            )
+            SELECT DISTINCT
+                NEW.id, NEW.court, COALESCE(cs.surface, NEW.court), NEW.booking_date,
+                (slot->>'time')::time,
+                mod(EXTRACT(EPOCH FROM (slot->>'time')::time)::int / 60 + 1080, 1440) / 30
+            FROM jsonb_array_elements(
+                CASE WHEN jsonb_typeof(NEW.selected_slots) = 'array'
+                    THEN NEW.selected_slots ELSE '[]'::jsonb END
+            ) AS slot
+            LEFT JOIN court_surfaces cs ON cs.court = NEW.court
+            WHERE slot ? 'time';
+        END IF;
+
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS bookings_sync_slots ON bookings;
+    CREATE TRIGGER bookings_sync_slots
+        AFTER INSERT OR UPDATE ON bookings
+        FOR EACH ROW EXECUTE FUNCTION sync_booking_slots();
+"""
+
+# Claims for a batch of bookings written before the trigger existed
+# (see migrate_booking_slots.py)
+BACKFILL_BATCH_SQL = """
+    INSERT INTO booking_slots (
+        booking_id, court, surface, booking_date, slot_start, slot_index
+    )
+    SELECT DISTINCT
+        b.id, b.court, COALESCE(cs.surface, b.court), b.booking_date,
+        (slot->>'time')::time,
+        mod(EXTRACT(EPOCH FROM (slot->>'time')::time)::int / 60 + 1080, 1440) / 30
+    FROM bookings b
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(b.selected_slots) = 'array'
+            THEN b.selected_slots ELSE '[]'::jsonb END
+    ) AS slot
+    LEFT JOIN court_surfaces cs ON cs.court = b.court
+    WHERE b.id = ANY(%s)
+    AND b.status IN ('confirmed', 'pending_payment')
+    AND slot ? 'time'
+    AND NOT EXISTS (SELECT 1 FROM booking_slots bs WHERE bs.booking_id = b.id)
+    ON CONFLICT DO NOTHING
+"""
+
+# Active bookings that hold no claims, i.e. still need the migration
+UNMIGRATED_CHECK_SQL = """
+    SELECT EXISTS (
+        SELECT 1 FROM bookings b
+        WHERE b.status IN ('confirmed', 'pending_payment')
+        AND NOT EXISTS (SELECT 1 FROM booking_slots bs WHERE bs.booking_id = b.id)
+    ) AS pending
+"""
+
+SURFACE_UPSERT_SQL = """
+    INSERT INTO court_surfaces (court, surface) VALUES (%s, %s)
+    ON CONFLICT (court) DO UPDATE SET surface = EXCLUDED.surface
+"""
+
+_CONFLICT_DETAIL = re.compile(r"=\([^,]*, [^,]*, (\d{1,2}:\d{2})")
+
+
+class SlotConflictError(Exception):
+    """Raised when a write would claim a slot another booking already holds"""
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(
+            "One or more selected time slots are no longer available: "
+            + ", ".join(conflicts)
+        )
+
+
+def slot_conflict_from_error(error):
+    """Turn a no-double-booking violation into SlotConflictError, else None"""
+    if not isinstance(error, errors.UniqueViolation):
+        return None
+    if getattr(error.diag, "constraint_name", None) != CONFLICT_CONSTRAINT:
+        return None
+
+    # Detail looks like: Key (surface, booking_date, slot_start)=(padel-1, 2025-01-01, 18:00:00) already exists.
+    match = _CONFLICT_DETAIL.search(error.diag.message_detail or "")
+    conflicts = [match.group(1).zfill(5)] if match else []
+    return SlotConflictError(conflicts)
+
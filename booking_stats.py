@@ -0,0 +1,174 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("day", "sport", "court")
+
+STAT_COLUMNS = ("total_bookings", "pending_payment", "confirmed", "cancelled", "revenue")
+
+# Running dashboard counters per scope: ('day', 'YYYY-MM-DD'), ('sport', sport)
+# and ('court', court). Statement-level triggers fold each INSERT/UPDATE/DELETE
+# on bookings into the counters as one grouped upsert, so bulk statements touch
+# each counter row once and always in key order. Overall totals are summed
+# from the court rows (see OVERALL_STATS_SQL), so writers on different courts,
+# dates and sports never wait on a shared counter row.
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS booking_stats (
+        scope VARCHAR(10) NOT NULL,
+        scope_key VARCHAR(50) NOT NULL,
+        total_bookings BIGINT NOT NULL DEFAULT 0,
+        pending_payment BIGINT NOT NULL DEFAULT 0,
+        confirmed BIGINT NOT NULL DEFAULT 0,
+        cancelled BIGINT NOT NULL DEFAULT 0,
+        revenue BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (scope, scope_key)
+    );
+
+    CREATE OR REPLACE FUNCTION apply_booking_stats(changes JSONB) RETURNS void AS $$
+        INSERT INTO booking_stats AS bs (
+            scope, scope_key, total_bookings, pending_payment, confirmed, cancelled, revenue
+        )
+        SELECT
+            s.scope, s.scope_key,
+            SUM(c.sign),
+            COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'pending_payment'), 0),
+            COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'confirmed'), 0),
+            COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'cancelled'), 0),
+            COALESCE(SUM(c.sign * c.total_amount) FILTER (WHERE c.status = 'confirmed'), 0)
+        FROM jsonb_to_recordset(changes) AS c(
+            booking_date DATE, sport TEXT, court TEXT, status TEXT,
+            total_amount BIGINT, sign INT
+        )
+        CROSS JOIN LATERAL (VALUES
+            ('day', c.booking_date::text),
+            ('sport', c.sport),
+            ('court', c.court)
+        ) AS s(scope, scope_key)
+        GROUP BY s.scope, s.scope_key
+        -- Skip counters whose deltas cancel out (e.g. a booking moved between courts)
+        HAVING SUM(c.sign) <> 0
+            OR COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'pending_payment'), 0) <> 0
+            OR COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'confirmed'), 0) <> 0
+            OR COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'cancelled'), 0) <> 0
+            OR COALESCE(SUM(c.sign * c.total_amount) FILTER (WHERE c.status = 'confirmed'), 0) <> 0
+        ORDER BY s.scope, s.scope_key
+        ON CONFLICT (scope, scope_key) DO UPDATE SET
+            total_bookings = bs.total_bookings + EXCLUDED.total_bookings,
+            pending_payment = bs.pending_payment + EXCLUDED.pending_payment,
+            confirmed = bs.confirmed + EXCLUDED.confirmed,
+            cancelled = bs.cancelled + EXCLUDED.cancelled,
+            revenue = bs.revenue + EXCLUDED.revenue
+    $$ LANGUAGE sql;
+
+    CREATE OR REPLACE FUNCTION booking_stats_trigger() RETURNS trigger AS $$
+    DECLARE
+        changes JSONB;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT jsonb_agg(jsonb_build_object(
+                'booking_date', n.booking_date, 'sport', n.sport, 'court', n.court,
+                'status', n.status, 'total_amount', n.total_amount, 'sign', 1))
+            INTO changes FROM new_rows n;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT jsonb_agg(jsonb_build_object(
+                'booking_date', o.booking_date, 'sport', o.sport, 'court', o.court,
+                'status', o.status, 'total_amount', o.total_amount, 'sign', -1))
+            INTO changes FROM old_rows o;
+        ELSE
+            -- Only rows whose counted attributes changed move any counter
+            SELECT jsonb_agg(x) INTO changes FROM (
+                SELECT jsonb_build_object(
+                    'booking_date', n.booking_date, 'sport', n.sport, 'court', n.court,
+                    'status', n.status, 'total_amount', n.total_amount, 'sign', 1) AS x
+                FROM new_rows n JOIN old_rows o ON o.id = n.id
+                WHERE (o.booking_date, o.sport, o.court, o.status, o.total_amount)
+                    IS DISTINCT FROM (n.booking_date, n.sport, n.court, n.status, n.total_amount)
+                UNION ALL
+                SELECT jsonb_build_object(
+                    'booking_date', o.booking_date, 'sport', o.sport, 'court', o.court,
+                    'status', o.status, 'total_amount', o.total_amount, 'sign', -1)
+                FROM new_rows n JOIN old_rows o ON o.id = n.id
+                WHERE (o.booking_date, o.sport, o.court, o.status, o.total_amount)
+                    IS DISTINCT FROM (n.booking_date, n.sport, n.court, n.status, n.total_amount)
+            ) AS moved;
+        END IF;
+
+        IF changes IS NOT NULL THEN
+            PERFORM apply_booking_stats(changes);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS bookings_stats_insert ON bookings;
+    CREATE TRIGGER bookings_stats_insert
+        AFTER INSERT ON bookings REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION booking_stats_trigger();
+
+    DROP TRIGGER IF EXISTS bookings_stats_update ON bookings;
+    CREATE TRIGGER bookings_stats_update
+        AFTER UPDATE ON bookings REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION booking_stats_trigger();
+
+    DROP TRIGGER IF EXISTS bookings_stats_delete ON bookings;
+    CREATE TRIGGER bookings_stats_delete
+        AFTER DELETE ON bookings REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION booking_stats_trigger();
+"""
+
+# Counters recomputed from the bookings table, in booking_stats' shape
+RECOMPUTE_SQL = """
+    SELECT
+        s.scope, s.scope_key,
+        COUNT(*) AS total_bookings,
+        COUNT(*) FILTER (WHERE b.status = 'pending_payment') AS pending_payment,
+        COUNT(*) FILTER (WHERE b.status = 'confirmed') AS confirmed,
+        COUNT(*) FILTER (WHERE b.status = 'cancelled') AS cancelled,
+        COALESCE(SUM(b.total_amount) FILTER (WHERE b.status = 'confirmed'), 0) AS revenue
+    FROM bookings b
+    CROSS JOIN LATERAL (VALUES
+        ('day', b.booking_date::text),
+        ('sport', b.sport),
+        ('court', b.court)
+    ) AS s(scope, scope_key)
+    GROUP BY s.scope, s.scope_key
+"""
+
+# Writers are blocked for the duration so no delta lands between the two steps
+REBUILD_SQL = f"""
+    LOCK TABLE bookings IN SHARE MODE;
+    DELETE FROM booking_stats;
+    INSERT INTO booking_stats (
+        scope, scope_key, total_bookings, pending_payment, confirmed, cancelled, revenue
+    )
+    {RECOMPUTE_SQL};
+"""
+
+NEEDS_REBUILD_SQL = """
+    SELECT
+        NOT EXISTS (SELECT 1 FROM booking_stats)
+        AND EXISTS (SELECT 1 FROM bookings) AS needs_rebuild
+"""
+
+# Every booking counts towards exactly one court, so the court rows add up to
+# the overall totals; a few dozen rows to sum per dashboard load
+OVERALL_STATS_SQL = """
+    SELECT
+        SUM(total_bookings)::bigint AS total_bookings,
+        SUM(pending_payment)::bigint AS pending_payment,
+        SUM(confirmed)::bigint AS confirmed,
+        SUM(cancelled)::bigint AS cancelled,
+        SUM(revenue)::bigint AS revenue
+    FROM booking_stats
+    WHERE scope = 'court'
+    HAVING COUNT(*) > 0
+"""
+
+SCOPE_STATS_SQL = """
+    SELECT scope_key AS key, total_bookings, pending_payment, confirmed, cancelled, revenue
+    FROM booking_stats
+    WHERE scope = %s AND total_bookings <> 0
+    ORDER BY scope_key
+"""
+
+EMPTY_STATS = {column: 0 for column in STAT_COLUMNS}
@@ -0,0 +1,126 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+
+from flask import Response, request
+
+logger = logging.getLogger(__name__)
+
+# Last-Modified has one-second resolution and updated_at is stamped before
+# commit, so it is only sent once the latest change is this old; a write in
+# the same second can then no longer slip in under the same timestamp
+LAST_MODIFIED_MARGIN = timedelta(seconds=5)
+
+# One row per (court, date) that has ever been written. nextval() runs before
+# commit, so versions are not in commit order and MAX(version) could miss a
+# slower transaction; the ETag fingerprints every row in scope instead. A
+# row's version only ever goes up, also for a writer that waited on its lock
+# holding an older sequence value.
+SCHEMA_SQL = """
+    CREATE SEQUENCE IF NOT EXISTS booking_version_seq;
+
+    CREATE TABLE IF NOT EXISTS booking_versions (
+        court VARCHAR(50) NOT NULL,
+        booking_date DATE NOT NULL,
+        version BIGINT NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+        PRIMARY KEY (court, booking_date)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_booking_versions_date
+    ON booking_versions(booking_date, court);
+
+    CREATE OR REPLACE FUNCTION bump_booking_versions() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO booking_versions AS bv (court, booking_date, version)
+            SELECT k.court, k.booking_date, nextval('booking_version_seq')
+            FROM (SELECT DISTINCT court, booking_date FROM new_rows) AS k
+            ORDER BY k.court, k.booking_date
+            ON CONFLICT (court, booking_date) DO UPDATE
+            SET version = GREATEST(bv.version + 1, EXCLUDED.version),
+                updated_at = clock_timestamp();
+        ELSIF TG_OP = 'DELETE' THEN
+            INSERT INTO booking_versions AS bv (court, booking_date, version)
+            SELECT k.court, k.booking_date, nextval('booking_version_seq')
+            FROM (SELECT DISTINCT court, booking_date FROM old_rows) AS k
+            ORDER BY k.court, k.booking_date
+            ON CONFLICT (court, booking_date) DO UPDATE
+            SET version = GREATEST(bv.version + 1, EXCLUDED.version),
+                updated_at = clock_timestamp();
+        ELSE
+            -- A moved booking changes both its old and its new court-day
+            INSERT INTO booking_versions AS bv (court, booking_date, version)
+            SELECT k.court, k.booking_date, nextval('booking_version_seq')
+            FROM (
+                SELECT court, booking_date FROM new_rows
+                UNION
+                SELECT court, booking_date FROM old_rows
+            ) AS k
+            ORDER BY k.court, k.booking_date
+            ON CONFLICT (court, booking_date) DO UPDATE
+            SET version = GREATEST(bv.version + 1, EXCLUDED.version),
+                updated_at = clock_timestamp();
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS bookings_version_insert ON bookings;
+    CREATE TRIGGER bookings_version_insert
+        AFTER INSERT ON bookings REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_booking_versions();
+
+    DROP TRIGGER IF EXISTS bookings_version_update ON bookings;
+    CREATE TRIGGER bookings_version_update
+        AFTER UPDATE ON bookings REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_booking_versions();
+
+    DROP TRIGGER IF EXISTS bookings_version_delete ON bookings;
+    CREATE TRIGGER bookings_version_delete
+        AFTER DELETE ON bookings REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_booking_versions();
+"""
+
+# Fingerprint of every version row in a date range; courts=None covers every court
+RANGE_VERSION_SQL = """
+    SELECT
+        md5(COALESCE(
+            string_agg(court || '/' || booking_date || '/' || version, ','
+                ORDER BY court, booking_date),
+            ''
+        )) AS version,
+        MAX(updated_at) AS updated_at
+    FROM booking_versions
+    WHERE booking_date BETWEEN %(start)s AND %(end)s
+    AND (%(courts)s::text[] IS NULL OR court = ANY(%(courts)s))
+"""
+
+
+def make_etag(kind, version, *parts):
+    """Strong ETag for a response kind, data version and the request parameters"""
+    digest = hashlib.md5("|".join(str(p) for p in parts).encode()).hexdigest()[:12]
+    return f"{kind}-{version}-{digest}"
+
+
+def not_modified(etag, last_modified=None):
+    """A 304 response when the request's validators still match, otherwise None"""
+    if request.if_none_match:
+        matched = request.if_none_match.contains(etag)
+    elif request.if_modified_since and last_modified:
+        matched = last_modified.replace(microsecond=0) <= request.if_modified_since
+    else:
+        matched = False
+
+    if not matched:
+        return None
+    return with_validators(Response(status=304), etag, last_modified)
+
+
+def with_validators(response, etag, last_modified=None):
+    """Attach ETag/Last-Modified and make clients revalidate before reuse"""
+    response.set_etag(etag)
+    if last_modified and datetime.now(timezone.utc) - last_modified > LAST_MODIFIED_MARGIN:
+        response.last_modified = last_modified
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import select
+import threading
+
+import psycopg2
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "booking_changes"
+
+# Seconds of silence before the listener pings its connection
+POLL_INTERVAL = float(os.environ.get("CHANGE_FEED_POLL_INTERVAL", "30"))
+# Upper bound for the reconnect backoff
+MAX_BACKOFF = float(os.environ.get("CHANGE_FEED_MAX_BACKOFF", "30"))
+
+# Every committed write to bookings NOTIFYs listeners with the row's key facts.
+# Slot times and the customer's contact fields ride along (well under the 8000
+# byte payload limit) so clients and the customer index can be patched without
+# another read. Customer fields stay server-side; streams never forward them.
+# xid (the writing transaction) lets a reader tell whether a snapshot it took
+# already includes the change.
+SCHEMA_SQL = """
+    CREATE OR REPLACE FUNCTION booking_slot_times(slots JSONB) RETURNS JSON AS $$
+        SELECT COALESCE(json_agg(slot->>'time'), '[]'::json)
+        FROM jsonb_array_elements(
+            CASE WHEN jsonb_typeof(slots) = 'array' THEN slots ELSE '[]'::jsonb END
+        ) AS slot
+        WHERE slot ? 'time'
+    $$ LANGUAGE sql IMMUTABLE;
+
+    CREATE OR REPLACE FUNCTION notify_booking_change() RETURNS trigger AS $$
+    DECLARE
+        payload JSONB;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            payload := jsonb_build_object(
+                'op', TG_OP, 'id', OLD.id, 'court', OLD.court,
+                'date', OLD.booking_date, 'status', 'deleted',
+                'old_status', OLD.status,
+                'slots', booking_slot_times(OLD.selected_slots),
+                'phone', OLD.player_phone
+            );
+        ELSE
+            payload := jsonb_build_object(
+                'op', TG_OP, 'id', NEW.id, 'court', NEW.court,
+                'date', NEW.booking_date, 'status', NEW.status,
+                'slots', booking_slot_times(NEW.selected_slots),
+                'phone', NEW.player_phone, 'name', NEW.player_name,
+                'email', NEW.player_email
+            );
+            IF TG_OP = 'UPDATE' THEN
+                payload := payload || jsonb_build_object(
+                    'old_court', OLD.court, 'old_date', OLD.booking_date,
+                    'old_status', OLD.status,
+                    'old_slots', booking_slot_times(OLD.selected_slots),
+                    'old_phone', OLD.player_phone
+                );
+            END IF;
+        END IF;
+
+        payload := payload || jsonb_build_object('xid', txid_current());
+        PERFORM pg_notify('booking_changes', payload::text);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS bookings_notify_change ON bookings;
+    CREATE TRIGGER bookings_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON bookings
+        FOR EACH ROW EXECUTE FUNCTION notify_booking_change();
+"""
+
+
+class ChangeFeedListener:
+    """Background LISTEN loop that dispatches booking changes to callbacks.
+
+    One listener runs per worker process. Callbacks receive the decoded NOTIFY
+    payload; resync callbacks run after every (re)connect because changes made
+    while the listener was down were never delivered.
+    """
+
+    def __init__(self, channel=CHANNEL, poll_interval=POLL_INTERVAL):
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._callbacks = []
+        self._resync_callbacks = []
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+        self._stats = {
+            "notifications": 0,
+            "callback_errors": 0,
+            "connects": 0,
+            "disconnects": 0,
+            "resyncs": 0,
+            "last_error": None,
+        }
+
+    def register(self, callback):
+        """Call callback(change) for every booking change notification"""
+        self._callbacks.append(callback)
+
+    def register_resync(self, callback):
+        """Call callback() whenever missed notifications may have been lost"""
+        self._resync_callbacks.append(callback)
+
+    def start(self, config):
+        """Start the listener thread for this process (idempotent, fork-aware)"""
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._stop.clear()
+        self._listening.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(dict(config),), name="booking-change-feed", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_listening(self):
+        """True while LISTEN is active in this process"""
+        return self._pid == os.getpid() and self._listening.is_set()
+
+    def stats(self):
+        snapshot = dict(self._stats)
+        snapshot["listening"] = self.is_listening()
+        return snapshot
+
+    def _run(self, config):
+        backoff = 1
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**config)
+                conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {self.channel}")
+
+                self._stats["connects"] += 1
+                self._listening.set()
+                logger.info(f"Listening for booking changes on '{self.channel}'")
+                self._resync()
+                backoff = 1
+
+                while not self._stop.is_set():
+                    readable, _, _ = select.select([conn], [], [], self.poll_interval)
+                    if not readable:
+                        # Quiet period: make sure the connection is still alive
+                        cursor.execute("SELECT 1")
+                        continue
+
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+
+            except Exception as e:
+                self._stats["last_error"] = str(e)
+                logger.error(f"Booking change feed error: {e}")
+            finally:
+                if self._listening.is_set():
+                    self._stats["disconnects"] += 1
+                self._listening.clear()
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+            if self._stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, MAX_BACKOFF)
+
+    def _dispatch(self, payload):
+        try:
+            change = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.error(f"Ignoring malformed booking change payload: {payload[:200]}")
+            return
+
+        self._stats["notifications"] += 1
+        for callback in self._callbacks:
+            try:
+                callback(change)
+            except Exception as e:
+                self._stats["callback_errors"] += 1
+                logger.error(f"Booking change callback failed: {e}")
+
+    def _resync(self):
+        self._stats["resyncs"] += 1
+        for callback in self._resync_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                self._stats["callback_errors"] += 1
+                logger.error(f"Booking change resync failed: {e}")
+
+
+def event_type_for(change):
+    """Map a change notification to the event type used by booking streams"""
+    if change["op"] == "INSERT":
+        return "created"
+    if change["op"] == "DELETE":
+        return "deleted"
+    if change.get("old_status") != change.get("status"):
+        return {"confirmed": "confirmed", "cancelled": "cancelled"}.get(
+            change.get("status"), "updated"
+        )
+    return "updated"
+
+
+# One listener per worker process
+change_feed = ChangeFeedListener()
@@ -0,0 +1,438 @@
+import heapq
+import itertools
+import logging
+import os
+import re
+from operator import attrgetter
+import sys
+import threading
+import time
+
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor
+
+from db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+# Most customers held per process; the least recently booked are dropped first
+MAX_CUSTOMERS = int(os.environ.get("CUSTOMER_INDEX_MAX_CUSTOMERS", "100000"))
+# Rows fetched per round trip while rebuilding
+REBUILD_BATCH = 5000
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# Queries are matched through 3-character grams, so shorter ones match nothing
+MIN_QUERY_LENGTH = 3
+GRAM_SIZE = 3
+
+# Bookings in these states don't count as visits
+INACTIVE_STATUSES = ("cancelled", "declined")
+
+# One row per phone number (digits only). Newest customers first so the cap
+# keeps the ones most likely to be looked up.
+REBUILD_SQL = """
+    SELECT
+        phone_digits(player_phone) AS digits,
+        (array_agg(player_phone ORDER BY created_at DESC))[1] AS phone,
+        (array_agg(player_name ORDER BY created_at DESC))[1] AS name,
+        (array_agg(player_email ORDER BY created_at DESC)
+            FILTER (WHERE COALESCE(player_email, '') <> ''))[1] AS email,
+        max(booking_date) AS last_booking,
+        count(*) AS bookings,
+        count(*) FILTER (WHERE status NOT IN ('cancelled', 'declined')) AS visits
+    FROM bookings
+    WHERE phone_digits(player_phone) <> ''
+    GROUP BY 1
+    ORDER BY max(booking_date) DESC
+    LIMIT %s
+"""
+
+_RECENCY = attrgetter("last_booking", "visits")
+_NON_DIGITS = re.compile(r"\D")
+# Phone queries may carry formatting: "+92 300-12", "(0300) 123"
+_PHONE_QUERY = re.compile(r"^[\d\s+()-]+$")
+
+
+def phone_digits(phone):
+    """Same normalization as the phone_digits() SQL function"""
+    return _NON_DIGITS.sub("", phone or "")
+
+
+def search_name(name):
+    # Interned: thousands of customers share a handful of common names
+    return sys.intern(" ".join((name or "").lower().split()))
+
+
+def in_snapshot(xid, snapshot):
+    """Whether a txid_current_snapshot() text value sees transaction xid"""
+    xmin, xmax, running = snapshot.split(":")
+    if xid < int(xmin):
+        return True
+    return xid < int(xmax) and str(xid) not in running.split(",")
+
+
+def grams(text):
+    return {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class Customer:
+    __slots__ = ("digits", "phone", "name", "key", "email", "last_booking", "bookings", "visits")
+
+    def __init__(self, digits, phone, name, email, last_booking, bookings, visits):
+        self.digits = digits
+        self.phone = phone or digits
+        self.name = sys.intern(name or "")
+        self.key = search_name(name)
+        self.email = email
+        self.last_booking = last_booking or ""
+        self.bookings = bookings
+        self.visits = visits
+
+    def to_dict(self):
+        return {
+            "phone": self.phone,
+            "name": self.name,
+            "email": self.email,
+            "lastBooking": self.last_booking or None,
+            "visits": self.visits,
+            "bookings": self.bookings,
+        }
+
+
+class CustomerDirectory:
+    """Customers keyed by phone digits, with gram postings for phone and name.
+
+    Phone postings are plain lists (a customer's digits never change); removed
+    customers are skipped on lookup and compacted away in bulk. Name grams
+    point at distinct names, and each name at its customers, kept sorted by
+    recency (lazily, on the next lookup) so common names merge only the top
+    few. Not thread-safe; CustomerIndex serializes access.
+    """
+
+    def __init__(self):
+        self.customers = {}
+        self.phone_grams = {}
+        self.name_grams = {}
+        self.names = {}
+        self.unsorted = set()
+        self.stale = 0
+
+    def __len__(self):
+        return len(self.customers)
+
+    def add(self, customer):
+        self.customers[customer.digits] = customer
+        for gram in grams(customer.digits):
+            self.phone_grams.setdefault(gram, []).append(customer)
+        self._add_name(customer)
+
+    def remove(self, digits):
+        customer = self.customers.pop(digits, None)
+        if customer is None:
+            return
+        self._remove_name(customer)
+        self.stale += 1
+        if self.stale > max(len(self.customers) // 4, 1000):
+            self.compact()
+
+    def compact(self):
+        """Rebuild phone postings without removed customers"""
+        self.phone_grams = {}
+        for customer in self.customers.values():
+            for gram in grams(customer.digits):
+                self.phone_grams.setdefault(gram, []).append(customer)
+        self.stale = 0
+
+    def sort_names(self):
+        for key in self.unsorted:
+            self.names[key].sort(key=_RECENCY)
+        self.unsorted.clear()
+
+    def record(self, digits, phone, name, email, booking_date, bookings, visits):
+        """Apply one booking's contribution (or its removal, with negative counts)"""
+        if not digits:
+            return
+        customer = self.customers.get(digits)
+        if customer is None:
+            if bookings > 0:
+                self.add(Customer(digits, phone, name, email, booking_date, bookings, max(visits, 0)))
+            return
+
+        customer.bookings += bookings
+        customer.visits = max(customer.visits + visits, 0)
+        if customer.bookings <= 0:
+            self.remove(digits)
+            return
+
+        if phone:
+            customer.phone = phone
+        if email:
+            customer.email = email
+        if name and search_name(name) != customer.key:
+            self._remove_name(customer)
+            customer.name, customer.key = sys.intern(name), search_name(name)
+            self._add_name(customer)
+        # Removals can't move last_booking back without a rescan; it stays an upper bound
+        if booking_date and str(booking_date) > customer.last_booking:
+            customer.last_booking = str(booking_date)
+        self.unsorted.add(customer.key)
+
+    def evict(self, max_customers):
+        """Drop the least recently booked tenth once over the cap; returns how many"""
+        if len(self.customers) <= max_customers:
+            return 0
+        excess = len(self.customers) - max_customers + max_customers // 10
+        oldest = heapq.nsmallest(
+            excess, self.customers.values(), key=lambda c: c.last_booking
+        )
+        for customer in oldest:
+            del self.customers[customer.digits]
+            self._remove_name(customer)
+        self.compact()
+        return len(oldest)
+
+    def search(self, query, limit):
+        """Best matches for a phone fragment or a name fragment, most recent first"""
+        if _PHONE_QUERY.match(query):
+            needle = phone_digits(query)
+            if len(needle) < MIN_QUERY_LENGTH:
+                return []
+            candidates = self._candidates(self.phone_grams, needle)
+            live = self.customers
+            matches = (
+                c for c in candidates if needle in c.digits and live.get(c.digits) is c
+            )
+        else:
+            needle = search_name(query)
+            if len(needle) < MIN_QUERY_LENGTH:
+                return []
+            keys = [key for key in self._candidates(self.name_grams, needle) if needle in key]
+            for key in self.unsorted.intersection(keys):
+                self.names[key].sort(key=_RECENCY)
+                self.unsorted.discard(key)
+            newest_first = [reversed(self.names[key]) for key in keys]
+            return list(
+                itertools.islice(heapq.merge(*newest_first, key=_RECENCY, reverse=True), limit)
+            )
+        return heapq.nlargest(limit, matches, key=_RECENCY)
+
+    @staticmethod
+    def _candidates(postings, needle):
+        """Entries posted under every gram of needle (checking the rarest first)"""
+        lists = []
+        for gram in grams(needle):
+            matched = postings.get(gram)
+            if not matched:
+                return ()
+            lists.append(matched)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for matched in lists[1:]:
+            if len(candidates) <= 64:
+                break  # cheaper to confirm the substring directly
+            candidates.intersection_update(matched)
+        return candidates
+
+    def _add_name(self, customer):
+        customers = self.names.get(customer.key)
+        if customers is None:
+            customers = self.names[customer.key] = []
+            for gram in grams(customer.key):
+                self.name_grams.setdefault(gram, set()).add(customer.key)
+        customers.append(customer)
+        self.unsorted.add(customer.key)
+
+    def _remove_name(self, customer):
+        customers = self.names.get(customer.key)
+        if customers is None:
+            return
+        customers.remove(customer)
+        if not customers:
+            del self.names[customer.key]
+            self.unsorted.discard(customer.key)
+            for gram in grams(customer.key):
+                keys = self.name_grams.get(gram)
+                if keys is not None:
+                    keys.discard(customer.key)
+                    if not keys:
+                        del self.name_grams[gram]
+
+
+class CustomerIndex:
+    """In-memory customer directory for admin typeahead.
+
+    Built from bookings by streaming one aggregated row per phone number, then
+    kept current from booking change notifications. Each worker holds its own
+    copy, capped at max_customers.
+    """
+
+    def __init__(self, max_customers=MAX_CUSTOMERS):
+        self.max_customers = max_customers
+        self._directory = CustomerDirectory()
+        self._lock = threading.Lock()
+        self._database_config = None
+        self._ready = False
+        # Changes that arrive mid-rebuild, replayed onto the new directory
+        self._pending = None
+        self._stats = {
+            "rebuilds": 0,
+            "rebuild_failures": 0,
+            "last_rebuild_ms": None,
+            "changes": 0,
+            "evictions": 0,
+            "queries": 0,
+        }
+
+    @property
+    def ready(self):
+        return self._ready
+
+    def configure(self, database_config):
+        """Connection settings for rebuilds"""
+        self._database_config = database_config
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Matching customers as dicts; empty until the first rebuild finishes"""
+        limit = max(1, min(limit or DEFAULT_LIMIT, MAX_LIMIT))
+        with self._lock:
+            self._stats["queries"] += 1
+            return [c.to_dict() for c in self._directory.search(query.strip(), limit)]
+
+    def apply_change(self, change):
+        """Change feed callback: fold one booking write into the directory"""
+        with self._lock:
+            self._stats["changes"] += 1
+            self._apply(self._directory, change)
+            if self._pending is not None:
+                self._pending.append(change)
+            self._stats["evictions"] += self._directory.evict(self.max_customers)
+
+    def schedule_rebuild(self):
+        """Rebuild on a background thread (change feed resync callback)"""
+        threading.Thread(target=self.rebuild, name="customer-index-rebuild", daemon=True).start()
+
+    def rebuild(self):
+        """Reload every customer from bookings; True on success"""
+        if self._database_config is None:
+            return False
+        with self._lock:
+            if self._pending is not None:
+                return False  # one already running
+            self._pending = []
+
+        started = time.perf_counter()
+        directory = CustomerDirectory()
+        try:
+            with get_pool(self._database_config).connection() as conn:
+                # Repeatable read: the snapshot recorded here is the one the
+                # rebuild query reads, so pending changes can be checked against it
+                conn.set_isolation_level(extensions.ISOLATION_LEVEL_REPEATABLE_READ)
+                # Named cursor: rows arrive REBUILD_BATCH at a time, not all at once
+                cursor = conn.cursor(name="customer_index_rebuild", cursor_factory=RealDictCursor)
+                cursor.itersize = REBUILD_BATCH
+                try:
+                    snapshot_cursor = conn.cursor()
+                    snapshot_cursor.execute("SELECT txid_current_snapshot()::text")
+                    snapshot = snapshot_cursor.fetchone()[0]
+                    snapshot_cursor.close()
+                    cursor.execute(REBUILD_SQL, (self.max_customers,))
+                    for row in cursor:
+                        directory.add(
+                            Customer(
+                                row["digits"],
+                                row["phone"],
+                                row["name"],
+                                row["email"],
+                                str(row["last_booking"]),
+                                row["bookings"],
+                                row["visits"],
+                            )
+                        )
+                finally:
+                    cursor.close()
+                    conn.rollback()
+                    conn.set_isolation_level(extensions.ISOLATION_LEVEL_READ_COMMITTED)
+            directory.sort_names()
+        except Exception as e:
+            logger.error("Customer index rebuild failed: %s", e)
+            with self._lock:
+                self._pending = None
+                self._stats["rebuild_failures"] += 1
+            return False
+
+        with self._lock:
+            # Replay only what the snapshot missed; changes notified during the
+            # rebuild may have committed before it started
+            for change in self._pending:
+                if change.get("xid") is None or not in_snapshot(change["xid"], snapshot):
+                    self._apply(directory, change)
+            directory.evict(self.max_customers)
+            self._directory = directory
+            self._pending = None
+            self._ready = True
+            self._stats["rebuilds"] += 1
+            self._stats["last_rebuild_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        logger.info(
+            "Customer index rebuilt: %d customers in %.0f ms",
+            len(directory),
+            self._stats["last_rebuild_ms"],
+        )
+        return True
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["customers"] = len(self._directory)
+            snapshot["names"] = len(self._directory.names)
+            snapshot["stale"] = self._directory.stale
+        snapshot["ready"] = self._ready
+        snapshot["max_customers"] = self.max_customers
+        return snapshot
+
+    @staticmethod
+    def _apply(directory, change):
+        op = change["op"]
+        if op == "INSERT":
+            directory.record(
+                phone_digits(change.get("phone")),
+                change.get("phone"),
+                change.get("name"),
+                change.get("email"),
+                change.get("date"),
+                1,
+                int(change.get("status") not in INACTIVE_STATUSES),
+            )
+        elif op == "DELETE":
+            directory.record(
+                phone_digits(change.get("phone")),
+                None,
+                None,
+                None,
+                None,
+                -1,
+                -int(change.get("old_status") not in INACTIVE_STATUSES),
+            )
+        else:
+            was_active = int(change.get("old_status") not in INACTIVE_STATUSES)
+            is_active = int(change.get("status") not in INACTIVE_STATUSES)
+            old_digits = phone_digits(change.get("old_phone"))
+            new_digits = phone_digits(change.get("phone"))
+            if old_digits != new_digits:
+                directory.record(old_digits, None, None, None, None, -1, -was_active)
+                bookings, visits = 1, is_active
+            else:
+                bookings, visits = 0, is_active - was_active
+            directory.record(
+                new_digits,
+                change.get("phone"),
+                change.get("name"),
+                change.get("email"),
+                change.get("date"),
+                bookings,
+                visits,
+            )
+
+
+# One directory per worker process, shared by the admin endpoints
+customer_index = CustomerIndex()
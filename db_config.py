@@ -0,0 +1,10 @@
+# Database configuration, shared by the web app, the notification worker and
+# the maintenance scripts so none of them has to import app (and build the
+# Flask app, its logging and its routes) just to connect.
+DATABASE_CONFIG = {
+    "host": "localhost",
+    "database": "noball_sports",
+    "user": "postgres",
+    "password": "admin@123",
+    "port": "5432",
+}
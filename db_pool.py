@@ -0,0 +1,314 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration (overridable through the environment)
+POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "2"))
+POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "20"))
+POOL_WAIT_TIMEOUT = float(os.environ.get("DB_POOL_WAIT_TIMEOUT", "5"))
+POOL_MAX_LIFETIME = float(os.environ.get("DB_POOL_MAX_LIFETIME", "1800"))
+POOL_HEALTH_CHECK_AFTER = float(os.environ.get("DB_POOL_HEALTH_CHECK_AFTER", "30"))
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the wait timeout"""
+
+
+class _PooledConnection:
+    """Bookkeeping for a single physical connection"""
+
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """Thread-safe PostgreSQL connection pool with health checks and metrics"""
+
+    def __init__(
+        self,
+        config,
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        wait_timeout=POOL_WAIT_TIMEOUT,
+        max_lifetime=POOL_MAX_LIFETIME,
+        health_check_after=POOL_HEALTH_CHECK_AFTER,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self.config = dict(config)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.wait_timeout = wait_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+
+        self._cond = threading.Condition()
+        self._reset_state()
+
+    def _reset_state(self):
+        """Forget every connection (used on creation and after a fork)"""
+        self._pid = os.getpid()
+        self._idle = []
+        self._checked_out = {}
+        self._size = 0
+        self._waiting = 0
+        self._warmed = False
+        self._stats = {
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "connect_errors": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "lifetime_recycles": 0,
+        }
+
+    def getconn(self):
+        """Check a connection out of the pool, opening one if allowed"""
+        self._check_fork()
+        self._warm()
+
+        started = time.monotonic()
+        deadline = started + self.wait_timeout
+        waited = False
+
+        while True:
+            pooled = None
+            with self._cond:
+                while True:
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        # Reserve the slot now, connect outside the lock
+                        self._size += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        self._record_wait(time.monotonic() - started)
+                        raise PoolTimeoutError(
+                            f"No database connection available after {self.wait_timeout}s "
+                            f"(pool size {self.max_size})"
+                        )
+                    waited = True
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+            if pooled is None:
+                pooled = self._open_reserved()
+            elif not self._is_usable(pooled):
+                self._discard(pooled)
+                continue
+
+            with self._cond:
+                self._checked_out[id(pooled.conn)] = pooled
+                self._stats["checkouts"] += 1
+                if waited:
+                    self._stats["waits"] += 1
+                    self._record_wait(time.monotonic() - started)
+            return pooled.conn
+
+    def putconn(self, conn, discard=False):
+        """Return a connection to the pool"""
+        with self._cond:
+            pooled = self._checked_out.pop(id(conn), None)
+
+        if pooled is None:
+            # Not ours (e.g. opened before a fork); just close it
+            self._close_quietly(conn)
+            return
+
+        if not discard and not conn.closed:
+            try:
+                status = conn.get_transaction_status()
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    discard = True
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception as e:
+                logger.warning(f"Discarding connection that failed reset: {e}")
+                discard = True
+
+        if discard or conn.closed or self._expired(pooled):
+            if not discard and not conn.closed:
+                self._bump("lifetime_recycles")
+            self._discard(pooled)
+            return
+
+        pooled.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and always returns it"""
+        conn = self.getconn()
+        try:
+            yield conn
+        except Exception:
+            self.putconn(conn, discard=conn.closed != 0)
+            raise
+        else:
+            self.putconn(conn)
+
+    def closeall(self):
+        """Close every idle connection; checked-out ones close on return"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self):
+        """Snapshot of pool metrics"""
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot.update(
+                {
+                    "size": self._size,
+                    "idle": len(self._idle),
+                    "in_use": len(self._checked_out),
+                    "waiting": self._waiting,
+                    "min_size": self.min_size,
+                    "max_size": self.max_size,
+                }
+            )
+        snapshot["wait_time_avg"] = (
+            snapshot["wait_time_total"] / snapshot["waits"] if snapshot["waits"] else 0.0
+        )
+        return snapshot
+
+    # Internal helpers
+    def _check_fork(self):
+        """Drop inherited connections when running in a forked worker"""
+        if self._pid != os.getpid():
+            with self._cond:
+                if self._pid != os.getpid():
+                    logger.info("Process fork detected, resetting connection pool")
+                    self._reset_state()
+
+    def _warm(self):
+        """Open min_size connections the first time the pool is used"""
+        if self._warmed:
+            return
+        with self._cond:
+            if self._warmed:
+                return
+            self._warmed = True
+            missing = max(0, self.min_size - self._size)
+            self._size += missing
+
+        for opened in range(missing):
+            try:
+                pooled = self._open_reserved()
+            except Exception as e:
+                # Give back the unused reservations; the pool stays lazy
+                logger.error(f"Connection pool warm-up failed: {e}")
+                with self._cond:
+                    self._size -= missing - opened - 1
+                    self._cond.notify_all()
+                break
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    def _open_reserved(self):
+        """Open a physical connection for a slot already counted in _size"""
+        try:
+            conn = psycopg2.connect(**self.config)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._stats["connect_errors"] += 1
+                self._cond.notify()
+            raise
+
+        self._bump("connections_opened")
+        return _PooledConnection(conn)
+
+    def _expired(self, pooled):
+        return (
+            self.max_lifetime > 0
+            and time.monotonic() - pooled.created_at >= self.max_lifetime
+        )
+
+    def _is_usable(self, pooled):
+        """Health check an idle connection before handing it out"""
+        if pooled.conn.closed:
+            return False
+        if self._expired(pooled):
+            self._bump("lifetime_recycles")
+            return False
+        if time.monotonic() - pooled.last_used < self.health_check_after:
+            return True
+
+        try:
+            cursor = pooled.conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            pooled.conn.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled connection failed health check: {e}")
+            self._bump("health_check_failures")
+            return False
+
+    def _discard(self, pooled):
+        self._close_quietly(pooled.conn)
+        with self._cond:
+            self._size -= 1
+            self._stats["connections_closed"] += 1
+            self._cond.notify()
+
+    def _bump(self, counter):
+        with self._cond:
+            self._stats[counter] += 1
+
+    def _record_wait(self, elapsed):
+        self._stats["wait_time_total"] += elapsed
+        self._stats["wait_time_max"] = max(self._stats["wait_time_max"], elapsed)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(config):
+    """Return the process-wide pool for a database configuration"""
+    key = tuple(sorted(config.items()))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(config)
+                _pools[key] = pool
+    return pool
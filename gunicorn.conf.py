@@ -0,0 +1,52 @@
+# gunicorn.conf.py
+# Production server settings: gunicorn -c gunicorn.conf.py app:app
+#
+# gevent workers run each request on a greenlet, so hundreds of idle
+# /api/booking-events streams cost a few KB each instead of a thread apiece.
+# GUNICORN_WORKER_CLASS=gthread is only for debugging: every open stream then
+# holds one of the worker's GUNICORN_THREADS until the browser goes away.
+#
+# Set PROMETHEUS_MULTIPROC_DIR (an empty, writable directory) so /metrics
+# aggregates all workers rather than whichever one answers the scrape.
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5001")
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gevent")
+threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))
+# Event streams stay open; heartbeats keep them well inside this limit
+timeout = 60
+
+
+def post_fork(server, worker):
+    """Make psycopg2 cooperate with gevent instead of blocking the worker"""
+    if worker_class != "gevent":
+        return
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
+
+
+def post_worker_init(worker):
+    """Listen for booking changes so this worker's cache follows the others' writes"""
+    from app import start_change_feed
+
+    start_change_feed()
+
+
+def on_starting(server):
+    """Start metrics from zero: drop files left by a previous master"""
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for name in os.listdir(metrics_dir):
+            os.remove(os.path.join(metrics_dir, name))
+
+
+def child_exit(server, worker):
+    """Stop counting a dead worker's live gauges in /metrics"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
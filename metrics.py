@@ -0,0 +1,179 @@
+import logging
+import os
+import time
+
+from flask import Response, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from db_config import DATABASE_CONFIG
+from db_pool import get_pool
+from slow_queries import slow_query_log
+
+logger = logging.getLogger(__name__)
+
+# Under gunicorn set PROMETHEUS_MULTIPROC_DIR so /metrics sums every worker
+# (see gunicorn.conf.py); without it each process reports only itself.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Labels only take values from small fixed sets: Flask endpoint names (not
+# URLs), known methods and status codes.
+KNOWN_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ["endpoint", "method", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to build the response (streams are timed until their first byte)",
+    ["endpoint", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent in execute_query per request, including pool acquire",
+    ["endpoint"],
+    buckets=DB_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "execute_query calls per request",
+    ["endpoint"],
+    buckets=COUNT_BUCKETS,
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "execute_query calls", ["manager", "outcome"]
+)
+DB_QUERY_TIME = Histogram(
+    "db_query_duration_seconds",
+    "Query execution and fetch time, excluding pool acquire",
+    ["manager"],
+    buckets=DB_BUCKETS,
+)
+DB_ACQUIRE_TIME = Histogram(
+    "db_pool_acquire_seconds",
+    "Time waiting for a pooled connection",
+    ["manager"],
+    buckets=DB_BUCKETS,
+)
+
+# Pool state is sampled from get_pool().stats() after every request and on
+# each scrape. Under PROMETHEUS_MULTIPROC_DIR the gauges add up the live
+# workers, each as of the end of its latest request.
+POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled connections by state",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+POOL_WAITING = Gauge(
+    "db_pool_waiting",
+    "Threads waiting for a pooled connection",
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections handed out by the pool")
+
+_pool_checkouts_seen = 0
+
+
+class QueryTimer:
+    """Times one execute_query call; shared by DatabaseManager and AdminDatabaseManager"""
+
+    def __init__(self, manager, query=None, params=None):
+        self.manager = manager
+        self.query = query
+        self.params = params
+        self.failed = False
+        self.started = time.perf_counter()
+        self.connected_at = None
+
+    def connected(self):
+        """Call once the pool has handed over a connection (or failed to)"""
+        self.connected_at = time.perf_counter()
+        DB_ACQUIRE_TIME.labels(self.manager).observe(self.connected_at - self.started)
+
+    def finish(self):
+        finished = time.perf_counter()
+        if self.connected_at is None:
+            self.connected()
+        DB_QUERY_TIME.labels(self.manager).observe(finished - self.connected_at)
+        DB_QUERIES.labels(self.manager, "error" if self.failed else "ok").inc()
+        if slow_query_log.enabled:
+            slow_query_log.observe(
+                self.query, self.params, (finished - self.connected_at) * 1000
+            )
+
+        if has_request_context():
+            g.db_seconds = g.get("db_seconds", 0.0) + finished - self.started
+            g.db_queries = g.get("db_queries", 0) + 1
+
+
+def init_metrics(app):
+    """Record count, latency and DB time for every request, blueprints included"""
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        _record(response.status_code)
+        return response
+
+    @app.teardown_request
+    def record_failed_request(error):
+        # after_request is skipped when a view raises
+        if error is not None:
+            _record(500)
+
+
+def record_pool_stats():
+    """Copy this process's pool stats into the pool gauges"""
+    global _pool_checkouts_seen
+
+    stats = get_pool(DATABASE_CONFIG).stats()
+    POOL_CONNECTIONS.labels("in_use").set(stats["in_use"])
+    POOL_CONNECTIONS.labels("idle").set(stats["idle"])
+    POOL_WAITING.set(stats["waiting"])
+    # The pool's own counter restarts after a fork
+    if stats["checkouts"] < _pool_checkouts_seen:
+        _pool_checkouts_seen = 0
+    POOL_CHECKOUTS.inc(stats["checkouts"] - _pool_checkouts_seen)
+    _pool_checkouts_seen = stats["checkouts"]
+
+
+def metrics_response():
+    """Current metrics in Prometheus text format"""
+    record_pool_stats()
+    registry = REGISTRY
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def _record(status):
+    started = g.pop("request_started", None)
+    if started is None:
+        return
+
+    endpoint = request.endpoint or "unmatched"
+    method = request.method if request.method in KNOWN_METHODS else "OTHER"
+
+    REQUESTS.labels(endpoint, method, str(status)).inc()
+    REQUEST_LATENCY.labels(endpoint, method).observe(time.perf_counter() - started)
+    REQUEST_DB_TIME.labels(endpoint).observe(g.get("db_seconds", 0.0))
+    REQUEST_QUERIES.labels(endpoint).observe(g.get("db_queries", 0))
+    record_pool_stats()
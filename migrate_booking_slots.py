@@ -0,0 +1,107 @@
+# migrate_booking_slots.py
+"""Backfill booking_slots claims from the selected_slots JSONB column.
+
+Run once after upgrading; re-running is safe because bookings that already
+hold claims are skipped:
+
+    python migrate_booking_slots.py --batch-size 1000
+"""
+import argparse
+import logging
+
+from psycopg2.extras import RealDictCursor
+
+from booking_slots import (
+    BACKFILL_BATCH_SQL,
+    MULTI_PURPOSE_COURTS,
+    SCHEMA_SQL,
+    SURFACE_UPSERT_SQL,
+)
+from db_config import DATABASE_CONFIG
+from db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+# Active bookings whose legacy slots overlap another booking's claims
+LEGACY_CONFLICTS_SQL = """
+    SELECT b.id, b.court, b.booking_date,
+        COUNT(DISTINCT (slot->>'time')::time) AS expected_slots,
+        (SELECT COUNT(*) FROM booking_slots bs WHERE bs.booking_id = b.id) AS claimed_slots
+    FROM bookings b
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(b.selected_slots) = 'array'
+            THEN b.selected_slots ELSE '[]'::jsonb END
+    ) AS slot
+    WHERE b.status IN ('confirmed', 'pending_payment')
+    AND slot ? 'time'
+    GROUP BY b.id, b.court, b.booking_date
+    HAVING COUNT(DISTINCT (slot->>'time')::time)
+        > (SELECT COUNT(*) FROM booking_slots bs WHERE bs.booking_id = b.id)
+    ORDER BY b.booking_date, b.court
+"""
+
+
+def migrate_booking_slots(batch_size=1000):
+    """Create the claims schema and backfill it in id-ordered batches"""
+    pool = get_pool(DATABASE_CONFIG)
+
+    with pool.connection() as conn:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+        cursor.execute(SCHEMA_SQL)
+        for court, surface in MULTI_PURPOSE_COURTS.items():
+            cursor.execute(SURFACE_UPSERT_SQL, (court, surface))
+        conn.commit()
+
+        last_id = ""
+        bookings_seen = 0
+        claims_inserted = 0
+
+        while True:
+            cursor.execute(
+                """
+                SELECT id FROM bookings
+                WHERE id > %s AND status IN ('confirmed', 'pending_payment')
+                ORDER BY id
+                LIMIT %s
+                """,
+                (last_id, batch_size),
+            )
+            ids = [row["id"] for row in cursor.fetchall()]
+            if not ids:
+                break
+
+            cursor.execute(BACKFILL_BATCH_SQL, (ids,))
+            claims_inserted += cursor.rowcount
+            conn.commit()
+
+            bookings_seen += len(ids)
+            last_id = ids[-1]
+            logger.info(
+                f"Processed {bookings_seen} bookings, {claims_inserted} claims inserted"
+            )
+
+        cursor.execute(LEGACY_CONFLICTS_SQL)
+        conflicts = cursor.fetchall()
+        conn.commit()
+
+    return bookings_seen, claims_inserted, conflicts
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Backfill booking_slots claims")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    seen, inserted, conflicts = migrate_booking_slots(args.batch_size)
+
+    print(f"✅ Checked {seen} active bookings, inserted {inserted} slot claims")
+    if conflicts:
+        print(f"\n⚠️ {len(conflicts)} bookings overlap existing claims (legacy double bookings):")
+        for row in conflicts:
+            print(
+                f"   {row['id']} {row['court']} {row['booking_date']}: "
+                f"{row['claimed_slots']}/{row['expected_slots']} slots claimed"
+            )
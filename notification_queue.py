@@ -0,0 +1,159 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bulk notification types and the booking status each one targets
+JOB_TYPES = {
+    "pending_payment_reminder": "pending_payment",
+    "booking_confirmation": "confirmed",
+}
+
+# Durable outbox for customer notifications. Request handlers only INSERT rows;
+# notification_worker.py claims due jobs with SKIP LOCKED, so any number of
+# workers can drain the queue without blocking on or double-sending each other.
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS notification_jobs (
+        id BIGSERIAL PRIMARY KEY,
+        kind VARCHAR(50) NOT NULL,
+        channel VARCHAR(10) NOT NULL,
+        recipient VARCHAR(120) NOT NULL,
+        booking_id VARCHAR(50),
+        payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+        dedupe_key VARCHAR(200) UNIQUE,
+        status VARCHAR(20) NOT NULL DEFAULT 'queued',
+        attempts SMALLINT NOT NULL DEFAULT 0,
+        max_attempts SMALLINT NOT NULL DEFAULT 5,
+        run_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        locked_at TIMESTAMPTZ,
+        locked_by VARCHAR(100),
+        last_error TEXT,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        sent_at TIMESTAMPTZ
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_notification_jobs_due
+    ON notification_jobs(run_at, id) WHERE status = 'queued';
+
+    CREATE INDEX IF NOT EXISTS idx_notification_jobs_sending
+    ON notification_jobs(locked_at) WHERE status = 'sending';
+
+    CREATE INDEX IF NOT EXISTS idx_notification_jobs_sent
+    ON notification_jobs(sent_at) WHERE status = 'sent';
+"""
+
+# One job per contact channel for every upcoming booking in a status. The
+# dedupe key makes a second click on the same day a no-op.
+ENQUEUE_FOR_STATUS_SQL = """
+    INSERT INTO notification_jobs (kind, channel, recipient, booking_id, payload, dedupe_key)
+    SELECT
+        %(kind)s, c.channel, c.recipient, b.id,
+        jsonb_build_object(
+            'playerName', b.player_name,
+            'sport', b.sport,
+            'courtName', b.court_name,
+            'date', b.booking_date,
+            'startTime', to_char(b.start_time, 'HH24:MI'),
+            'amount', b.total_amount
+        ),
+        %(kind)s || ':' || b.id || ':' || c.channel || ':' || CURRENT_DATE
+    FROM bookings b
+    CROSS JOIN LATERAL (
+        VALUES ('sms', b.player_phone), ('email', b.player_email)
+    ) AS c(channel, recipient)
+    WHERE b.status = %(status)s
+    AND b.booking_date >= CURRENT_DATE
+    AND COALESCE(c.recipient, '') <> ''
+    ON CONFLICT (dedupe_key) DO NOTHING
+"""
+
+CLAIM_BATCH_SQL = """
+    UPDATE notification_jobs j
+    SET status = 'sending', locked_at = now(), locked_by = %s, attempts = j.attempts + 1
+    FROM (
+        SELECT id FROM notification_jobs
+        WHERE status = 'queued' AND run_at <= now()
+        ORDER BY run_at, id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ) AS due
+    WHERE j.id = due.id
+    RETURNING j.id, j.kind, j.channel, j.recipient, j.booking_id, j.payload,
+        j.attempts, j.run_at
+"""
+
+MARK_SENT_SQL = """
+    UPDATE notification_jobs
+    SET status = 'sent', sent_at = now(), locked_at = NULL, locked_by = NULL,
+        last_error = NULL
+    WHERE id = ANY(%s)
+"""
+
+# Failed sends retry with exponential backoff until max_attempts is reached
+MARK_FAILED_SQL = """
+    UPDATE notification_jobs j
+    SET status = CASE WHEN j.attempts >= j.max_attempts THEN 'failed' ELSE 'queued' END,
+        run_at = now() + make_interval(
+            secs => LEAST(%s * power(2, j.attempts - 1), %s)
+        ),
+        locked_at = NULL, locked_by = NULL, last_error = f.error
+    FROM unnest(%s::bigint[], %s::text[]) AS f(id, error)
+    WHERE j.id = f.id
+"""
+
+# Jobs a crashed worker left in 'sending'. The claim already counted the
+# attempt, so a job that keeps killing its worker stops at max_attempts.
+REQUEUE_STALE_SQL = """
+    UPDATE notification_jobs
+    SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+        locked_at = NULL, locked_by = NULL,
+        last_error = CASE WHEN attempts >= max_attempts
+            THEN 'Abandoned mid-send by a crashed worker' ELSE last_error END
+    WHERE status = 'sending' AND locked_at < now() - make_interval(secs => %s)
+    RETURNING status
+"""
+
+PRUNE_SENT_SQL = """
+    DELETE FROM notification_jobs
+    WHERE status = 'sent' AND sent_at < now() - make_interval(days => %s)
+"""
+
+METRICS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM notification_jobs WHERE status = 'queued') AS queued,
+        (SELECT COUNT(*) FROM notification_jobs
+            WHERE status = 'queued' AND run_at <= now()) AS due,
+        (SELECT COUNT(*) FROM notification_jobs WHERE status = 'sending') AS sending,
+        (SELECT COUNT(*) FROM notification_jobs WHERE status = 'failed') AS failed,
+        (SELECT COUNT(*) FROM notification_jobs
+            WHERE status = 'sent' AND sent_at >= now() - interval '5 minutes') AS sent_last_5m,
+        (SELECT EXTRACT(EPOCH FROM now() - MIN(run_at)) FROM notification_jobs
+            WHERE status = 'queued' AND run_at <= now()) AS lag_seconds
+"""
+
+
+def render_message(job):
+    """Subject and body text for a claimed job"""
+    payload = job["payload"] or {}
+    name = payload.get("playerName") or "there"
+    details = (
+        f"{(payload.get('sport') or '').title()} at {payload.get('courtName')} "
+        f"on {payload.get('date')} at {payload.get('startTime')}"
+    )
+
+    if job["kind"] == "pending_payment_reminder":
+        subject = f"Payment pending for booking {job['booking_id']}"
+        body = (
+            f"Hi {name}, your booking {job['booking_id']} ({details}) is awaiting "
+            f"payment of PKR {payload.get('amount')}. Please complete payment to "
+            "keep your slot. - NoBall Sports Club"
+        )
+    elif job["kind"] == "booking_confirmation":
+        subject = f"Booking {job['booking_id']} confirmed"
+        body = (
+            f"Hi {name}, your booking {job['booking_id']} ({details}) is confirmed. "
+            "See you on court! - NoBall Sports Club"
+        )
+    else:
+        raise ValueError(f"Unknown notification kind: {job['kind']}")
+
+    return subject, body
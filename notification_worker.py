@@ -0,0 +1,263 @@
+# notification_worker.py
+"""Deliver queued customer notifications (see notification_queue.py).
+
+Run one or more alongside the web workers; SKIP LOCKED keeps them from
+claiming the same jobs:
+
+    python notification_worker.py --batch-size 100 --email-concurrency 4 --sms-concurrency 8
+
+Email goes over SMTP (NOTIFY_SMTP_HOST/PORT/USER/PASSWORD/FROM) and SMS is
+POSTed as JSON to an HTTP gateway (NOTIFY_SMS_URL). For local testing point
+both at the stand-in from benchmarks/notification_sink.py.
+"""
+import argparse
+import json
+import logging
+import os
+import smtplib
+import socket
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+
+from psycopg2.extras import RealDictCursor
+
+from db_config import DATABASE_CONFIG
+from db_pool import get_pool
+from notification_queue import (
+    CLAIM_BATCH_SQL,
+    MARK_FAILED_SQL,
+    MARK_SENT_SQL,
+    METRICS_SQL,
+    PRUNE_SENT_SQL,
+    REQUEUE_STALE_SQL,
+    render_message,
+)
+
+logger = logging.getLogger(__name__)
+
+SMTP_HOST = os.environ.get("NOTIFY_SMTP_HOST", "localhost")
+SMTP_PORT = int(os.environ.get("NOTIFY_SMTP_PORT", "1025"))
+SMTP_USER = os.environ.get("NOTIFY_SMTP_USER")
+SMTP_PASSWORD = os.environ.get("NOTIFY_SMTP_PASSWORD")
+SMTP_FROM = os.environ.get("NOTIFY_SMTP_FROM", "bookings@noballsports.local")
+SMTP_STARTTLS = os.environ.get("NOTIFY_SMTP_STARTTLS", "0") == "1"
+SMS_URL = os.environ.get("NOTIFY_SMS_URL", "http://localhost:8025/sms")
+
+SEND_TIMEOUT = 10
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+STALE_AFTER_SECONDS = 300
+PRUNE_AFTER_DAYS = 30
+
+
+class SmtpSender:
+    """Send email over one SMTP connection per thread, reused across jobs"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _connection(self):
+        server = getattr(self._local, "server", None)
+        if server is None:
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SEND_TIMEOUT)
+            try:
+                if SMTP_STARTTLS:
+                    server.starttls()
+                if SMTP_USER:
+                    server.login(SMTP_USER, SMTP_PASSWORD)
+            except Exception:
+                # Don't leak the half-set-up socket; the next send starts over
+                server.close()
+                raise
+            self._local.server = server
+        return server
+
+    def _drop(self):
+        """Forget and close this thread's connection so the next send reconnects"""
+        server = getattr(self._local, "server", None)
+        self._local.server = None
+        if server is not None:
+            server.close()
+
+    def send(self, recipient, subject, body):
+        message = EmailMessage()
+        message["From"] = SMTP_FROM
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(body)
+
+        # Connect and login errors propagate as they are, to be retried later
+        server = self._connection()
+        try:
+            server.send_message(message)
+        except smtplib.SMTPResponseException:
+            # The server refused this message; the connection is still usable
+            try:
+                server.rset()
+            except OSError:
+                self._drop()
+            raise
+        except OSError:
+            # Drop the broken connection so the next send opens a fresh one
+            self._drop()
+            raise
+
+
+class HttpSmsSender:
+    """POST {to, message} to an SMS gateway"""
+
+    def send(self, recipient, subject, body):
+        request = urllib.request.Request(
+            SMS_URL,
+            data=json.dumps({"to": recipient, "message": body}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=SEND_TIMEOUT) as response:
+            if response.status >= 300:
+                raise RuntimeError(f"SMS gateway returned {response.status}")
+
+
+class NotificationWorker:
+    """Claim due jobs in batches and send them with per-channel concurrency limits"""
+
+    def __init__(self, batch_size=100, email_concurrency=4, sms_concurrency=8):
+        self.batch_size = batch_size
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.senders = {"email": SmtpSender(), "sms": HttpSmsSender()}
+        self.limits = {
+            "email": threading.BoundedSemaphore(email_concurrency),
+            "sms": threading.BoundedSemaphore(sms_concurrency),
+        }
+        self.executor = ThreadPoolExecutor(max_workers=email_concurrency + sms_concurrency)
+        self.pool = get_pool(DATABASE_CONFIG)
+        self.totals = {"sent": 0, "failed": 0, "started": time.monotonic()}
+
+    def _execute(self, query, params=(), fetch=False):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(query, params)
+            result = cursor.fetchall() if fetch else cursor.rowcount
+            conn.commit()
+            return result
+
+    def _send(self, job):
+        """Send one job; returns None on success or the error message"""
+        sender = self.senders.get(job["channel"])
+        if sender is None:
+            return f"Unknown channel: {job['channel']}"
+        try:
+            subject, body = render_message(job)
+            with self.limits[job["channel"]]:
+                sender.send(job["recipient"], subject, body)
+            return None
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+
+    def run_batch(self):
+        """Claim and deliver one batch; returns the number of jobs claimed"""
+        jobs = self._execute(CLAIM_BATCH_SQL, (self.worker_id, self.batch_size), fetch=True)
+        if not jobs:
+            return 0
+
+        started = time.perf_counter()
+        results = list(self.executor.map(self._send, jobs))
+
+        sent = [job["id"] for job, error in zip(jobs, results) if error is None]
+        failed = [(job["id"], error) for job, error in zip(jobs, results) if error]
+
+        if sent:
+            self._execute(MARK_SENT_SQL, (sent,))
+        if failed:
+            self._execute(
+                MARK_FAILED_SQL,
+                (
+                    RETRY_BASE_SECONDS,
+                    RETRY_MAX_SECONDS,
+                    [job_id for job_id, _ in failed],
+                    [error[:500] for _, error in failed],
+                ),
+            )
+            logger.warning(f"{len(failed)} notifications failed, e.g. {failed[0][1]}")
+
+        elapsed = time.perf_counter() - started
+        oldest = min(job["run_at"] for job in jobs)
+        lag = max(time.time() - oldest.timestamp(), 0)
+        self.totals["sent"] += len(sent)
+        self.totals["failed"] += len(failed)
+        logger.info(
+            f"Batch of {len(jobs)}: {len(sent)} sent, {len(failed)} failed in "
+            f"{elapsed:.2f}s ({len(jobs) / elapsed if elapsed else 0:.0f}/s), "
+            f"oldest job waited {lag:.1f}s"
+        )
+        return len(jobs)
+
+    def housekeeping(self):
+        stale = self._execute(REQUEUE_STALE_SQL, (STALE_AFTER_SECONDS,), fetch=True)
+        requeued = sum(1 for job in stale if job["status"] == "queued")
+        if requeued:
+            logger.warning(f"Requeued {requeued} jobs abandoned mid-send")
+        if len(stale) > requeued:
+            logger.warning(
+                f"Failed {len(stale) - requeued} abandoned jobs out of attempts"
+            )
+        self._execute(PRUNE_SENT_SQL, (PRUNE_AFTER_DAYS,))
+
+    def run(self, poll_interval=5, once=False):
+        """Drain due jobs, then poll; with once=True stop when nothing is due"""
+        self.housekeeping()
+        last_housekeeping = time.monotonic()
+
+        while True:
+            try:
+                claimed = self.run_batch()
+            except Exception as e:
+                logger.error(f"Notification batch error: {e}")
+                claimed = 0
+
+            if time.monotonic() - last_housekeeping > STALE_AFTER_SECONDS:
+                self.housekeeping()
+                last_housekeeping = time.monotonic()
+
+            if claimed:
+                continue
+            if once:
+                break
+            time.sleep(poll_interval)
+
+        self.report()
+
+    def report(self):
+        elapsed = time.monotonic() - self.totals["started"]
+        metrics = self._execute(METRICS_SQL, fetch=True)[0]
+        logger.info(
+            f"Worker {self.worker_id}: {self.totals['sent']} sent, "
+            f"{self.totals['failed']} failed in {elapsed:.1f}s "
+            f"({self.totals['sent'] / elapsed if elapsed else 0:.1f}/s); "
+            f"queue: {dict(metrics)}"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Deliver queued notifications")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--email-concurrency", type=int, default=4)
+    parser.add_argument("--sms-concurrency", type=int, default=8)
+    parser.add_argument("--poll-interval", type=float, default=5)
+    parser.add_argument(
+        "--once", action="store_true", help="Exit once no jobs are due"
+    )
+    args = parser.parse_args()
+
+    worker = NotificationWorker(
+        args.batch_size, args.email_concurrency, args.sms_concurrency
+    )
+    try:
+        worker.run(args.poll_interval, args.once)
+    except KeyboardInterrupt:
+        worker.report()
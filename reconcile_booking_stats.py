@@ -0,0 +1,79 @@
+# reconcile_booking_stats.py
+"""Recompute booking_stats from the bookings table and report drift.
+
+The check runs in a repeatable-read snapshot with writers briefly blocked, so
+counters and bookings are compared at the same instant:
+
+    python reconcile_booking_stats.py          # report only
+    python reconcile_booking_stats.py --fix    # also rewrite the counters
+"""
+import argparse
+import logging
+
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor
+
+from db_config import DATABASE_CONFIG
+from booking_stats import RECOMPUTE_SQL, REBUILD_SQL, SCHEMA_SQL, STAT_COLUMNS
+from db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_booking_stats(fix=False):
+    """Compare stored counters with a fresh aggregate; returns the drifted rows"""
+    pool = get_pool(DATABASE_CONFIG)
+
+    with pool.connection() as conn:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor.execute(SCHEMA_SQL)
+        conn.commit()
+
+        conn.set_isolation_level(extensions.ISOLATION_LEVEL_REPEATABLE_READ)
+        try:
+            cursor.execute("LOCK TABLE bookings IN SHARE MODE")
+            cursor.execute(RECOMPUTE_SQL)
+            expected = {(r["scope"], r["scope_key"]): r for r in cursor.fetchall()}
+            cursor.execute("SELECT * FROM booking_stats")
+            stored = {(r["scope"], r["scope_key"]): r for r in cursor.fetchall()}
+            conn.commit()
+        finally:
+            conn.set_isolation_level(extensions.ISOLATION_LEVEL_READ_COMMITTED)
+
+        drift = []
+        for key in sorted(set(expected) | set(stored)):
+            want = expected.get(key, {})
+            have = stored.get(key, {})
+            deltas = {
+                column: have.get(column, 0) - want.get(column, 0)
+                for column in STAT_COLUMNS
+                if have.get(column, 0) != want.get(column, 0)
+            }
+            if deltas:
+                drift.append({"scope": key[0], "scope_key": key[1], "deltas": deltas})
+
+        if drift and fix:
+            cursor.execute(REBUILD_SQL)
+            conn.commit()
+            logger.info("booking_stats rebuilt from bookings")
+
+    return len(expected), drift
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile booking_stats counters")
+    parser.add_argument(
+        "--fix", action="store_true", help="Rewrite the counters when drift is found"
+    )
+    args = parser.parse_args()
+
+    checked, drift = reconcile_booking_stats(args.fix)
+
+    if not drift:
+        print(f"✅ All {checked} booking_stats counters match the bookings table")
+    else:
+        print(f"⚠️ {len(drift)} of {checked} counters drifted (stored - actual):")
+        for row in drift:
+            deltas = ", ".join(f"{k} {v:+d}" for k, v in row["deltas"].items())
+            print(f"   {row['scope']}:{row['scope_key'] or '-'} {deltas}")
+        print("✅ Counters rebuilt" if args.fix else "Run with --fix to rebuild them")
@@ -0,0 +1,136 @@
+import json
+import logging
+from datetime import time as dt_time, timedelta
+
+logger = logging.getLogger(__name__)
+
+# The 30-minute booking grid used by booking.js and _create_time_slots:
+# 06:00 through 23:30, then 00:00 through 05:30 (after midnight, same booking date)
+SLOT_TIMES = [f"{hour:02d}:{minute:02d}" for hour in range(6, 24) for minute in (0, 30)]
+SLOT_TIMES += [f"{hour:02d}:{minute:02d}" for hour in range(0, 6) for minute in (0, 30)]
+
+SLOTS_PER_DAY = len(SLOT_TIMES)
+FULL_DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+
+SLOT_INDEX = {slot_time: index for index, slot_time in enumerate(SLOT_TIMES)}
+
+# Bits in "HH:MM" string order, which is how booked slot lists are returned
+_SLOTS_BY_TIME = sorted((slot_time, 1 << index) for slot_time, index in SLOT_INDEX.items())
+
+
+def normalize_slot_time(value):
+    """Normalize '8:00', '08:00:00' or a time object to 'HH:MM'; None if unparseable"""
+    if isinstance(value, dt_time):
+        return value.strftime("%H:%M")
+    if not isinstance(value, str):
+        return None
+
+    parts = value.strip().split(":")
+    if len(parts) < 2:
+        return None
+    try:
+        hour, minute = int(parts[0]), int(parts[1].split(".")[0])
+    except ValueError:
+        return None
+    return f"{hour:02d}:{minute:02d}"
+
+
+def grid_now(now):
+    """(booking date, index of the running slot) for a datetime on the grid.
+
+    Before 06:00 the clock is in the previous booking date's overnight tail.
+    """
+    index = SLOT_INDEX[f"{now.hour:02d}:{30 if now.minute >= 30 else 0:02d}"]
+    return (now - timedelta(hours=6)).date(), index
+
+
+def slot_bit(slot_time):
+    """Get the grid bit for a slot time, or 0 if it is not on the grid"""
+    index = SLOT_INDEX.get(slot_time)
+    if index is None:
+        index = SLOT_INDEX.get(normalize_slot_time(slot_time))
+    return 0 if index is None else 1 << index
+
+
+def slots_to_mask(slot_times):
+    """Build an occupancy mask from an iterable of slot times"""
+    mask = 0
+    for slot_time in slot_times:
+        bit = slot_bit(slot_time)
+        if not bit:
+            logger.warning(f"Ignoring slot time off the 30-minute grid: {slot_time!r}")
+        mask |= bit
+    return mask
+
+
+def selected_slots_to_mask(selected_slots):
+    """Build a mask from a selected_slots value ([{'time', 'index'}], maybe JSON text)"""
+    if isinstance(selected_slots, str):
+        try:
+            selected_slots = json.loads(selected_slots)
+        except json.JSONDecodeError:
+            logger.error(f"Invalid selected_slots JSON: {selected_slots[:100]!r}")
+            return 0
+    if not selected_slots:
+        return 0
+
+    return slots_to_mask(
+        slot["time"]
+        for slot in selected_slots
+        if isinstance(slot, dict) and "time" in slot
+    )
+
+
+def mask_to_slots(mask):
+    """List the slot times set in a mask, sorted as 'HH:MM' strings"""
+    return [slot_time for slot_time, bit in _SLOTS_BY_TIME if mask & bit]
+
+
+def conflicting_slots(slot_times, booked_mask):
+    """Requested slot times that are taken in booked_mask, in request order"""
+    return [slot_time for slot_time in slot_times if slot_bit(slot_time) & booked_mask]
+
+
+def sibling_courts(court_id, multi_purpose_courts):
+    """Other courts sharing a multi-purpose surface with court_id"""
+    surface = multi_purpose_courts.get(court_id)
+    if surface is None:
+        return []
+    return [k for k, v in multi_purpose_courts.items() if v == surface and k != court_id]
+
+
+def window_mask(time_from=None, time_to=None):
+    """Mask of grid slots starting at or after time_from and ending by time_to.
+
+    Times follow grid order, so a window such as 22:00-02:00 spans midnight.
+    """
+    start = SLOT_INDEX.get(normalize_slot_time(time_from)) if time_from else 0
+    if start is None:
+        raise ValueError(f"Time not on the 30-minute grid: {time_from!r}")
+
+    if not time_to or normalize_slot_time(time_to) == SLOT_TIMES[0]:
+        end = SLOTS_PER_DAY
+    else:
+        end = SLOT_INDEX.get(normalize_slot_time(time_to))
+        if end is None:
+            raise ValueError(f"Time not on the 30-minute grid: {time_to!r}")
+    if end <= start:
+        raise ValueError("Time window must end after it starts")
+
+    return ((1 << end) - 1) & ~((1 << start) - 1)
+
+
+def free_run_starts(booked_mask, slots_needed, allowed_mask=FULL_DAY_MASK):
+    """Grid indices where slots_needed consecutive allowed slots are all free"""
+    free = ~booked_mask & allowed_mask & FULL_DAY_MASK
+    runs = free
+    # Bit i survives only if bits i..i+slots_needed-1 are all free
+    for shift in range(1, slots_needed):
+        runs &= free >> shift
+
+    starts = []
+    while runs:
+        low = runs & -runs
+        starts.append(low.bit_length() - 1)
+        runs ^= low
+    return starts
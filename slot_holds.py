@@ -0,0 +1,134 @@
+import os
+import uuid
+
+from booking_versions import RANGE_VERSION_SQL
+from slot_bitmap import SLOT_INDEX, normalize_slot_time
+
+# Seconds a customer has to finish checkout; the booking page extends the hold
+# while it stays open, so this only needs to outlast a closed tab
+HOLD_TTL_SECONDS = int(os.environ.get("SLOT_HOLD_TTL", "600"))
+
+# Expired holds removed per sweep; every new hold runs one
+SWEEP_BATCH = 200
+
+# Holds are booking_slots rows without a booking_id, so the no-double-booking
+# constraint treats a live hold exactly like a booking. Expired rows stay until
+# a write needs their slots or a sweep reaches them; reads skip them.
+
+# The oldest expired holds, found through idx_booking_slots_hold_expiry. The
+# batch is collected once and deleted by ctid, so the plan stays a TID scan
+# however stale the estimates for this fast-churning subset are; concurrent
+# sweeps skip each other's rows instead of queueing behind them.
+SWEEP_SQL = """
+    DELETE FROM booking_slots
+    WHERE ctid = ANY(ARRAY(
+        SELECT ctid FROM booking_slots
+        WHERE booking_id IS NULL AND expires_at <= now()
+        ORDER BY expires_at
+        LIMIT %(sweep_limit)s
+        FOR UPDATE SKIP LOCKED
+    ))
+    AND booking_id IS NULL AND expires_at <= now()
+"""
+
+# Replaces whatever the token held before, so changing the selection is one
+# call. The WHERE reads every CTE, so their deletes finish before the first
+# row is inserted; an unreferenced CTE would only run after the INSERT.
+HOLD_SQL = f"""
+    WITH replaced AS (
+        DELETE FROM booking_slots
+        WHERE hold_token = %(token)s AND booking_id IS NULL
+        RETURNING 1
+    ),
+    expired AS (
+        DELETE FROM booking_slots
+        WHERE surface = %(surface)s AND booking_date = %(date)s
+        AND booking_id IS NULL AND expires_at <= now()
+        RETURNING 1
+    ),
+    swept AS ({SWEEP_SQL} RETURNING 1)
+    INSERT INTO booking_slots (
+        court, surface, booking_date, slot_start, slot_index, hold_token, expires_at
+    )
+    SELECT
+        %(court)s, %(surface)s, %(date)s, s.slot_start::time, s.slot_index,
+        %(token)s, now() + make_interval(secs => %(ttl)s)
+    FROM unnest(%(slots)s::text[], %(indexes)s::smallint[]) AS s(slot_start, slot_index)
+    WHERE (SELECT count(*) FROM replaced) + (SELECT count(*) FROM expired)
+        + (SELECT count(*) FROM swept) >= 0
+    RETURNING expires_at
+"""
+
+EXTEND_SQL = """
+    UPDATE booking_slots SET expires_at = now() + make_interval(secs => %(ttl)s)
+    WHERE hold_token = %(token)s AND booking_id IS NULL AND expires_at > now()
+    RETURNING expires_at
+"""
+
+RELEASE_SQL = """
+    DELETE FROM booking_slots
+    WHERE hold_token = %(token)s AND booking_id IS NULL
+"""
+
+# Prefix for the create-booking INSERT: the slot trigger fires once the whole
+# statement has run, so the customer's own hold is gone before the claim
+CONSUME_HOLD_SQL = """
+    WITH consumed AS (
+        DELETE FROM booking_slots WHERE hold_token = %s AND booking_id IS NULL
+    )
+"""
+
+# Live holds on a surface-day as a slot bitmap, leaving out the caller's own
+HELD_MASK_SQL = """
+    SELECT COALESCE(bit_or(1::bigint << slot_index), 0) AS held_mask
+    FROM booking_slots
+    WHERE surface = %(surface)s AND booking_date = %(date)s
+    AND booking_id IS NULL AND expires_at > now()
+    AND hold_token IS DISTINCT FROM %(token)s
+"""
+
+# HELD_MASK_SQL for many surfaces over a date range, one row per held day
+HELD_MASKS_SQL = """
+    SELECT surface, booking_date, bit_or(1::bigint << slot_index) AS held_mask
+    FROM booking_slots
+    WHERE surface = ANY(%(surfaces)s) AND booking_date BETWEEN %(start)s AND %(end)s
+    AND booking_id IS NULL AND expires_at > now()
+    AND hold_token IS DISTINCT FROM %(token)s
+    GROUP BY surface, booking_date
+"""
+
+# Booked and held slots on a surface-day, leaving out the caller's own hold
+SLOT_MASKS_SQL = """
+    SELECT
+        COALESCE(bit_or(1::bigint << slot_index)
+            FILTER (WHERE booking_id IS NOT NULL), 0) AS booked_mask,
+        COALESCE(bit_or(1::bigint << slot_index)
+            FILTER (WHERE booking_id IS NULL AND expires_at > now()
+                AND hold_token IS DISTINCT FROM %(token)s), 0) AS held_mask
+    FROM booking_slots
+    WHERE surface = %(surface)s AND booking_date = %(date)s
+"""
+
+# Version row and slot masks in one round trip for /api/booked-slots. One
+# statement sees one snapshot, so the body always matches its ETag; the
+# availability cache may lag a commit and is not used here.
+SLOTS_VERSION_SQL = f"""
+    SELECT v.version, v.updated_at, m.booked_mask, m.held_mask
+    FROM ({RANGE_VERSION_SQL}) AS v
+    CROSS JOIN ({SLOT_MASKS_SQL}) AS m
+"""
+
+
+def new_hold_token():
+    return uuid.uuid4().hex
+
+
+def hold_slot_indexes(slot_times):
+    """Sorted (times, grid indexes) for a hold request; raises ValueError"""
+    if not slot_times:
+        raise ValueError("Select at least one time slot to hold")
+    times = {normalize_slot_time(t) for t in slot_times}
+    if any(t not in SLOT_INDEX for t in times):
+        raise ValueError("Invalid time slot")
+    times = sorted(times, key=SLOT_INDEX.get)
+    return times, [SLOT_INDEX[t] for t in times]
@@ -0,0 +1,201 @@
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+
+from db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: log statements slower than SLOW_QUERY_MS (unset = off)
+SLOW_QUERY_MS = os.environ.get("SLOW_QUERY_MS")
+# SLOW_QUERY_EXPLAIN=1 also captures EXPLAIN (ANALYZE, BUFFERS) for the
+# SLOW_QUERY_TOP_N fingerprints with the most total slow time
+SLOW_QUERY_EXPLAIN = os.environ.get("SLOW_QUERY_EXPLAIN", "0") == "1"
+SLOW_QUERY_TOP_N = int(os.environ.get("SLOW_QUERY_TOP_N", "10"))
+# A captured plan is refreshed after this many seconds
+PLAN_MAX_AGE = float(os.environ.get("SLOW_QUERY_PLAN_MAX_AGE", "600"))
+# EXPLAIN ANALYZE re-runs the query; never let it run longer than this
+EXPLAIN_TIMEOUT_MS = int(os.environ.get("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "5000"))
+MAX_FINGERPRINTS = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+# Only plain reads are re-executed for EXPLAIN ANALYZE
+_READ_ONLY = re.compile(r"^(SELECT|WITH)\b", re.IGNORECASE)
+_WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|FOR UPDATE|FOR SHARE|NEXTVAL)\b", re.IGNORECASE)
+
+
+def normalize_sql(query):
+    """Query text with literals and placeholders replaced by ?, one line"""
+    if isinstance(query, bytes):
+        query = query.decode(errors="replace")
+    sql = _STRING_LITERAL.sub("?", str(query))
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _VALUE_LIST.sub("(?, ...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.md5(normalized.encode()).hexdigest()[:12]
+
+
+def redact_params(params):
+    """Parameter shapes without values: types, list lengths and dict keys"""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: _shape(value) for key, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [_shape(value) for value in params]
+    return _shape(params)
+
+
+def _shape(value):
+    if isinstance(value, (list, tuple, set)):
+        return f"<{type(value).__name__}[{len(value)}]>"
+    return f"<{type(value).__name__}>"
+
+
+class SlowQueryLog:
+    """Per-fingerprint stats for statements over the threshold, with plans
+    for the worst offenders captured on a background thread."""
+
+    def __init__(self, threshold_ms=None, explain=False, top_n=10):
+        self.threshold_ms = float(threshold_ms) if threshold_ms else None
+        self.explain = explain
+        self.top_n = top_n
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._database_config = None
+        self._explain_queue = queue.Queue(maxsize=top_n)
+        self._explain_thread = None
+
+    @property
+    def enabled(self):
+        return self.threshold_ms is not None
+
+    def configure(self, database_config):
+        """Connection settings for EXPLAIN; plans are skipped until this is set"""
+        self._database_config = database_config
+
+    def observe(self, query, params, elapsed_ms):
+        """Called by QueryTimer after every execute_query"""
+        if self.threshold_ms is None or elapsed_ms < self.threshold_ms:
+            return
+
+        normalized = normalize_sql(query)
+        key = fingerprint(normalized)
+        logger.warning(
+            "Slow query %.1f ms [%s]: %s params=%s",
+            elapsed_ms,
+            key,
+            normalized,
+            redact_params(params),
+        )
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= MAX_FINGERPRINTS:
+                    # Forget the fingerprint that has cost the least so far
+                    del self._entries[min(self._entries, key=lambda k: self._entries[k]["total_ms"])]
+                entry = self._entries[key] = {
+                    "fingerprint": key,
+                    "sql": normalized,
+                    "params": redact_params(params),
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "last_seen": None,
+                    "plan": None,
+                    "plan_ms": None,
+                    "plan_captured_at": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["last_seen"] = datetime.now().isoformat(timespec="seconds")
+
+            wants_plan = self._wants_plan(key, entry, query)
+            if wants_plan:
+                entry["plan_captured_at"] = time.time()  # claimed; refreshed on capture
+
+        if wants_plan:
+            self._queue_explain(key, query, params)
+
+    def top(self, n=None):
+        """The n fingerprints with the most total slow time, worst first"""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e["total_ms"], reverse=True)
+            return [dict(entry) for entry in entries[: n or self.top_n]]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _wants_plan(self, key, entry, query):
+        if not self.explain or self._database_config is None:
+            return False
+        if not isinstance(query, str) or not _READ_ONLY.match(query.strip()):
+            return False
+        if ";" in query.strip().rstrip(";") or _WRITES.search(query):
+            return False
+        captured = entry["plan_captured_at"]
+        if captured is not None and time.time() - captured < PLAN_MAX_AGE:
+            return False
+        ranked = sorted(self._entries, key=lambda k: self._entries[k]["total_ms"], reverse=True)
+        return key in ranked[: self.top_n]
+
+    def _queue_explain(self, key, query, params):
+        if self._explain_thread is None or not self._explain_thread.is_alive():
+            self._explain_thread = threading.Thread(
+                target=self._explain_loop, name="slow-query-explain", daemon=True
+            )
+            self._explain_thread.start()
+        try:
+            self._explain_queue.put_nowait((key, query, params))
+        except queue.Full:
+            with self._lock:
+                if key in self._entries:
+                    self._entries[key]["plan_captured_at"] = None
+
+    def _explain_loop(self):
+        while True:
+            key, query, params = self._explain_queue.get()
+            plan, plan_ms = self._run_explain(query, params)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry["plan"] = plan
+                    entry["plan_ms"] = plan_ms
+                    entry["plan_captured_at"] = time.time()
+
+    def _run_explain(self, query, params):
+        """EXPLAIN ANALYZE in a read-only transaction that is always rolled back"""
+        try:
+            with get_pool(self._database_config).connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("SET TRANSACTION READ ONLY")
+                    cursor.execute(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+                    started = time.perf_counter()
+                    cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + query, params or ())
+                    plan = "\n".join(row[0] for row in cursor.fetchall())
+                    return plan, round((time.perf_counter() - started) * 1000, 1)
+                finally:
+                    conn.rollback()
+        except Exception as e:
+            logger.error("EXPLAIN failed for slow query: %s", e)
+            return f"EXPLAIN failed: {e}", None
+
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_MS, SLOW_QUERY_EXPLAIN, SLOW_QUERY_TOP_N)
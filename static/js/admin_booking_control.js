@@ -51,6 +51,13 @@ class AdminBookingControl {
       input.max = maxDate.toISOString().split("T")[0];
     });
 
+    // A series can run for a whole season, past the 90-day booking window
+    const repeatUntil = document.getElementById("create-repeat-until");
+    if (repeatUntil) {
+      repeatUntil.value = "";
+      repeatUntil.removeAttribute("max");
+    }
+
     this.setupCourtDropdowns();
   }
 
@@ -103,6 +110,12 @@ class AdminBookingControl {
     this.addEventListener("name-input", "keypress", (e) => {
       if (e.key === "Enter") this.searchBookingByName();
     });
+    this.addEventListener("phone-input", "input", () =>
+      this.suggestCustomers("phone-input", "phone-suggestions", "phone")
+    );
+    this.addEventListener("name-input", "input", () =>
+      this.suggestCustomers("name-input", "name-suggestions", "name")
+    );
 
     // Bulk operations
     const bulkDateFrom = document.getElementById("bulk-date-from");
@@ -299,6 +312,12 @@ class AdminBookingControl {
         }
       }
 
+      const repeat = this.getElementValue("create-repeat");
+      if (repeat) {
+        await this.createSeries(bookingData, repeat, event.target);
+        return;
+      }
+
       this.showLoadingToast("Creating booking...");
 
       const response = await fetch("/admin/api/admin-create-booking", {
@@ -324,6 +343,52 @@ class AdminBookingControl {
     }
   }
 
+  async createSeries(bookingData, repeat, form) {
+    const until = this.getElementValue("create-repeat-until");
+    if (!until) {
+      this.showErrorToast("Please choose a repeat until date");
+      return;
+    }
+
+    const [frequency, interval] = repeat.split(":");
+    const skipConflicts = document.getElementById("create-skip-conflicts")?.checked;
+
+    this.showLoadingToast("Creating booking series...");
+
+    const response = await fetch("/admin/api/admin-create-series", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        booking: bookingData,
+        recurrence: { frequency, interval: Number(interval), until },
+        skipConflicts,
+      }),
+    });
+    const result = await response.json();
+    if (!result.success) {
+      throw new Error(result.message || "Failed to create booking series");
+    }
+
+    const conflictDates = result.conflicts.map((c) => c.date).join(", ");
+    if (result.created.length === 0) {
+      this.showErrorToast(
+        result.conflicts.length
+          ? `Nothing created, already booked on: ${conflictDates}`
+          : "No dates in this repeat range"
+      );
+      return;
+    }
+
+    const message = `Created ${result.created.length} of ${result.occurrences} bookings (series ${result.seriesId})`;
+    if (result.conflicts.length) {
+      this.showToast(`${message}; skipped ${conflictDates}`, "warning", 8000);
+    } else {
+      this.showSuccessToast(message);
+    }
+    form.reset();
+    this.calculateAmount();
+  }
+
   // Search Functions
   switchSearchMethod(method) {
     console.log(`🔍 Switching to search method: ${method}`);
@@ -353,6 +418,39 @@ class AdminBookingControl {
     await this.performSearch("id", id);
   }
 
+  suggestCustomers(inputId, listId, field) {
+    // Debounced typeahead from the in-memory customer index
+    clearTimeout(this.suggestTimer);
+    this.suggestTimer = setTimeout(async () => {
+      const query = this.getElementValue(inputId).trim();
+      const list = document.getElementById(listId);
+      if (!list) return;
+      if (query.length < 3) {
+        list.innerHTML = "";
+        return;
+      }
+
+      try {
+        const params = new URLSearchParams({ q: query });
+        const response = await fetch(`/admin/api/customers/typeahead?${params}`);
+        const result = await response.json();
+        if (!result.success || query !== this.getElementValue(inputId).trim()) return;
+
+        list.innerHTML = "";
+        result.customers.forEach((customer) => {
+          const option = document.createElement("option");
+          option.value = customer[field];
+          option.label = `${field === "phone" ? customer.name : customer.phone} · ${
+            customer.visits
+          } visits · last ${customer.lastBooking || "-"}`;
+          list.appendChild(option);
+        });
+      } catch (error) {
+        console.error("Customer typeahead failed:", error);
+      }
+    }, 120);
+  }
+
   async searchBookingByPhone() {
     const phone = this.getElementValue("phone-input").trim();
     if (!phone) {
@@ -390,7 +488,13 @@ class AdminBookingControl {
     await this.performSearch("date", null, startDate, endDate);
   }
 
-  async performSearch(method, value, startDate = null, endDate = null) {
+  async performSearch(
+    method,
+    value,
+    startDate = null,
+    endDate = null,
+    cursor = null
+  ) {
     try {
       this.showLoadingToast("Searching...");
 
@@ -402,6 +506,8 @@ class AdminBookingControl {
       } else {
         searchData.value = value;
       }
+      // Results come in capped pages; the cursor asks for the next one
+      if (cursor) searchData.cursor = cursor;
 
       console.log("🔍 Performing search:", searchData);
 
@@ -415,7 +521,12 @@ class AdminBookingControl {
 
       if (result.success) {
         console.log(`✅ Search completed: ${result.bookings.length} results`);
-        this.displaySearchResults(result.bookings);
+        this.lastSearch = { method, value, startDate, endDate };
+        this.displaySearchResults(
+          result.bookings,
+          Boolean(cursor),
+          result.nextCursor
+        );
         this.hideLoadingToast();
       } else {
         throw new Error(result.message || "Search failed");
@@ -426,7 +537,7 @@ class AdminBookingControl {
     }
   }
 
-  displaySearchResults(bookings) {
+  displaySearchResults(bookings, append = false, nextCursor = null) {
     const resultsContainer = document.getElementById("results-container");
     const searchResults = document.getElementById("search-results");
 
@@ -435,7 +546,14 @@ class AdminBookingControl {
       return;
     }
 
-    if (bookings.length === 0) {
+    document.getElementById("load-more-results")?.remove();
+
+    if (append) {
+      resultsContainer.insertAdjacentHTML(
+        "beforeend",
+        bookings.map((booking) => this.createResultItem(booking)).join("")
+      );
+    } else if (bookings.length === 0) {
       resultsContainer.innerHTML = `
                 <div style="text-align: center; padding: 2rem; color: #6c757d;">
                     <i class="fas fa-search" style="font-size: 3rem; margin-bottom: 1rem; opacity: 0.5;"></i>
@@ -448,6 +566,18 @@ class AdminBookingControl {
         .join("");
     }
 
+    if (nextCursor) {
+      const loadMore = document.createElement("button");
+      loadMore.id = "load-more-results";
+      loadMore.className = "result-action-btn load-more-btn";
+      loadMore.innerHTML = '<i class="fas fa-chevron-down"></i> Load more results';
+      loadMore.addEventListener("click", () => {
+        const { method, value, startDate, endDate } = this.lastSearch;
+        this.performSearch(method, value, startDate, endDate, nextCursor);
+      });
+      resultsContainer.insertAdjacentElement("afterend", loadMore);
+    }
+
     searchResults.style.display = "block";
   }
 
@@ -668,8 +798,10 @@ class AdminBookingControl {
 
       const result = await response.json();
 
-      if (result.success && result.bookings.length > 0) {
-        const booking = result.bookings[0];
+      // The id search matches prefixes, so pick the exact booking
+      const booking =
+        result.success && result.bookings.find((b) => b.id === bookingId);
+      if (booking) {
         this.populateEditForm(booking);
 
         const modal = document.getElementById("edit-booking-modal-overlay");
@@ -776,6 +908,162 @@ class AdminBookingControl {
     }
   }
 
+  // Bulk Operations
+  getBulkFilter() {
+    return {
+      status: this.getElementValue("bulk-status"),
+      sport: this.getElementValue("bulk-sport"),
+      startDate: this.getElementValue("bulk-date-from"),
+      endDate: this.getElementValue("bulk-date-to"),
+    };
+  }
+
+  async loadBulkBookings() {
+    try {
+      const response = await fetch("/admin/api/bulk-bookings", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(this.getBulkFilter()),
+      });
+      const result = await response.json();
+      if (!result.success) {
+        throw new Error(result.message || "Failed to load bookings");
+      }
+
+      this.selectedBookings.clear();
+      this.renderBulkBookings(result.bookings, result.hasMore);
+    } catch (error) {
+      console.error("❌ Load bulk bookings error:", error);
+      this.showErrorToast("Failed to load bookings: " + error.message);
+    }
+  }
+
+  renderBulkBookings(bookings, hasMore) {
+    const container = document.getElementById("bulk-results");
+    if (!container) return;
+
+    if (bookings.length === 0) {
+      container.innerHTML = `
+                <div style="text-align: center; padding: 2rem; color: #6c757d;">
+                    <p>No bookings match these filters.</p>
+                </div>
+            `;
+      this.updateBulkSelection();
+      return;
+    }
+
+    container.innerHTML = `
+            <table class="bulk-table">
+                <thead>
+                    <tr>
+                        <th><input type="checkbox" class="bulk-checkbox" id="bulk-select-all"></th>
+                        <th>Booking</th>
+                        <th>Player</th>
+                        <th>Court</th>
+                        <th>Date</th>
+                        <th>Time</th>
+                        <th>Status</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    ${bookings
+                      .map(
+                        (b) => `
+                        <tr data-booking-id="${b.id}">
+                            <td><input type="checkbox" class="bulk-checkbox bulk-row" value="${b.id}"></td>
+                            <td>${b.id}</td>
+                            <td>${b.playerName}<br><small>${b.playerPhone}</small></td>
+                            <td>${b.courtName}</td>
+                            <td>${b.date}</td>
+                            <td>${b.startTime} - ${b.endTime}</td>
+                            <td class="bulk-status">${b.status}</td>
+                        </tr>`
+                      )
+                      .join("")}
+                </tbody>
+            </table>
+            ${
+              hasMore
+                ? `<p style="color: #6c757d; margin-top: 1rem;">Showing the first ${bookings.length} bookings; narrow the filters to see the rest.</p>`
+                : ""
+            }
+        `;
+
+    container.querySelectorAll(".bulk-row").forEach((checkbox) => {
+      checkbox.addEventListener("change", () => {
+        if (checkbox.checked) this.selectedBookings.add(checkbox.value);
+        else this.selectedBookings.delete(checkbox.value);
+        this.updateBulkSelection();
+      });
+    });
+
+    const selectAll = document.getElementById("bulk-select-all");
+    selectAll.addEventListener("change", () => {
+      container.querySelectorAll(".bulk-row").forEach((checkbox) => {
+        checkbox.checked = selectAll.checked;
+        if (selectAll.checked) this.selectedBookings.add(checkbox.value);
+        else this.selectedBookings.delete(checkbox.value);
+      });
+      this.updateBulkSelection();
+    });
+
+    this.updateBulkSelection();
+  }
+
+  updateBulkSelection() {
+    const count = document.getElementById("selected-count");
+    const actions = document.getElementById("bulk-actions");
+    if (count) count.textContent = this.selectedBookings.size;
+    if (actions)
+      actions.style.display = this.selectedBookings.size > 0 ? "block" : "none";
+  }
+
+  bulkAction(action) {
+    const count = this.selectedBookings.size;
+    if (count === 0) {
+      this.showErrorToast("Select at least one booking");
+      return;
+    }
+
+    this.showConfirmationModal(
+      `${action.charAt(0).toUpperCase() + action.slice(1)} Bookings`,
+      `Are you sure you want to ${action} ${count} booking(s)?` +
+        (action === "delete" ? " This action cannot be undone." : ""),
+      () => this.performBulkAction(action)
+    );
+  }
+
+  async performBulkAction(action) {
+    try {
+      this.showLoadingToast(`Applying ${action} to ${this.selectedBookings.size} booking(s)...`);
+
+      const response = await fetch("/admin/api/bulk-booking-action", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          action,
+          bookingIds: Array.from(this.selectedBookings),
+        }),
+      });
+      const result = await response.json();
+      if (!result.success) {
+        throw new Error(result.message || `Failed to ${action} bookings`);
+      }
+
+      const { done, skipped, not_found: notFound } = result.counts;
+      const message = `${done} booking(s) updated` +
+        (skipped ? `, ${skipped} skipped (status doesn't allow ${action})` : "") +
+        (notFound ? `, ${notFound} not found` : "");
+      if (skipped || notFound) this.showToast(message, "warning", 5000);
+      else this.showSuccessToast(message);
+
+      await this.loadBulkBookings();
+    } catch (error) {
+      console.error(`❌ Bulk ${action} error:`, error);
+      this.showErrorToast(`Failed to ${action} bookings: ` + error.message);
+    }
+  }
+
   // Confirmation Modal
   showConfirmationModal(title, message, onConfirm) {
     const titleEl = document.getElementById("confirmation-title");
@@ -87,25 +87,48 @@ class AdminDashboard {
   }
 
   initializeAutoRefresh() {
-    // Auto-refresh dashboard every 30 seconds
-    this.refreshInterval = setInterval(() => {
+    // Refresh stats when a booking changes instead of polling
+    if (typeof EventSource !== "undefined") {
+      this.bookingEvents = new EventSource("/api/booking-events");
+      this.bookingEvents.addEventListener("booking", () =>
+        this.scheduleStatsRefresh()
+      );
+      this.bookingEvents.addEventListener("resync", () =>
+        this.scheduleStatsRefresh()
+      );
+
+      // Catch up on changes that arrived while the tab was hidden
+      document.addEventListener("visibilitychange", () => {
+        if (document.visibilityState === "visible" && this.statsStale) {
+          this.statsStale = false;
+          this.refreshDashboardStats();
+        }
+      });
+      return;
+    }
+
+    this.startPolling();
+  }
+
+  scheduleStatsRefresh() {
+    // Coalesce bursts of booking events into one stats request
+    clearTimeout(this.statsRefreshTimer);
+    this.statsRefreshTimer = setTimeout(() => {
       if (document.visibilityState === "visible") {
         this.refreshDashboardStats();
+      } else {
+        this.statsStale = true;
       }
-    }, 30000);
+    }, 1000);
+  }
 
-    // Stop auto-refresh when page is hidden
-    document.addEventListener("visibilitychange", () => {
-      if (document.visibilityState === "hidden" && this.refreshInterval) {
-        clearInterval(this.refreshInterval);
-        this.refreshInterval = null;
-      } else if (
-        document.visibilityState === "visible" &&
-        !this.refreshInterval
-      ) {
-        this.initializeAutoRefresh();
+  startPolling() {
+    // Fallback for browsers without EventSource: refresh every 30 seconds
+    this.refreshInterval = setInterval(() => {
+      if (document.visibilityState === "visible") {
+        this.refreshDashboardStats();
       }
-    });
+    }, 30000);
   }
 
   async loadDashboardData() {
@@ -235,43 +258,33 @@ class AdminDashboard {
     try {
       this.showLoadingMessage("Preparing export...");
 
-      // Simulate export functionality for now
-      setTimeout(() => {
-        this.showSuccessMessage("Export feature will be available soon!");
-      }, 2000);
-
-      // TODO: Implement actual export functionality
-      /*
       const response = await fetch("/admin/api/export-bookings", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          format: "csv",
-          dateRange: "all",
-        }),
+        body: JSON.stringify({ format: "csv" }),
       });
 
-      if (response.ok) {
-        const blob = await response.blob();
-        const url = window.URL.createObjectURL(blob);
-        const a = document.createElement("a");
-        a.href = url;
-        a.download = `bookings_export_${
-          new Date().toISOString().split("T")[0]
-        }.csv`;
-        document.body.appendChild(a);
-        a.click();
-        document.body.removeChild(a);
-        window.URL.revokeObjectURL(url);
-
-        this.showSuccessMessage("Export completed successfully!");
-      } else {
+      if (!response.ok) {
         throw new Error(`Export failed: ${response.status}`);
       }
-      */
+
+      // The server streams the file; the blob collects it as it arrives
+      const blob = await response.blob();
+      const url = window.URL.createObjectURL(blob);
+      const a = document.createElement("a");
+      a.href = url;
+      a.download = `bookings_export_${
+        new Date().toISOString().split("T")[0]
+      }.csv`;
+      document.body.appendChild(a);
+      a.click();
+      document.body.removeChild(a);
+      window.URL.revokeObjectURL(url);
+
+      this.showSuccessMessage("Export completed successfully!");
     } catch (error) {
       console.error("❌ Export error:", error);
-      this.showErrorMessage("Export feature coming soon!");
+      this.showErrorMessage("Export failed. Please try again.");
     }
   }
 
@@ -282,17 +295,8 @@ class AdminDashboard {
       );
       if (!confirmed) return;
 
-      this.showLoadingMessage("Sending notifications...");
+      this.showLoadingMessage("Queueing notifications...");
 
-      // Simulate notification sending for now
-      setTimeout(() => {
-        this.showSuccessMessage(
-          "Bulk notification feature will be available soon!"
-        );
-      }, 2000);
-
-      // TODO: Implement actual notification functionality
-      /*
       const response = await fetch("/admin/api/send-bulk-notifications", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
@@ -302,16 +306,18 @@ class AdminDashboard {
       const result = await response.json();
 
       if (result.success) {
+        // Delivery happens in the background notification worker
         this.showSuccessMessage(
-          `Notifications sent to ${result.count} users successfully!`
+          result.count
+            ? `Queued ${result.count} notifications for delivery`
+            : "Everyone with a pending booking has already been notified today"
         );
       } else {
         throw new Error(result.message || "Failed to send notifications");
       }
-      */
     } catch (error) {
       console.error("❌ Bulk notification error:", error);
-      this.showErrorMessage("Notification feature coming soon!");
+      this.showErrorMessage("Failed to queue notifications");
     }
   }
 
@@ -439,6 +445,11 @@ class AdminDashboard {
       clearInterval(this.refreshInterval);
       this.refreshInterval = null;
     }
+    if (this.bookingEvents) {
+      this.bookingEvents.close();
+      this.bookingEvents = null;
+    }
+    clearTimeout(this.statsRefreshTimer);
     console.log("🧹 Dashboard cleanup completed");
   }
 }
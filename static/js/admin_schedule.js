@@ -184,6 +184,52 @@ class AdminScheduleManager {
     this.selectedSlot = null;
   }
 
+  // Live updates: patch the grid from /api/booking-events instead of polling
+  subscribeToBookingEvents(startDate, endDate) {
+    if (typeof EventSource === "undefined") return;
+
+    const key = `${startDate}|${endDate}`;
+    if (this.bookingEvents && this.bookingEventsKey === key) return;
+
+    if (this.bookingEvents) this.bookingEvents.close();
+    this.bookingEventsKey = key;
+    this.bookingEvents = new EventSource(
+      `/api/booking-events?start=${startDate}&end=${endDate}`
+    );
+
+    this.bookingEvents.addEventListener("booking", (e) =>
+      this.applyBookingEvent(JSON.parse(e.data))
+    );
+    this.bookingEvents.addEventListener("resync", () => {
+      this.bookingEvents.close();
+      this.bookingEvents = null;
+      this.loadScheduleData();
+    });
+  }
+
+  applyBookingEvent(event) {
+    // Drop every slot the booking used to occupy, wherever it was
+    let changed = false;
+    Object.values(this.scheduleData).forEach((courts) => {
+      Object.values(courts).forEach((slots) => {
+        Object.keys(slots).forEach((time) => {
+          if (slots[time].bookingId === event.bookingId) {
+            delete slots[time];
+            changed = true;
+          }
+        });
+      });
+    });
+
+    if (event.active) {
+      // New or changed bookings need player details: refetch the range once
+      clearTimeout(this.bookingEventReload);
+      this.bookingEventReload = setTimeout(() => this.loadScheduleData(), 500);
+    } else if (changed) {
+      this.renderSchedule();
+    }
+  }
+
   // FIXED: Enhanced loadScheduleData (your original working logic)
   async loadScheduleData() {
     this.showLoading(true);
@@ -207,24 +253,45 @@ class AdminScheduleManager {
         startDate: startDate.toISOString().split("T")[0],
         endDate: endDate.toISOString().split("T")[0],
         sport: document.getElementById("sport-filter")?.value || "",
+        format: "compact",
       };
 
       console.log("🔧 Loading schedule data with request:", requestData);
 
-      const response = await fetch("/admin/api/schedule-data", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(requestData),
+      // Same range as last time: let the server answer 304 if nothing changed
+      const query = new URLSearchParams(requestData).toString();
+      const headers = {};
+      if (this.scheduleEtag && this.scheduleQuery === query) {
+        headers["If-None-Match"] = this.scheduleEtag;
+      }
+
+      const response = await fetch(`/admin/api/schedule-data?${query}`, {
+        headers: headers,
       });
 
+      if (response.status === 304) {
+        console.log("📊 Schedule unchanged since last load");
+        this.renderSchedule();
+        this.subscribeToBookingEvents(
+          requestData.startDate,
+          requestData.endDate
+        );
+        return;
+      }
+
       if (!response.ok) {
         throw new Error(`HTTP ${response.status}: ${response.statusText}`);
       }
 
       const data = await response.json();
+      this.scheduleEtag = response.headers.get("ETag");
+      this.scheduleQuery = query;
 
       if (data.success) {
-        this.scheduleData = data.schedule || {};
+        this.scheduleData =
+          data.schedule && data.schedule.format === "compact"
+            ? this.inflateCompactSchedule(data.schedule)
+            : data.schedule || {};
         console.log(
           "📊 Schedule data loaded:",
           Object.keys(this.scheduleData).length,
@@ -232,6 +299,10 @@ class AdminScheduleManager {
         );
 
         this.renderSchedule();
+        this.subscribeToBookingEvents(
+          requestData.startDate,
+          requestData.endDate
+        );
 
         // Count total bookings
         let totalBookings = 0;
@@ -255,12 +326,55 @@ class AdminScheduleManager {
       console.error("❌ Error loading schedule:", error);
       this.showErrorToast("Failed to load schedule: " + error.message);
       this.scheduleData = {};
+      this.scheduleEtag = null;
       this.renderSchedule();
     } finally {
       this.showLoading(false);
     }
   }
 
+  // Expand the compact format into the date -> court -> time map the grid renders
+  inflateCompactSchedule(compact) {
+    const { bookings, cells, slots } = compact;
+    const surfaces = compact.multiPurposeCourts || {};
+    const schedule = {};
+
+    compact.dates.forEach((date) => {
+      schedule[date] = {};
+      compact.courts.forEach((courtId) => {
+        const courtSlots = (schedule[date][courtId] = {});
+        const row = (cells[date] || {})[courtId];
+        if (!row) return;
+
+        row.forEach((index, slotIndex) => {
+          if (index < 0) return;
+          const bookingCourt = bookings.court[index];
+          const isConflict =
+            bookingCourt !== courtId &&
+            surfaces[courtId] !== undefined &&
+            surfaces[courtId] === surfaces[bookingCourt];
+          const amount = bookings.amount[index] || 0;
+
+          courtSlots[slots[slotIndex]] = {
+            status: isConflict ? "booked-conflict" : bookings.status[index],
+            title: bookings.playerName[index] || "Booked",
+            subtitle:
+              `PKR ${amount.toLocaleString("en-US")}` +
+              (isConflict ? " - Multi Court" : ""),
+            bookingId: bookings.id[index],
+            playerName: bookings.playerName[index],
+            playerPhone: bookings.playerPhone[index],
+            amount: bookings.amount[index],
+            duration: bookings.duration[index],
+            originalCourt: isConflict ? bookingCourt : courtId,
+            comments: bookings.comments[index] || "",
+          };
+        });
+      });
+    });
+    return schedule;
+  }
+
   renderSchedule() {
     const grid = document.getElementById("schedule-grid");
     if (!grid) {
@@ -1724,6 +1838,7 @@ window.forceRefreshSchedule = function () {
   if (window.adminSchedule) {
     console.log("🔄 Force refreshing admin schedule...");
     window.adminSchedule.scheduleData = {};
+    window.adminSchedule.scheduleEtag = null;
     window.adminSchedule.loadScheduleData();
   } else {
     console.error("❌ Admin schedule manager not found");
@@ -35,6 +35,15 @@ class BookingSystem {
       "futsal-1": "multi-130x60",
     };
 
+    // Prefetched occupancy per "court|date"; entries older than the TTL are refetched
+    this.availability = new Map();
+    this.availabilityTtl = 30000;
+    this.availabilityDays = 7;
+    // Last /api/booked-slots answer per "court|date", revalidated by ETag
+    this.slotValidators = new Map();
+    // Server-side hold on the selected slots during checkout: { token, timer }
+    this.hold = null;
+
     this.init();
   }
 
@@ -79,6 +88,11 @@ class BookingSystem {
     dateInput.value = today.toISOString().split("T")[0];
 
     this.bookingData.date = dateInput.value;
+
+    const weekStrip = document.createElement("div");
+    weekStrip.className = "availability-week";
+    weekStrip.id = "availability-week";
+    dateInput.insertAdjacentElement("afterend", weekStrip);
   }
 
   setupEventListeners() {
@@ -128,6 +142,9 @@ class BookingSystem {
     if (confirmBtn) {
       confirmBtn.addEventListener("click", () => this.confirmBooking());
     }
+
+    // Leaving the page gives held slots back instead of waiting for expiry
+    window.addEventListener("pagehide", () => this.releaseHold());
   }
 
   selectSport(event) {
@@ -195,10 +212,13 @@ class BookingSystem {
     }
   }
 
-  nextStep() {
+  async nextStep() {
     if (this.currentStep < 4) {
       this.saveStepData();
 
+      // Hold the slots before the customer spends minutes on their details
+      if (this.currentStep === 2 && !(await this.holdSelectedSlots())) return;
+
       // Hide current step
       const currentStepEl = document.getElementById(`step-${this.currentStep}`);
       if (currentStepEl) currentStepEl.classList.remove("active");
@@ -331,23 +351,22 @@ class BookingSystem {
         `Loading slots for court: ${this.bookingData.court}, date: ${this.bookingData.date}`
       );
 
-      const response = await fetch("/api/booked-slots", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          court: this.bookingData.court,
-          date: this.bookingData.date,
-        }),
-      });
-
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
+      // One request covers the whole week; later date changes are served locally
+      let cached = this.getCachedAvailability(this.bookingData.date);
+      if (!cached && !this.isInWeekStrip(this.bookingData.date)) {
+        await this.prefetchAvailability(this.bookingData.date);
+        cached = this.getCachedAvailability(this.bookingData.date);
       }
+      this.renderWeekStrip();
 
-      const bookedSlots = await response.json();
+      // Days the strip already covers are revalidated one at a time (usually a 304)
+      const bookedSlots = cached
+        ? cached.booked
+        : await this.fetchBookedSlots(this.bookingData.date);
       console.log(`Received ${bookedSlots.length} booked slots:`, bookedSlots);
 
       this.renderTimeSlots(timeSlotsContainer, bookedSlots);
+      this.subscribeToSlotEvents();
     } catch (error) {
       console.error("Error loading time slots:", error);
       timeSlotsContainer.innerHTML =
@@ -355,6 +374,132 @@ class BookingSystem {
     }
   }
 
+  async fetchBookedSlots(date) {
+    const court = this.bookingData.court;
+    const key = `${court}|${date}`;
+    const previous = this.slotValidators.get(key);
+
+    // Our own hold isn't "booked" for us
+    const hold = this.hold ? `&holdToken=${this.hold.token}` : "";
+    const response = await fetch(
+      `/api/booked-slots?court=${encodeURIComponent(court)}&date=${date}${hold}`,
+      { headers: previous ? { "If-None-Match": previous.etag } : {} }
+    );
+
+    let booked;
+    if (response.status === 304 && previous) {
+      booked = previous.booked;
+    } else if (response.ok) {
+      booked = await response.json();
+      const etag = response.headers.get("ETag");
+      if (etag) this.slotValidators.set(key, { etag: etag, booked: booked });
+    } else {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const entry = this.availability.get(key);
+    this.availability.set(key, {
+      booked: booked,
+      full: entry ? entry.full : false,
+      fetchedAt: Date.now(),
+    });
+    return booked;
+  }
+
+  isInWeekStrip(date) {
+    if (!this.weekStart || this.weekCourt !== this.bookingData.court) return false;
+    const lastDay = this.addDays(this.weekStart, this.availabilityDays - 1);
+    return date >= this.weekStart && date <= lastDay;
+  }
+
+  getCachedAvailability(date) {
+    const entry = this.availability.get(`${this.bookingData.court}|${date}`);
+    if (!entry || Date.now() - entry.fetchedAt > this.availabilityTtl) return null;
+    return entry;
+  }
+
+  async prefetchAvailability(startDate) {
+    const court = this.bookingData.court;
+    try {
+      const response = await fetch("/api/availability", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          court: court,
+          startDate: startDate,
+          days: this.availabilityDays,
+        }),
+      });
+      const data = await response.json();
+      if (!data.success) throw new Error(data.message);
+
+      const fetchedAt = Date.now();
+      const fullDates = data.fullDates[court] || [];
+      Object.entries(data.availability[court] || {}).forEach(([date, mask]) => {
+        this.availability.set(`${court}|${date}`, {
+          booked: this.decodeSlotMask(mask, data.slots),
+          full: fullDates.includes(date),
+          fetchedAt: fetchedAt,
+        });
+      });
+      this.weekStart = startDate;
+      this.weekCourt = court;
+    } catch (error) {
+      console.error("Error prefetching availability:", error);
+    }
+  }
+
+  decodeSlotMask(hex, slots) {
+    // Bit i is grid slot i; split in two so each half fits a safe JS integer
+    const low = parseInt(hex.slice(-6), 16);
+    const high = parseInt(hex.slice(0, -6) || "0", 16);
+    return slots.filter((time, index) =>
+      index < 24 ? (low >> index) & 1 : (high >> (index - 24)) & 1
+    );
+  }
+
+  renderWeekStrip() {
+    const strip = document.getElementById("availability-week");
+    const dateInput = document.getElementById("booking-date");
+    if (!strip) return;
+
+    // Keep the strip anchored until the customer picks a date outside it
+    const selected = this.bookingData.date;
+    if (!this.isInWeekStrip(selected)) return;
+
+    strip.innerHTML = "";
+    for (let offset = 0; offset < this.availabilityDays; offset++) {
+      const date = this.addDays(this.weekStart, offset);
+      if (dateInput && dateInput.max && date > dateInput.max) break;
+
+      const entry = this.availability.get(`${this.bookingData.court}|${date}`);
+      const chip = document.createElement("button");
+      chip.type = "button";
+      chip.className = "day-chip";
+      chip.textContent = new Date(`${date}T00:00:00`).toLocaleDateString(
+        "en-US",
+        { weekday: "short", day: "numeric" }
+      );
+      if (date === selected) chip.classList.add("selected");
+      if (entry && entry.full) {
+        chip.classList.add("full");
+        chip.title = "Fully booked";
+      }
+      chip.addEventListener("click", () => {
+        if (dateInput) dateInput.value = date;
+        this.bookingData.date = date;
+        this.loadTimeSlots();
+      });
+      strip.appendChild(chip);
+    }
+  }
+
+  addDays(date, days) {
+    const day = new Date(`${date}T00:00:00Z`);
+    day.setUTCDate(day.getUTCDate() + days);
+    return day.toISOString().split("T")[0];
+  }
+
   renderTimeSlots(container, bookedSlots) {
     container.innerHTML = "";
 
@@ -407,13 +552,12 @@ class BookingSystem {
       slot.dataset.time = time;
       slot.dataset.index = index;
 
-      // Check if slot is booked
+      // Check if slot is booked (live updates may flip this later)
       if (bookedSlots.includes(time)) {
         slot.classList.add("booked");
         slot.title = "This slot is already booked";
-      } else {
-        slot.addEventListener("click", (e) => this.selectTimeSlot(e));
       }
+      slot.addEventListener("click", (e) => this.selectTimeSlot(e));
 
       // Add to appropriate day grid
       if (this.isNextDayTime(time)) {
@@ -437,6 +581,89 @@ class BookingSystem {
     container.appendChild(selectedDisplay);
   }
 
+  subscribeToSlotEvents() {
+    if (typeof EventSource === "undefined") return;
+
+    const { court, date } = this.bookingData;
+    const key = `${court}|${date}`;
+    if (this.slotEvents && this.slotEventsKey === key) return;
+
+    if (this.slotEvents) this.slotEvents.close();
+    this.slotEventsKey = key;
+    this.slotEvents = new EventSource(
+      `/api/booking-events?courts=${encodeURIComponent(court)}` +
+        `&start=${date}&end=${date}`
+    );
+
+    this.slotEvents.addEventListener("booking", (e) =>
+      this.applySlotEvent(JSON.parse(e.data))
+    );
+    // The server dropped us after falling behind; start over from a fresh fetch
+    this.slotEvents.addEventListener("resync", () => {
+      this.slotEvents.close();
+      this.slotEvents = null;
+      this.availability.delete(`${this.bookingData.court}|${this.bookingData.date}`);
+      this.loadTimeSlots();
+    });
+  }
+
+  applySlotEvent(event) {
+    const { court, date } = this.bookingData;
+
+    // Prefetched days the change touched are stale; refetch them on next view
+    (event.courts || []).forEach((c) =>
+      this.availability.delete(`${c}|${event.date}`)
+    );
+    (event.previousCourts || event.courts || []).forEach((c) =>
+      this.availability.delete(`${c}|${event.previousDate || event.date}`)
+    );
+
+    const watching = (courts, eventDate) =>
+      eventDate === date && courts.includes(court);
+
+    if (
+      event.previousSlots &&
+      watching(
+        event.previousCourts || event.courts,
+        event.previousDate || event.date
+      )
+    ) {
+      event.previousSlots.forEach((time) => this.setSlotBooked(time, false));
+    }
+
+    if (watching(event.courts, event.date)) {
+      event.slots.forEach((time) => this.setSlotBooked(time, event.active));
+    }
+  }
+
+  setSlotBooked(time, booked) {
+    const slot = document.querySelector(`.time-slot[data-time="${time}"]`);
+    if (!slot) return;
+
+    if (!booked) {
+      slot.classList.remove("booked");
+      slot.title = "";
+      return;
+    }
+
+    slot.classList.add("booked");
+    slot.title = "This slot is already booked";
+
+    // Someone else just took part of our selection; make the customer pick again
+    if (slot.classList.contains("selected")) {
+      document
+        .querySelectorAll(".time-slot.selected")
+        .forEach((selected) => selected.classList.remove("selected"));
+      this.bookingData.selectedSlots = [];
+      this.updateBookingTimeData();
+      this.updateSelectedSlotsDisplay();
+      this.validateStep2();
+      alert(
+        "One of your selected time slots was just booked by someone else. Please choose another time."
+      );
+    }
+  }
+
   selectTimeSlot(event) {
     const slot = event.currentTarget;
     const time = slot.dataset.time;
@@ -480,6 +707,72 @@ class BookingSystem {
     this.validateStep2();
   }
 
+  async holdSelectedSlots() {
+    try {
+      const response = await fetch("/api/hold-slots", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          court: this.bookingData.court,
+          date: this.bookingData.date,
+          selectedSlots: this.bookingData.selectedSlots,
+          holdToken: this.hold ? this.hold.token : null,
+        }),
+      });
+      const result = await response.json();
+
+      if (response.status === 409) {
+        // Taken since the grid loaded; marking it clears the selection and tells the customer
+        (result.conflicts || []).forEach((time) => this.setSlotBooked(time, true));
+        return false;
+      }
+      if (!result.success) throw new Error(result.message);
+
+      this.clearHold();
+      this.hold = {
+        token: result.holdToken,
+        timer: setInterval(
+          () => this.extendHold(),
+          (result.ttlSeconds * 1000) / 2
+        ),
+      };
+      this.bookingData.holdToken = result.holdToken;
+    } catch (error) {
+      // Holding is best effort; create-booking still refuses a double booking
+      console.error("Error holding slots:", error);
+    }
+    return true;
+  }
+
+  async extendHold() {
+    if (!this.hold) return;
+    try {
+      const response = await fetch("/api/extend-hold", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ holdToken: this.hold.token }),
+      });
+      if (response.status === 410) this.clearHold();
+    } catch (error) {
+      console.error("Error extending hold:", error);
+    }
+  }
+
+  releaseHold() {
+    if (!this.hold) return;
+    navigator.sendBeacon(
+      "/api/release-hold",
+      JSON.stringify({ holdToken: this.hold.token })
+    );
+    this.clearHold();
+  }
+
+  clearHold() {
+    if (this.hold) clearInterval(this.hold.timer);
+    this.hold = null;
+    delete this.bookingData.holdToken;
+  }
+
   areConsecutiveSlots(slots) {
     if (slots.length <= 1) return true;
 
@@ -684,6 +977,8 @@ class BookingSystem {
       const result = await response.json();
 
       if (result.success) {
+        // The booking took over the held slots
+        this.clearHold();
         this.showBookingConfirmation(result.bookingId);
         await this.sendAdminNotification(result.bookingId);
       } else {
@@ -733,6 +1028,7 @@ class BookingSystem {
           court: this.bookingData.court,
           date: this.bookingData.date,
           selectedSlots: this.bookingData.selectedSlots,
+          holdToken: this.hold ? this.hold.token : null,
         }),
       });
 
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import random
+import re
+import uuid
+
+from flask import g, has_request_context, request
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# Per-module overrides, e.g. LOG_LEVELS="admin_routes=DEBUG,db_pool=WARNING"
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+# "text" for humans, "json" for one object per line
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+# Share of per-slot/per-booking debug events kept when DEBUG is enabled
+LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", "0.01"))
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Caller-supplied ids are echoed into logs, so only accept plain tokens
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+sample_rate = LOG_SAMPLE_RATE
+
+# LogRecord attributes; anything else on a record came in through extra=
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "request_id",
+}
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp every record with the current request's id ('-' outside requests)"""
+
+    def filter(self, record):
+        record.request_id = g.get("request_id", "-") if has_request_context() else "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any extra= fields"""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        entry.update(
+            {key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS}
+        )
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def parse_levels(spec):
+    """{"module": level} from "module=LEVEL,other=LEVEL" (bad entries are skipped)"""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        level = level.strip().upper()
+        if name.strip() and isinstance(logging.getLevelName(level), int):
+            levels[name.strip()] = level
+    return levels
+
+
+def configure_logging(level=None, module_levels=None, fmt=None, rate=None, stream=None):
+    """Install the root handler, global and per-module levels and the sample rate"""
+    global sample_rate
+
+    handler = logging.StreamHandler(stream)
+    handler.addFilter(RequestIdFilter())
+    if (fmt or LOG_FORMAT) == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level or LOG_LEVEL)
+
+    levels = parse_levels(LOG_LEVELS if module_levels is None else module_levels)
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    sample_rate = LOG_SAMPLE_RATE if rate is None else rate
+
+
+def init_request_ids(app):
+    """Give each request an id (or adopt X-Request-ID) and echo it back"""
+
+    @app.before_request
+    def assign_request_id():
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        g.request_id = (
+            incoming if REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex[:16]
+        )
+
+    @app.after_request
+    def echo_request_id(response):
+        if "request_id" in g:
+            response.headers[REQUEST_ID_HEADER] = g.request_id
+        return response
+
+
+def debug_sampled(logger, msg, *args):
+    """logger.debug for per-item events, keeping only a sample_rate share"""
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < sample_rate:
+        logger.debug(msg, *args, extra={"sampled": sample_rate})